@@ -142,79 +142,75 @@ class FitsHeaderEntry(Attr):
 
 walker = AttrWalker()
 
+# The appliers of the walker translate an attribute tree into a single
+# SQLAlchemy criterion on the table of database entries, which the creators
+# use to run the whole query in the database.
 
-@walker.add_creator(AttrOr)
+
+@walker.add_creator(AttrOr, AttrAnd, ValueAttr)
 def _create(wlk, root, session):
-    entries = set()
-    for attr in root.attrs:
-        # make sure to add only new entries to the set to avoid duplicates
-        entries.update(set(wlk.create(attr, session)) - entries)
-    return list(entries)
+    return session.query(DatabaseEntry).filter(
+        wlk.apply(root)).order_by(DatabaseEntry.id).all()
 
 
-@walker.add_creator(AttrAnd)
-def _create(wlk, root, session):
-    entries = [set(wlk.create(attr, session)) for attr in root.attrs]
-    return list(set.intersection(*entries))
+@walker.add_applier(AttrOr)
+def _apply(wlk, root):
+    return or_(*[wlk.apply(attr) for attr in root.attrs])
 
 
-@walker.add_creator(ValueAttr)
-def _create(wlk, root, session):
-    query = session.query(DatabaseEntry)
-    for key, value in root.attrs.iteritems():
+@walker.add_applier(AttrAnd)
+def _apply(wlk, root):
+    return and_(*[wlk.apply(attr) for attr in root.attrs])
+
+
+@walker.add_applier(ValueAttr)
+def _apply(wlk, root):
+    criteria = []
+    for key, value in root.attrs.items():
         typ = key[0]
         if typ == 'tag':
-            criterion = TableTag.name.in_([value])
+            criterion = DatabaseEntry.tags.any(TableTag.name == value)
             # `key[1]` is here the `inverted` attribute of the tag. That means
             # that if it is True, the given tag must not be included in the
             # resulting entries.
             if key[1]:
-                query = query.filter(~DatabaseEntry.tags.any(criterion))
-            else:
-                query = query.filter(DatabaseEntry.tags.any(criterion))
+                criterion = ~criterion
         elif typ == 'fitsheaderentry':
             key, val, inverted = value
-            key_criterion = TableFitsHeaderEntry.key == key
-            value_criterion = TableFitsHeaderEntry.value == val
+            criterion = DatabaseEntry.fits_header_entries.any(and_(
+                TableFitsHeaderEntry.key == key,
+                TableFitsHeaderEntry.value == val))
             if inverted:
-                query = query.filter(not_(and_(
-                    DatabaseEntry.fits_header_entries.any(key_criterion),
-                    DatabaseEntry.fits_header_entries.any(value_criterion))))
-            else:
-                query = query.filter(and_(
-                    DatabaseEntry.fits_header_entries.any(key_criterion),
-                    DatabaseEntry.fits_header_entries.any(value_criterion)))
+                criterion = not_(criterion)
         elif typ == 'download time':
             start, end, inverted = value
+            criterion = DatabaseEntry.download_time.between(start, end)
             if inverted:
-                query = query.filter(
-                    ~DatabaseEntry.download_time.between(start, end))
-            else:
-                query = query.filter(
-                    DatabaseEntry.download_time.between(start, end))
+                criterion = ~criterion
         elif typ == 'path':
             path, inverted = value
             if inverted:
                 # pylint: disable=E711
-                query = query.filter(or_(
-                    DatabaseEntry.path != path, DatabaseEntry.path == None))
+                criterion = or_(
+                    DatabaseEntry.path != path, DatabaseEntry.path == None)
             else:
-                query = query.filter(DatabaseEntry.path == path)
+                criterion = DatabaseEntry.path == path
         elif typ == 'wave':
             wavemin, wavemax, waveunit = value
-            query = query.filter(and_(
+            criterion = and_(
                 DatabaseEntry.wavemin >= wavemin,
-                DatabaseEntry.wavemax <= wavemax))
+                DatabaseEntry.wavemax <= wavemax)
         elif typ == 'time':
             start, end, near = value
-            query = query.filter(and_(
+            criterion = and_(
                 DatabaseEntry.observation_time_start < end,
-                DatabaseEntry.observation_time_end > start))
+                DatabaseEntry.observation_time_end > start)
         else:
             if typ.lower() not in SUPPORTED_SIMPLE_VSO_ATTRS.union(SUPPORTED_NONVSO_ATTRS):
                 raise NotImplementedError("The attribute {0!r} is not yet supported to query a database.".format(typ))
-            query = query.filter_by(**{typ: value})
-    return query.all()
+            criterion = getattr(DatabaseEntry, typ) == value
+        criteria.append(criterion)
+    return and_(*criteria)
 
 
 @walker.add_converter(Tag)
@@ -14,7 +14,7 @@ from sqlalchemy.exc import InvalidRequestError
 
 __all__ = [
     'EmptyCommandStackError', 'NoSuchEntryError', 'NonRemovableTagError',
-    'DatabaseOperation', 'AddEntry', 'RemoveEntry', 'EditEntry',
+    'DatabaseOperation', 'AddEntry', 'AddEntries', 'RemoveEntry', 'EditEntry',
     'CommandManager']
 
 
@@ -139,6 +139,43 @@ class AddEntry(DatabaseOperation):
             self.__class__.__name__, self.session, self.database_entry.id)
 
 
+class AddEntries(DatabaseOperation):
+    """Add many database entries to this session at once. The entries are
+    flushed to the database in batches of ``batch_size`` entries, which is
+    much faster than adding them one by one. As for :class:`AddEntry`, it is
+    not checked whether equivalent entries are already saved in the session.
+    The ``undo`` method removes all the entries from the session again.
+
+    """
+    def __init__(self, session, database_entries, batch_size=1000):
+        self.session = session
+        self.database_entries = list(database_entries)
+        self.batch_size = batch_size
+
+    def __call__(self):
+        for i in range(0, len(self.database_entries), self.batch_size):
+            batch = self.database_entries[i:i + self.batch_size]
+            try:
+                self.session.add_all(batch)
+            except InvalidRequestError:
+                # some entries were removed from the database before, let
+                # AddEntry send them back to the transient state
+                for database_entry in batch:
+                    AddEntry(self.session, database_entry)()
+            self.session.flush()
+
+    def undo(self):
+        for database_entry in self.database_entries:
+            AddEntry(self.session, database_entry).undo()
+
+    def __len__(self):
+        return len(self.database_entries)
+
+    def __repr__(self):
+        return '<{0}(session {1!r}, {2} entries)>'.format(
+            self.__class__.__name__, self.session, len(self))
+
+
 class RemoveEntry(DatabaseOperation):
     """Remove the given database entry from the session. If it cannot be
     removed, because it is not stored in the session,
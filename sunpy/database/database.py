@@ -6,12 +6,13 @@
 from __future__ import absolute_import
 
 import itertools
-import operator
 from datetime import datetime
 from contextlib import contextmanager
+import fnmatch
 import os.path
 
-from sqlalchemy import create_engine, exists
+import sqlalchemy
+from sqlalchemy import create_engine, exists, inspect
 from sqlalchemy.orm import sessionmaker
 
 import sunpy
@@ -22,6 +23,7 @@ from sunpy.database.attrs import walker
 from sunpy.net.hek2vso import H2VClient
 from sunpy.net.attr import and_
 from sunpy.net.vso import VSOClient
+from sunpy.extern.six.moves import range
 
 __authors__ = ['Simon Liedtke', 'Rajul Srivastava']
 __emails__ = [
@@ -29,6 +31,21 @@ __emails__ = [
     'rajul09@gmail.com'
 ]
 
+# Columns of the data table which are used to find entries which may be equal
+# to an entry which is about to be added.
+_NATURAL_KEY = (
+    'provider', 'fileid', 'path', 'observation_time_start', 'instrument')
+
+# The number of natural keys looked up with one query
+_LOOKUP_BATCH_SIZE = 100
+
+# The number of entries after which add_from_dir commits when resuming
+_COMMIT_BATCH_SIZE = 1000
+
+
+def _natural_key(database_entry):
+    return tuple(getattr(database_entry, name) for name in _NATURAL_KEY)
+
 
 class EntryNotFoundError(Exception):
     """This exception is raised if a database entry cannot be found by its
@@ -138,7 +155,7 @@ def disable_undo(database):
 
 class Database(object):
     """
-    Database(url[, CacheClass[, cache_size[, default_waveunit]]])
+    Database(url[, CacheClass[, cache_size[, default_waveunit[, promoted_keys]]]])
 
     Parameters
     ----------
@@ -153,7 +170,10 @@ class Database(object):
         :class:`sunpy.database.caching.LFUCache`.
         The default value is :class:`sunpy.database.caching.LRUCache`.
     cache_size : int
-        The maximum number of database entries, default is no limit.
+        The maximum number of database entries, default is no limit. Entries
+        which do not fit into the cache are removed from the database, so a
+        limited cache is filled with all the entries when the database is
+        opened. Otherwise entries are cached when they are accessed.
     default_waveunit : str, optional
         The wavelength unit that will be used if an entry is added to the
         database but its wavelength unit cannot be found (either in the file or
@@ -161,6 +181,15 @@ class Database(object):
         If `None` (the default), attempting to add an entry without knowing the
         wavelength unit results in a
         :exc:`sunpy.database.WaveunitNotFoundError`.
+    promoted_keys : iterable of str, optional
+        If given, the FITS headers of entries added from files are stored as
+        one compressed blob per entry and only the cards of these keys (for
+        example ``['EXPTIME', 'QUALITY', 'T_OBS']``) are stored as
+        :class:`sunpy.database.tables.FitsHeaderEntry` rows. Only these keys
+        can be queried with :class:`sunpy.database.attrs.FitsHeaderEntry`,
+        the complete header is available as
+        :attr:`sunpy.database.tables.DatabaseEntry.fits_header`. By default
+        every card is stored in its own row.
     """
     """
     Attributes
@@ -171,8 +200,13 @@ class Database(object):
         experienced with SQLAlchemy.
 
     cache_size: int
-        The maximum number of database entries. This attribute is read-only. To
-        change this value, use the method
+        The number of cached database entries. An unlimited cache is filled
+        as the entries are accessed, so this can be less than the number of
+        entries of the database. This attribute is read-only.
+
+    cache_maxsize: int
+        The maximum number of cached database entries. This attribute is
+        read-only. To change this value, use the method
         :meth:`sunpy.database.Database.set_cache_size`.
 
     tags : list of sunpy.database.Tag objects
@@ -181,6 +215,9 @@ class Database(object):
     default_waveunit : str
         See "Parameters" section.
 
+    promoted_keys : list of str or None
+        See "Parameters" section.
+
     Methods
     -------
     set_cache_size(cache_size)
@@ -222,6 +259,9 @@ class Database(object):
     __contains__(entry)
         Return True if the given database entry is saved in the database,
         False otherwise.
+    iter_entries(page_size=1000)
+        Return an iterator over all database entries which reads them from the
+        database in pages.
     __iter__()
         Return an iterator over all database entries.
     __len__()
@@ -229,7 +269,7 @@ class Database(object):
 
     """
     def __init__(self, url=None, CacheClass=LRUCache, cache_size=float('inf'),
-            default_waveunit=None):
+            default_waveunit=None, promoted_keys=None):
         if url is None:
             url = sunpy.config.get('database', 'url')
         self._engine = create_engine(url)
@@ -237,6 +277,9 @@ class Database(object):
         self.session = self._session_cls()
         self._command_manager = commands.CommandManager()
         self.default_waveunit = default_waveunit
+        if promoted_keys is not None:
+            promoted_keys = list(promoted_keys)
+        self.promoted_keys = promoted_keys
         self._enable_history = True
 
         class Cache(CacheClass):
@@ -247,8 +290,10 @@ class Database(object):
                 this[max(this or [0]) + 1] = value
         self._create_tables()
         self._cache = Cache(cache_size)
-        for entry in self:
-            self._cache[entry.id] = entry
+        # True if all the entries of the database are in the cache
+        self._cache_complete = False
+        if cache_size != float('inf'):
+            self._fill_cache()
 
     @property
     def url(self):
@@ -263,6 +308,31 @@ class Database(object):
     def cache_maxsize(self):
         return self._cache.maxsize
 
+    def _fill_cache(self):
+        """Put all the entries of the database into the cache."""
+        for entry in self:
+            if entry.id not in self._cache:
+                self._cache[entry.id] = entry
+        self._cache_complete = True
+
+    def _cache_entry(self, database_entry):
+        """Put a new or changed entry into the cache."""
+        if database_entry.id is not None:
+            self._cache[database_entry.id] = database_entry
+        elif self._cache_complete:
+            # the ID is assigned when the entry is flushed, guess it so that
+            # the entry counts towards the size of the cache
+            self._cache.append(database_entry)
+
+    def _touch(self, database_entry):
+        """"Touch" an entry which has been accessed in the cache to
+        intentionally cause possible side-effects, or put it into the cache if
+        it is not cached yet."""
+        if database_entry.id in self._cache:
+            self._cache[database_entry.id]
+        else:
+            self._cache_entry(database_entry)
+
     def set_cache_size(self, cache_size):
         """Set a new value for the maximum number of database entries in the
         cache. Use the value ``float('inf')`` to disable caching. If the new
@@ -274,6 +344,8 @@ class Database(object):
         :class:`sunpy.database.caching.LFUCache`).
 
         """
+        if not self._cache_complete and cache_size != float('inf'):
+            self._fill_cache()
         cmds = CompositeOperation()
         # remove items from the cache if the given argument is lower than the
         # current cache size
@@ -299,6 +371,14 @@ class Database(object):
         """
         metadata = tables.Base.metadata
         metadata.create_all(self._engine, checkfirst=checkfirst)
+        # tables created by older versions of sunpy have no indexes
+        inspector = inspect(self._engine)
+        for table in metadata.sorted_tables:
+            existing = set(
+                index['name'] for index in inspector.get_indexes(table.name))
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(self._engine)
 
     def commit(self):
         """Flush pending changes and commit the current transaction. This is a
@@ -318,9 +398,13 @@ class Database(object):
             qr_entry = tables.DatabaseEntry._from_query_result_block(block)
 
             if os.path.isfile(path):
-                entries = tables.entries_from_file(path, self.default_waveunit)
+                entries = tables.entries_from_file(
+                    path, self.default_waveunit, self.promoted_keys)
             elif os.path.isdir(path):
-                entries = tables.entries_from_dir(path, self.default_waveunit)
+                entries = (
+                    entry for entry, filepath in tables.entries_from_dir(
+                        path, default_waveunit=self.default_waveunit,
+                        promoted_keys=self.promoted_keys))
             else:
                 raise ValueError('The path is neither a file nor directory')
 
@@ -455,6 +539,12 @@ class Database(object):
             :class:`sunpy.database.tables.DatabaseEntry` for a list of all
             possible values.
 
+        Notes
+        -----
+        The attributes are translated into a single SQL query, so the
+        filtering and sorting is done by the database and only the matching
+        entries are loaded.
+
         Raises
         ------
         TypeError
@@ -475,9 +565,10 @@ class Database(object):
         if kwargs:
             k, v = kwargs.popitem()
             raise TypeError('unexpected keyword argument {0!r}'.format(k))
-        return sorted(
-            walker.create(and_(*query), self.session),
-            key=operator.attrgetter(sortby))
+        return self.session.query(tables.DatabaseEntry).filter(
+            walker.apply(and_(*query))).order_by(
+                getattr(tables.DatabaseEntry, sortby),
+                tables.DatabaseEntry.id).all()
 
     def get_entry_by_id(self, entry_id):
         """Get a database entry by its unique ID number. If an entry with the
@@ -488,7 +579,14 @@ class Database(object):
         try:
             return self._cache[entry_id]
         except KeyError:
+            if self._cache_complete:
+                raise EntryNotFoundError(entry_id)
+        entry = self.session.query(tables.DatabaseEntry).filter_by(
+            id=entry_id).first()
+        if entry is None:
             raise EntryNotFoundError(entry_id)
+        self._cache[entry_id] = entry
+        return entry
 
     @property
     def tags(self):
@@ -589,7 +687,10 @@ class Database(object):
 
     def add_many(self, database_entries, ignore_already_added=False):
         """Add a row of database entries "at once". If this method is used,
-        only one entry is saved in the undo history.
+        only one entry is saved in the undo history. The entries are written
+        to the database in batches, and checking for entries which have
+        already been added takes one query per batch of entries rather than
+        reading the whole table.
 
         Parameters
         ----------
@@ -600,24 +701,48 @@ class Database(object):
             See Database.add
 
         """
-        cmds = CompositeOperation()
+        database_entries = list(database_entries)
+        if not database_entries:
+            return
+        if not ignore_already_added:
+            self._check_not_added(database_entries)
+        cmd = commands.AddEntries(self.session, database_entries)
+        if self._enable_history:
+            self._command_manager.do(cmd)
+        else:
+            cmd()
         for database_entry in database_entries:
-            # use list(self) instead of simply self because __contains__ checks
-            # for existence in the database and not only all attributes except
-            # ID.
-            if database_entry in list(self) and not ignore_already_added:
-                raise EntryAlreadyAddedError(database_entry)
-            cmd = commands.AddEntry(self.session, database_entry)
-            if self._enable_history:
-                cmds.add(cmd)
-            else:
-                cmd()
-            if database_entry.id is None:
-                self._cache.append(database_entry)
-            else:
-                self._cache[database_entry.id] = database_entry
-        if cmds:
-            self._command_manager.do(cmds)
+            self._cache_entry(database_entry)
+
+    def _check_not_added(self, database_entries):
+        """Raise :exc:`sunpy.database.EntryAlreadyAddedError` if an entry
+        equal to one of the given entries is already saved in the database.
+
+        The saved entries which may be equal are looked up by their provider,
+        file ID, path, observation start time and instrument with one query
+        per batch of entries, only those are compared attribute by attribute.
+        An entry which is equal to an earlier one of the given entries is an
+        already added entry as well.
+
+        """
+        columns = [getattr(tables.DatabaseEntry, name) for name in _NATURAL_KEY]
+        keys = list(set(_natural_key(entry) for entry in database_entries))
+        saved = {}
+        for i in range(0, len(keys), _LOOKUP_BATCH_SIZE):
+            criteria = [
+                sqlalchemy.and_(*[
+                    column == value for column, value in zip(columns, key)])
+                for key in keys[i:i + _LOOKUP_BATCH_SIZE]]
+            query = self.session.query(tables.DatabaseEntry).filter(
+                sqlalchemy.or_(*criteria))
+            for entry in query:
+                saved.setdefault(_natural_key(entry), []).append(entry)
+        for database_entry in database_entries:
+            candidates = saved.setdefault(_natural_key(database_entry), [])
+            for entry in candidates:
+                if entry is database_entry or entry == database_entry:
+                    raise EntryAlreadyAddedError(database_entry)
+            candidates.append(database_entry)
 
     def add(self, database_entry, ignore_already_added=False):
         """Add the given database entry to the database table.
@@ -641,10 +766,7 @@ class Database(object):
             self._command_manager.do(add_entry_cmd)
         else:
             add_entry_cmd()
-        if database_entry.id is None:
-            self._cache.append(database_entry)
-        else:
-            self._cache[database_entry.id] = database_entry
+        self._cache_entry(database_entry)
 
     def add_from_hek_query_result(self, query_result,
             ignore_already_added=False):
@@ -708,7 +830,8 @@ class Database(object):
             ignore_already_added)
 
     def add_from_dir(self, path, recursive=False, pattern='*',
-            ignore_already_added=False):
+            ignore_already_added=False, workers=1, progress=False,
+            resume=False):
         """Search the given directory for FITS files and use their FITS headers
         to add new entries to the database. Note that one entry in the database
         is assigned to a list of FITS headers, so not the number of FITS headers
@@ -738,21 +861,143 @@ class Database(object):
         ignore_already_added : bool, optional
             See :meth:`sunpy.database.Database.add`.
 
+        workers : int, optional
+            The number of processes which read the FITS headers, see
+            :func:`sunpy.database.tables.entries_from_dir`. The entries are
+            always written to the database by this process.
+
+        progress : bool, optional
+            If True, show a progress bar of the files which have been read.
+
+        resume : bool, optional
+            If True, files whose path is already saved in the database are
+            skipped, so that an interrupted run can be continued by calling
+            this method again.
+
+        The new entries are committed in batches, so that the entries of a
+        large directory tree are never all held in memory. Every batch is
+        saved as one entry in the undo history.
+
         """
-        cmds = CompositeOperation()
+        exclude = None
+        if resume:
+            exclude = set(
+                filepath for filepath, in self.session.query(
+                    tables.DatabaseEntry.path).distinct())
         entries = tables.entries_from_dir(
-            path, recursive, pattern, self.default_waveunit)
+            path, recursive, pattern, self.default_waveunit,
+            workers=workers, progress=progress, exclude=exclude,
+            promoted_keys=self.promoted_keys)
+        # The entries of one file are always committed together, so a file
+        # is either skipped or read again completely when resuming.
+        batch = []
+        last_path = None
         for database_entry, filepath in entries:
-            if database_entry in list(self) and not ignore_already_added:
-                raise EntryAlreadyAddedError(database_entry)
-            cmd = commands.AddEntry(self.session, database_entry)
-            if self._enable_history:
-                cmds.add(cmd)
+            if filepath != last_path and len(batch) >= _COMMIT_BATCH_SIZE:
+                self.add_many(batch, ignore_already_added)
+                self.commit()
+                batch = []
+            batch.append(database_entry)
+            last_path = filepath
+        self.add_many(batch, ignore_already_added)
+        self.commit()
+
+    def sync_from_dir(self, path, recursive=False, pattern='*', workers=1,
+            progress=False):
+        """Bring the entries of the FITS files in the given directory up to
+        date. Unlike :meth:`add_from_dir`, only the files which are new or
+        whose size or modification time changed since the last call are
+        read. The entries of changed files are replaced and the entries of
+        files which no longer exist are removed. All the changes are saved as
+        one entry in the undo history.
+
+        Parameters
+        ----------
+        path : string
+            The directory where to look for FITS files.
+
+        recursive : bool, optional
+            See :meth:`sunpy.database.Database.add_from_dir`.
+
+        pattern : string, optional
+            See :meth:`sunpy.database.Database.add_from_dir`.
+
+        workers : int, optional
+            See :meth:`sunpy.database.Database.add_from_dir`.
+
+        progress : bool, optional
+            If True, show a progress bar of the files which are read.
+
+        """
+        prefix = os.path.join(path, '')
+        topdir = os.path.dirname(prefix)
+
+        def in_scope(filepath):
+            return (
+                filepath.startswith(prefix) and
+                (recursive or os.path.dirname(filepath) == topdir) and
+                fnmatch.fnmatch(filepath, pattern))
+
+        files = {}
+        for filepath in tables._find_files(path, recursive, pattern):
+            stat = os.stat(filepath)
+            files[filepath] = (stat.st_size, stat.st_mtime)
+        indexed = dict(
+            (indexed_file.path, indexed_file)
+            for indexed_file in self.session.query(tables.IndexedFile).filter(
+                tables.IndexedFile.path.like(prefix + '%'))
+            if in_scope(indexed_file.path))
+        saved_paths = set(
+            filepath for filepath, in self.session.query(
+                tables.DatabaseEntry.path).filter(
+                tables.DatabaseEntry.path.like(prefix + '%')).distinct()
+            if in_scope(filepath))
+        changed = set(
+            filepath for filepath, state in files.items()
+            if filepath not in indexed or
+            (indexed[filepath].size, indexed[filepath].mtime) != state)
+        vanished = (set(indexed) | saved_paths) - set(files)
+
+        cmds = CompositeOperation()
+        removed_entries = []
+        outdated = sorted((changed & saved_paths) | vanished)
+        for i in range(0, len(outdated), _LOOKUP_BATCH_SIZE):
+            query = self.session.query(tables.DatabaseEntry).filter(
+                tables.DatabaseEntry.path.in_(
+                    outdated[i:i + _LOOKUP_BATCH_SIZE]))
+            for database_entry in query:
+                cmds.add(commands.RemoveEntry(self.session, database_entry))
+                removed_entries.append(database_entry)
+        for filepath in sorted(vanished):
+            if filepath in indexed:
+                cmds.add(commands.RemoveEntry(self.session, indexed[filepath]))
+        for filepath in sorted(changed):
+            size, mtime = files[filepath]
+            if filepath in indexed:
+                cmds.add(commands.EditEntry(
+                    indexed[filepath], size=size, mtime=mtime))
             else:
-                cmd()
-            self._cache.append(database_entry)
-        if cmds:
+                cmds.add(commands.AddEntry(
+                    self.session, tables.IndexedFile(filepath, size, mtime)))
+        entries = tables._entries_from_paths(
+            sorted(changed), self.default_waveunit, workers, progress,
+            self.promoted_keys)
+        new_entries = [database_entry for database_entry, filepath in entries]
+        if new_entries:
+            cmds.add(commands.AddEntries(self.session, new_entries))
+        if not len(cmds):
+            return
+        if self._enable_history:
             self._command_manager.do(cmds)
+        else:
+            cmds()
+        for database_entry in removed_entries:
+            try:
+                del self._cache[database_entry.id]
+            except KeyError:
+                pass
+        for database_entry in new_entries:
+            self._cache_entry(database_entry)
 
     def add_from_file(self, file, ignore_already_added=False):
         """Generate as many database entries as there are FITS headers in the
@@ -770,7 +1015,8 @@ class Database(object):
 
         """
         self.add_many(
-            tables.entries_from_file(file, self.default_waveunit),
+            tables.entries_from_file(
+                file, self.default_waveunit, self.promoted_keys),
             ignore_already_added)
 
     def edit(self, database_entry, **kwargs):
@@ -785,7 +1031,7 @@ class Database(object):
             self._command_manager.do(cmd)
         else:
             cmd()
-        self._cache[database_entry.id] = database_entry
+        self._cache_entry(database_entry)
 
     def remove_many(self, database_entries):
         """Remove a row of database entries "at once". If this method is used,
@@ -840,13 +1086,16 @@ class Database(object):
         # remove all entries from all helper tables
         database_tables = [
             tables.JSONDump, tables.Tag, tables.FitsHeaderEntry,
-            tables.FitsKeyComment]
+            tables.FitsKeyComment, tables.FitsHeaderBlob, tables.IndexedFile]
         for table in database_tables:
             for entry in self.session.query(table):
                 cmds.add(commands.RemoveEntry(self.session, entry))
         for entry in self:
             cmds.add(commands.RemoveEntry(self.session, entry))
-            del self._cache[entry.id]
+            try:
+                del self._cache[entry.id]
+            except KeyError:
+                pass
         if self._enable_history:
             self._command_manager.do(cmds)
         else:
@@ -881,31 +1130,53 @@ class Database(object):
         """
         self._command_manager.redo(n)  # pragma: no cover
 
+    def _entries_query(self):
+        return self.session.query(tables.DatabaseEntry).order_by(
+            tables.DatabaseEntry.id)
+
     def __getitem__(self, key):
+        """Get the entries by their position in the table, sorted by ID.
+        Only the requested entries are read from the database."""
         if isinstance(key, slice):
-            entries = []
-            start = 0 if key.start is None else key.start
-            stop = len(self) if key.stop is None else key.stop
-            step = 1 if key.step is None else key.step
-            for i in xrange(start, stop, step):
-                try:
-                    entry = self[i]
-                except IndexError:
-                    break
-                else:
-                    self._cache[entry.id]
-                    entries.append(entry)
+            indices = range(*key.indices(len(self)))
+            if not indices:
+                return []
+            first = min(indices[0], indices[-1])
+            last = max(indices[0], indices[-1])
+            rows = self._entries_query().offset(first).limit(
+                last - first + 1).all()
+            entries = [rows[i - first] for i in indices]
+            for entry in entries:
+                self._touch(entry)
             return entries
         # support negative indices
         if key < 0 < abs(key) <= len(self):
             key %= len(self)
-        for i, entry in enumerate(self):
-            if i == key:
-                # "touch" the entry in the cache to intentionally cause
-                # possible side-effects
-                self._cache[entry.id]
-                return entry
-        raise IndexError
+        if key < 0:
+            raise IndexError
+        entry = self._entries_query().offset(key).limit(1).first()
+        if entry is None:
+            raise IndexError
+        self._touch(entry)
+        return entry
+
+    def iter_entries(self, page_size=1000):
+        """Iterate over all database entries, sorted by ID. The entries are
+        read from the database in pages of ``page_size`` entries, so only
+        one page is held in memory by the iterator at a time.
+
+        """
+        last_id = None
+        while True:
+            query = self._entries_query()
+            if last_id is not None:
+                query = query.filter(tables.DatabaseEntry.id > last_id)
+            page = query.limit(page_size).all()
+            if not page:
+                return
+            for entry in page:
+                yield entry
+            last_id = page[-1].id
 
     def __contains__(self, database_entry):
         """Return True if the given database_entry entry is saved in the
@@ -918,7 +1189,7 @@ class Database(object):
 
     def __iter__(self):
         """iterate over all database entries that have been saved."""
-        return iter(self.session.query(tables.DatabaseEntry))
+        return self.iter_entries()
 
     def __len__(self):
         """Get the number of rows in the table."""
@@ -7,18 +7,23 @@ from __future__ import absolute_import
 
 from time import strptime, mktime
 from datetime import datetime
+from multiprocessing import Pool
 import fnmatch
+import json
 import os
+import zlib
 
 from astropy.units import Unit, nm, equivalencies
 from sqlalchemy import Column, Integer, Float, String, DateTime, Boolean,\
-    Table, ForeignKey
+    LargeBinary, Table, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
 from sunpy.time import parse_time
 from sunpy.io import fits, file_tools as sunpy_filetools
+from sunpy.io.header import FileHeader
 from sunpy.util import print_table
+from sunpy.util.progressbar import TTYProgressBar
 from sunpy.extern.six.moves import map as imap
 
 from sunpy import config
@@ -28,7 +33,8 @@ TIME_FORMAT = config.get("general", "time_format")
 
 __all__ = [
     'WaveunitNotFoundError', 'WaveunitNotConvertibleError', 'JSONDump',
-    'FitsHeaderEntry', 'FitsKeyComment', 'Tag', 'DatabaseEntry',
+    'FitsHeaderEntry', 'FitsKeyComment', 'FitsHeaderBlob', 'Tag',
+    'IndexedFile', 'DatabaseEntry',
     'entries_from_query_result', 'entries_from_file', 'entries_from_dir',
     'display_entries']
 
@@ -96,8 +102,11 @@ class JSONDump(Base):
 
 class FitsHeaderEntry(Base):
     __tablename__ = 'fitsheaderentries'
+    __table_args__ = (
+        Index('ix_fitsheaderentries_key_value', 'key', 'value'),
+    )
 
-    dbentry_id = Column(Integer, ForeignKey('data.id'))
+    dbentry_id = Column(Integer, ForeignKey('data.id'), index=True)
     id = Column(Integer, primary_key=True)
     key = Column(String, nullable=False)
     value = Column(String)
@@ -146,6 +155,57 @@ class FitsKeyComment(Base):
             self.__class__.__name__, self.id, self.key, self.value)
 
 
+class FitsHeaderBlob(Base):
+    """A complete FITS header, including the key comments, stored as one
+    compressed value. This is used instead of one :class:`FitsHeaderEntry`
+    and :class:`FitsKeyComment` per card if a database is opened with
+    ``promoted_keys``."""
+    __tablename__ = 'fitsheaderblobs'
+
+    dbentry_id = Column(Integer, ForeignKey('data.id'), index=True)
+    id = Column(Integer, primary_key=True)
+    data = Column(LargeBinary, nullable=False)
+
+    def __init__(self, data):
+        self.data = data
+
+    @classmethod
+    def from_header(cls, header):
+        """Compress a header as returned by :func:`sunpy.io.fits.get_header`."""
+        cards = []
+        comments = {}
+        for key, value in header.iteritems():
+            if key == 'KEYCOMMENTS':
+                comments = dict(value)
+            elif key == '':
+                cards.append((key, str(value)))
+            else:
+                cards.append((key, value))
+        # values which JSON does not know, e.g. undefined values, are
+        # stored as strings
+        dump = json.dumps(
+            {'cards': cards, 'comments': comments}, default=str)
+        return cls(zlib.compress(dump.encode('utf-8')))
+
+    @property
+    def header(self):
+        """The header as a :class:`sunpy.io.header.FileHeader`."""
+        dump = json.loads(zlib.decompress(self.data).decode('utf-8'))
+        header = FileHeader(dump['cards'])
+        header['KEYCOMMENTS'] = dump['comments']
+        return header
+
+    def __eq__(self, other):
+        return self.data == other.data
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __repr__(self):  # pragma: no cover
+        return '<{0}(id {1}, {2} bytes)>'.format(
+            self.__class__.__name__, self.id, len(self.data))
+
+
 class Tag(Base):
     __tablename__ = 'tags'
 
@@ -167,6 +227,35 @@ class Tag(Base):
         return '<{0}(name {1!r})>'.format(self.__class__.__name__, self.name)
 
 
+class IndexedFile(Base):
+    """The size and modification time of a file when it was last read by
+    :meth:`sunpy.database.Database.sync_from_dir`."""
+    __tablename__ = 'indexedfiles'
+
+    id = Column(Integer, primary_key=True)
+    path = Column(String, nullable=False, unique=True)
+    size = Column(Integer)
+    mtime = Column(Float)
+
+    def __init__(self, path, size, mtime):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+
+    def __eq__(self, other):
+        return (
+            self.path == other.path and
+            self.size == other.size and
+            self.mtime == other.mtime)
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __repr__(self):  # pragma: no cover
+        return '<{0}(path {1!r}, size {2}, mtime {3})>'.format(
+            self.__class__.__name__, self.path, self.size, self.mtime)
+
+
 class DatabaseEntry(Base):
     """
     DatabaseEntry()
@@ -215,7 +304,11 @@ class DatabaseEntry(Base):
     starred : bool
         Entries can be starred to mark them. By default, this value is False.
     fits_header_entries : list
-        A list of ``FitsHeaderEntry`` instances.
+        A list of ``FitsHeaderEntry`` instances. If the entry was made with
+        ``promoted_keys``, only the cards of these keys are listed.
+    fits_header_blob : FitsHeaderBlob
+        The complete compressed header if the entry was made with
+        ``promoted_keys``, otherwise None.
     tags : list
         A list of ``Tag`` instances. Use `sunpy.database.Database.tag` to
         add a new tag or multiple tags to a specific entry.
@@ -228,20 +321,39 @@ class DatabaseEntry(Base):
     source = Column(String)
     provider = Column(String)
     physobs = Column(String)
-    fileid = Column(String)
-    observation_time_start = Column(DateTime)
-    observation_time_end = Column(DateTime)
-    instrument = Column(String)
+    fileid = Column(String, index=True)
+    observation_time_start = Column(DateTime, index=True)
+    observation_time_end = Column(DateTime, index=True)
+    instrument = Column(String, index=True)
     size = Column(Float)
-    wavemin = Column(Float)
-    wavemax = Column(Float)
+    wavemin = Column(Float, index=True)
+    wavemax = Column(Float, index=True)
     path = Column(String)
     download_time = Column(DateTime)
     starred = Column(Boolean, default=False)
     fits_header_entries = relationship('FitsHeaderEntry')
     fits_key_comments = relationship('FitsKeyComment')
+    fits_header_blob = relationship('FitsHeaderBlob', uselist=False)
     tags = relationship('Tag', secondary=association_table, backref='data')
 
+    @property
+    def fits_header(self):
+        """The FITS header this entry was made from as a
+        :class:`sunpy.io.header.FileHeader`, or None if it was not made from
+        a FITS file. If the header is stored as one
+        :class:`FitsHeaderEntry` per card, the values are strings."""
+        if self.fits_header_blob is not None:
+            return self.fits_header_blob.header
+        if not self.fits_header_entries:
+            return None
+        header = FileHeader(
+            (header_entry.key, header_entry.value)
+            for header_entry in self.fits_header_entries)
+        header['KEYCOMMENTS'] = dict(
+            (comment.key, comment.value)
+            for comment in self.fits_key_comments)
+        return header
+
     @classmethod
     def _from_query_result_block(cls, qr_block, default_waveunit=None):
         """Make a new :class:`DatabaseEntry` instance from a VSO query result
@@ -413,7 +525,7 @@ def entries_from_query_result(qr, default_waveunit=None):
         yield DatabaseEntry._from_query_result_block(block, default_waveunit)
 
 
-def entries_from_file(file, default_waveunit=None):
+def entries_from_file(file, default_waveunit=None, promoted_keys=None):
     """Use the headers of a FITS file to generate an iterator of
     :class:`sunpy.database.tables.DatabaseEntry` instances. Gathered
     information will be saved in the attribute `fits_header_entries`. If the
@@ -435,6 +547,12 @@ def entries_from_file(file, default_waveunit=None):
         The wavelength unit that is used for a header if it cannot be
         found.
 
+    promoted_keys : iterable of str, optional
+        If given, each header is stored as one compressed
+        :class:`FitsHeaderBlob` and only the cards of these keys are stored
+        as :class:`FitsHeaderEntry` instances, which can be queried. By
+        default every card and key comment is stored in its own row.
+
     Raises
     ------
     sunpy.database.WaveunitNotFoundError
@@ -468,12 +586,24 @@ def entries_from_file(file, default_waveunit=None):
 
     """
     headers = fits.get_header(file)
+    return _entries_from_headers(
+        headers, file, default_waveunit, promoted_keys)
+
+
+def _entries_from_headers(headers, file, default_waveunit=None,
+        promoted_keys=None):
+    """Generate the database entries for the FITS headers read from a file,
+    see :func:`entries_from_file`."""
     if isinstance(file, (str, unicode)):
         filename = file
     else:
         filename = getattr(file, 'name', None)
+    if promoted_keys is not None:
+        promoted_keys = set(key.upper() for key in promoted_keys)
     for header in headers:
         entry = DatabaseEntry(path=filename)
+        if promoted_keys is not None:
+            entry.fits_header_blob = FitsHeaderBlob.from_header(header)
         for key, value in header.iteritems():
             # Yes, it is possible to have an empty key in a FITS file.
             # Example: sunpy.data.sample.EIT_195_IMAGE
@@ -481,10 +611,12 @@ def entries_from_file(file, default_waveunit=None):
             if key == '':
                 value = str(value)
             elif key == 'KEYCOMMENTS':
-                for k, v in value.iteritems():
-                    entry.fits_key_comments.append(FitsKeyComment(k, v))
+                if promoted_keys is None:
+                    for k, v in value.iteritems():
+                        entry.fits_key_comments.append(FitsKeyComment(k, v))
                 continue
-            entry.fits_header_entries.append(FitsHeaderEntry(key, value))
+            if promoted_keys is None or key in promoted_keys:
+                entry.fits_header_entries.append(FitsHeaderEntry(key, value))
         waveunit = fits.extract_waveunit(header)
         if waveunit is None:
             waveunit = default_waveunit
@@ -494,8 +626,7 @@ def entries_from_file(file, default_waveunit=None):
                 unit = Unit(waveunit)
             except ValueError:
                 raise WaveunitNotConvertibleError(waveunit)
-        for header_entry in entry.fits_header_entries:
-            key, value = header_entry.key, header_entry.value
+        for key, value in header.iteritems():
             if key == 'INSTRUME':
                 entry.instrument = value
             elif key == 'WAVELNTH':
@@ -513,8 +644,30 @@ def entries_from_file(file, default_waveunit=None):
         yield entry
 
 
+def _read_headers(path):
+    """Return the path and the FITS headers of a file, the headers are None
+    if the file is not a FITS file. This is run in the worker processes of
+    :func:`entries_from_dir`, so the headers are made picklable."""
+    try:
+        filetype = sunpy_filetools._detect_filetype(path)
+    except (
+            sunpy_filetools.UnrecognizedFileTypeError,
+            sunpy_filetools.InvalidJPEG2000FileExtension):
+        return path, None
+    if filetype != 'fits':
+        return path, None
+    headers = fits.get_header(path)
+    for header in headers:
+        # Yes, it is possible to have an empty key in a FITS file, its value
+        # is a list of cards.
+        if '' in header:
+            header[''] = str(header[''])
+    return path, headers
+
+
 def entries_from_dir(fitsdir, recursive=False, pattern='*',
-        default_waveunit=None):
+        default_waveunit=None, workers=1, progress=False, exclude=None,
+        promoted_keys=None):
     """Search the given directory for FITS files and use the corresponding FITS
     headers to generate instances of :class:`DatabaseEntry`. FITS files are
     detected by reading the content of each file, the `pattern` argument may be
@@ -542,6 +695,20 @@ def entries_from_dir(fitsdir, recursive=False, pattern='*',
         See
         :meth:`sunpy.database.tables.DatabaseEntry.add_fits_header_entries_from_file`.
 
+    workers : int, optional
+        The number of processes which read the FITS headers. The default is
+        to read them in this process. The entries are still generated in the
+        order of the files.
+
+    progress : bool, optional
+        If True, show a progress bar of the files which have been read.
+
+    exclude : container of str, optional
+        Paths of files which are not read.
+
+    promoted_keys : iterable of str, optional
+        See :func:`sunpy.database.tables.entries_from_file`.
+
     Returns
     -------
     generator of (DatabaseEntry, str) pairs
@@ -562,18 +729,50 @@ def entries_from_dir(fitsdir, recursive=False, pattern='*',
     59
 
     """
+    paths = _find_files(fitsdir, recursive, pattern)
+    if exclude:
+        paths = (path for path in paths if path not in exclude)
+    for entry, path in _entries_from_paths(
+            paths, default_waveunit, workers, progress, promoted_keys):
+        yield entry, path
+
+
+def _entries_from_paths(paths, default_waveunit=None, workers=1,
+        progress=False, promoted_keys=None):
+    """Generate the database entries of the FITS files in a sequence of
+    paths, see :func:`entries_from_dir`."""
+    pbar = None
+    if progress:
+        paths = list(paths)
+        pbar = TTYProgressBar(len(paths))
+        pbar.start()
+    pool = Pool(workers) if workers > 1 else None
+    try:
+        if pool is None:
+            results = imap(_read_headers, paths)
+        else:
+            results = pool.imap(_read_headers, paths, chunksize=16)
+        for path, headers in results:
+            if headers is not None:
+                for entry in _entries_from_headers(
+                        headers, path, default_waveunit, promoted_keys):
+                    yield entry, path
+            if pbar is not None:
+                pbar.poke()
+    finally:
+        if pool is not None:
+            pool.terminate()
+        if pbar is not None:
+            pbar.finish()
+
+
+def _find_files(fitsdir, recursive=False, pattern='*'):
+    """Generate the paths of the files in a directory which match a
+    pattern, see :func:`entries_from_dir`."""
     for dirpath, dirnames, filenames in os.walk(fitsdir):
         filename_paths = (os.path.join(dirpath, name) for name in filenames)
         for path in fnmatch.filter(filename_paths, pattern):
-            try:
-                filetype = sunpy_filetools._detect_filetype(path)
-            except (
-                    sunpy_filetools.UnrecognizedFileTypeError,
-                    sunpy_filetools.InvalidJPEG2000FileExtension):
-                continue
-            if filetype == 'fits':
-                for entry in entries_from_file(path, default_waveunit):
-                    yield entry, path
+            yield path
         if not recursive:
             break
 
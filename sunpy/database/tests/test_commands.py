@@ -11,8 +11,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 import pytest
 
-from sunpy.database.commands import AddEntry, RemoveEntry, EditEntry,\
-    AddTag, RemoveTag, NoSuchEntryError, NonRemovableTagError,\
+from sunpy.database.commands import AddEntry, AddEntries, RemoveEntry,\
+    EditEntry, AddTag, RemoveTag, NoSuchEntryError, NonRemovableTagError,\
     EmptyCommandStackError, CommandManager, CompositeOperation
 from sunpy.database.tables import DatabaseEntry, Tag
 
@@ -75,6 +75,20 @@ def test_add_removed_entry(session):
     assert entry.id == 1
 
 
+def test_add_entries(session):
+    entries = [DatabaseEntry() for _ in range(5)]
+    cmd = AddEntries(session, entries, batch_size=2)
+    cmd()
+    # the entries have been flushed to the database
+    assert not session.new
+    assert [entry.id for entry in entries] == [1, 2, 3, 4, 5]
+    cmd.undo()
+    assert session.query(DatabaseEntry).count() == 0
+    cmd()
+    session.commit()
+    assert session.query(DatabaseEntry).count() == 5
+
+
 def test_add_entry_undo_precommit(session):
     entry = DatabaseEntry()
     cmd = AddEntry(session, entry)
@@ -25,7 +25,7 @@ from sunpy.database.commands import EmptyCommandStackError, NoSuchEntryError
 from sunpy.database.caching import LRUCache, LFUCache
 from sunpy.database import attrs
 from sunpy.net import vso, hek
-from sunpy.data.test.waveunit import waveunitdir
+from sunpy.data.test.waveunit import waveunitdir, MQ_IMAGE
 from sunpy.io import fits
 
 import sunpy.data.test
@@ -361,7 +361,7 @@ def test_unstar_undo(database):
 
 def test_add_many(database):
     assert len(database) == 0
-    database.add_many((DatabaseEntry() for _ in xrange(5)))
+    database.add_many((DatabaseEntry(fileid=str(i)) for i in xrange(5)))
     assert len(database) == 5
     database.undo()
     with pytest.raises(EmptyCommandStackError):
@@ -379,6 +379,36 @@ def test_add_many_with_existing_entry(database):
         database.add_many([evil_entry])
 
 
+def test_add_many_duplicates_lookup(database):
+    # more entries than are looked up with one query
+    database.add_many(
+        DatabaseEntry(fileid=str(i), provider='SDAC') for i in xrange(250))
+    assert len(database) == 250
+    with pytest.raises(EntryAlreadyAddedError):
+        database.add_many([
+            DatabaseEntry(fileid='new', provider='SDAC'),
+            DatabaseEntry(fileid='249', provider='SDAC')])
+    assert len(database) == 250
+    # entries with the same natural key but different attributes are new
+    database.add_many([
+        DatabaseEntry(fileid='new', provider='SDAC'),
+        DatabaseEntry(fileid='249', provider='SDAC', size=42)])
+    assert len(database) == 252
+    database.undo()
+    assert len(database) == 250
+
+
+def test_add_many_duplicates_in_batch(database):
+    entry = DatabaseEntry(fileid='a', provider='SDAC')
+    for entries in ([entry, entry],
+                    [entry, DatabaseEntry(fileid='a', provider='SDAC')]):
+        with pytest.raises(EntryAlreadyAddedError):
+            database.add_many(entries)
+        assert len(database) == 0
+    database.add_many([entry, entry], ignore_already_added=True)
+    assert len(database) == 1
+
+
 def test_add_entry(database):
     entry = DatabaseEntry()
     assert entry.id is None
@@ -483,6 +513,73 @@ def test_add_fom_path_ignore_duplicates(database):
     assert len(database) == 8
 
 
+def test_add_fom_path_workers(database):
+    database.add_from_dir(waveunitdir, workers=2)
+    assert len(database) == 4
+
+
+def test_add_fom_path_resume(database):
+    database.add_from_dir(waveunitdir, resume=True)
+    assert len(database) == 4
+    # all the files are skipped, so no duplicates are added
+    database.add_from_dir(waveunitdir, resume=True)
+    assert len(database) == 4
+    database.remove(database[0])
+    database.add_from_dir(waveunitdir, resume=True)
+    assert len(database) == 4
+
+
+def test_add_fom_path_batches(database, monkeypatch):
+    monkeypatch.setattr('sunpy.database.database._COMMIT_BATCH_SIZE', 1)
+    database.add_from_dir(waveunitdir)
+    assert len(database) == 4
+    # every file has been committed as a batch of its own
+    for i in range(4):
+        database.undo()
+        assert len(database) == 3 - i
+
+
+def test_sync_from_dir(database, tmpdir):
+    for filename in glob.glob(os.path.join(waveunitdir, '*.f*ts')):
+        shutil.copy(filename, str(tmpdir))
+    database.sync_from_dir(str(tmpdir))
+    assert len(database) == 4
+    # nothing changed, so nothing is read and no undo step is added
+    database.sync_from_dir(str(tmpdir))
+    assert len(database) == 4
+    database.undo()
+    assert len(database) == 0
+    database.redo()
+    assert len(database) == 4
+
+    changed = tmpdir.join('mq130812.084253.fits')
+    os.utime(str(changed), (0, 0))
+    old_entries = list(database.query(attrs.Path(str(changed))))
+    database.sync_from_dir(str(tmpdir))
+    assert len(database) == 4
+    new_entries = list(database.query(attrs.Path(str(changed))))
+    assert len(new_entries) == 1
+    assert new_entries[0].id not in [entry.id for entry in old_entries]
+
+    tmpdir.join('na120701.091058.fits').remove()
+    database.sync_from_dir(str(tmpdir))
+    assert len(database) == 3
+    database.undo()
+    assert len(database) == 4
+
+
+def test_add_from_file_promoted_keys():
+    database = Database('sqlite:///:memory:', promoted_keys=['INSTRUME'])
+    database.add_from_file(MQ_IMAGE)
+    database.commit()
+    assert database.session.query(FitsHeaderEntry).count() == 1
+    assert database.session.query(FitsKeyComment).count() == 0
+    entries = database.query(
+        attrs.FitsHeaderEntry('INSTRUME', 'Spectroheliograph'))
+    assert len(entries) == 1
+    assert entries[0].fits_header['NAXIS2'] == 1340
+
+
 def test_add_from_file(database):
     assert len(database) == 0
     database.add_from_file(RHESSI_IMAGE)
@@ -618,6 +715,30 @@ def test_getitem_negative_indices_slice(filled_database):
         DatabaseEntry(id=5, tags=[bar])]
 
 
+def test_lazy_cache(tmpdir):
+    url = 'sqlite:///' + str(tmpdir.join('lazy.db'))
+    database = Database(url)
+    database.add_many(DatabaseEntry(fileid=str(i)) for i in xrange(5))
+    database.commit()
+    database = Database(url)
+    # the cache is filled when entries are accessed
+    assert database.cache_size == 0
+    assert database.get_entry_by_id(3).fileid == '2'
+    assert database[0].fileid == '0'
+    assert database.cache_size == 2
+    with pytest.raises(EntryNotFoundError):
+        database.get_entry_by_id(42)
+    # a limited cache knows about all entries
+    database = Database(url, cache_size=10)
+    assert database.cache_size == 5
+
+
+def test_iter_entries(filled_database):
+    entries = list(filled_database.iter_entries(page_size=3))
+    assert [entry.id for entry in entries] == list(xrange(1, 11))
+    assert entries == list(filled_database)
+
+
 def test_contains_exists(database):
     entry = DatabaseEntry()
     database.add(entry)
@@ -713,6 +834,30 @@ def test_query(filled_database):
         DatabaseEntry(id=10, tags=[bar])]
 
 
+def test_query_sortby(database):
+    for i in xrange(1, 6):
+        database.add(DatabaseEntry(
+            instrument='AIA' if i % 2 else 'HMI', wavemin=10 - i,
+            wavemax=10 - i))
+    database.commit()
+    entries = database.query(vso.attrs.Instrument('AIA'), sortby='wavemin')
+    assert [entry.wavemin for entry in entries] == [5, 7, 9]
+    entries = database.query(
+        vso.attrs.Instrument('AIA') & ~attrs.Starred() |
+        vso.attrs.Instrument('HMI'), sortby='wavemin')
+    assert [entry.wavemin for entry in entries] == [5, 6, 7, 8, 9]
+
+
+def test_indexes(database):
+    inspector = sqlalchemy.inspect(database._engine)
+    data_indexes = [index['name'] for index in inspector.get_indexes('data')]
+    assert 'ix_data_observation_time_start' in data_indexes
+    assert 'ix_data_instrument' in data_indexes
+    header_indexes = [
+        index['name'] for index in inspector.get_indexes('fitsheaderentries')]
+    assert 'ix_fitsheaderentries_key_value' in header_indexes
+
+
 def test_download_missing_arg(database):
     with pytest.raises(TypeError):
         database.download()
@@ -168,6 +168,24 @@ def test_entries_from_file():
     assert entry.path == MQ_IMAGE
 
 
+def test_entries_from_file_promoted_keys():
+    entry, = entries_from_file(MQ_IMAGE, promoted_keys=['instrume', 'NBREG'])
+    assert entry.fits_header_entries == [
+        FitsHeaderEntry('INSTRUME', 'Spectroheliograph'),
+        FitsHeaderEntry('NBREG', 1)]
+    assert entry.fits_key_comments == []
+    assert entry.instrument == 'Spectroheliograph'
+    assert round(entry.wavemin, 1) == 656.3
+    header = entry.fits_header
+    assert len(header) == 32
+    assert header['NAXIS1'] == 1500
+    assert header['SIMPLE'] is True
+    assert header['KEYCOMMENTS'] == {
+        'SIMPLE': 'Written by IDL:  Mon Aug 12 08:48:08 2013',
+        'BITPIX': 'Integer*2 (short integer)'}
+    assert list(header.keys())[:3] == ['SIMPLE', 'BITPIX', 'NAXIS']
+
+
 def test_entries_from_file_withoutwaveunit():
     # does not raise `WaveunitNotFoundError`, because no wavelength information
     # is present in this file
@@ -259,6 +277,22 @@ def test_entries_from_dir_recursively_false():
     assert len(entries) == 39
 
 
+def test_entries_from_dir_workers():
+    expected = list(entries_from_dir(waveunitdir))
+    entries = list(entries_from_dir(waveunitdir, workers=2))
+    assert [filename for entry, filename in entries] == [
+        filename for entry, filename in expected]
+    assert [entry for entry, filename in entries] == [
+        entry for entry, filename in expected]
+
+
+def test_entries_from_dir_exclude():
+    filenames = [filename for entry, filename in entries_from_dir(waveunitdir)]
+    entries = list(entries_from_dir(waveunitdir, exclude=set(filenames[:1])))
+    assert filenames[0] not in [filename for entry, filename in entries]
+    assert len(entries) == len(filenames) - filenames.count(filenames[0])
+
+
 @pytest.mark.online
 def test_entries_from_query_result(query_result):
     entries = list(entries_from_query_result(query_result))
@@ -62,16 +62,14 @@ def read_file(filepath, filetype=None, **kwargs):
     -------
     pairs : `list`
         A list of (data, header) tuples.
-    """
-    if filetype:
-        return _readers[filetype].read(filepath, **kwargs)
-
-    for extension, readername in _known_extensions.items():
-        if filepath.endswith(extension) or filetype in extension:
-            return _readers[readername].read(filepath, **kwargs)
 
-    # If filetype is not apparent from extension, attempt to detect
-    readername = _detect_filetype(filepath)
+    Notes
+    -----
+    Other keyword arguments are passed to the reader, e.g. ``rlevel`` and
+    ``area`` for `sunpy.io.jp2.read` or ``hdus`` and ``section`` for
+    `sunpy.io.fits.read`.
+    """
+    readername = _get_reader_name(filepath, filetype)
     return _readers[readername].read(filepath, **kwargs)
 
 def read_file_header(filepath, filetype=None, **kwargs):
@@ -96,14 +94,7 @@ def read_file_header(filepath, filetype=None, **kwargs):
     headers : `list`
         A list of headers
     """
-    if filetype:
-        return _readers[filetype].get_header(filepath, **kwargs)
-
-    for extension, readername in _known_extensions.items():
-        if filepath.endswith(extension) or filetype in extension:
-            return _readers[readername].get_header(filepath, **kwargs)
-
-    readername = _detect_filetype(filepath)
+    readername = _get_reader_name(filepath, filetype)
     return _readers[readername].get_header(filepath, **kwargs)
 
 def write_file(fname, data, header, filetype='auto', **kwargs):
@@ -143,6 +134,33 @@ def write_file(fname, data, header, filetype='auto', **kwargs):
     # Nothing has matched, panic
     raise ValueError("This filetype is not supported")
 
+def _get_reader_name(filepath, filetype=None):
+    """
+    Work out which reader should be used for a file.
+
+    Parameters
+    ----------
+    filepath : `str`
+        Where the file is.
+
+    filetype : `str`
+        Supported reader to manually specify the filetype.
+
+    Returns
+    -------
+    readername : `str`
+        The name of the reader, i.e. a key of ``_readers``.
+    """
+    if filetype:
+        return filetype
+
+    for extension, readername in _known_extensions.items():
+        if filepath.endswith(extension):
+            return readername
+
+    # If filetype is not apparent from extension, attempt to detect
+    return _detect_filetype(filepath)
+
 def _detect_filetype(filepath):
     """
     Attempts to determine the type of data contained in a file.  This is only
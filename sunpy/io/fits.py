@@ -34,19 +34,18 @@ from __future__ import absolute_import, division, print_function
 import os
 import re
 import itertools
-import collections
 
 from astropy.io import fits
 
 from sunpy.io.header import FileHeader
-from sunpy.extern.six.moves import zip
+from sunpy.extern.six.moves import range
 
 __all__ = ['read', 'get_header', 'write', 'extract_waveunit']
 
 __author__ = "Keith Hughitt, Stuart Mumford, Simon Liedtke"
 __email__ = "keith.hughitt@nasa.gov"
 
-def read(filepath, hdus=None):
+def read(filepath, hdus=None, memmap=None, section=None, comments=True):
     """
     Read a fits file
 
@@ -54,8 +53,19 @@ def read(filepath, hdus=None):
     ----------
     filepath : `str`
         The fits file to be read
-    hdu: `int` or iterable
-        The HDU indexes to read from the file
+    hdus : `int` or iterable
+        The HDU indexes to read from the file. Only these HDUs are loaded,
+        the headers and data of the others are never read.
+    memmap : `bool`, optional
+        If True the data arrays are memory-mapped from the file rather than
+        read into memory. Defaults to the astropy default.
+    section : `tuple` of `slice`, optional
+        Only read this section of the data of each image HDU, in numpy
+        (row, column) order. The NAXIS, CRPIX and CDELT keywords of the header
+        are updated to describe the section.
+    comments : `bool`, optional
+        If False the COMMENT, HISTORY and KEYCOMMENTS keys of the headers are
+        left empty, which is faster for files with long headers.
 
     Returns
     -------
@@ -68,26 +78,34 @@ def read(filepath, hdus=None):
     data and a FileHeader instance for each one.
     Also all comments in the original file are concatenated into a single
     'comment' key in the returned FileHeader.
+
+    Memory-mapping is not possible for compressed files or for integer images
+    which need to be scaled with BSCALE and BZERO, astropy reads these into
+    memory regardless of ``memmap``.
     """
-    hdulist = fits.open(filepath)
-    if hdus is not None:
-        if isinstance(hdus, int):
-            hdulist = hdulist[hdus]
-        elif isinstance(hdus, collections.Iterable):
-            hdulist = [hdulist[i] for i in hdus]
-    try:
-        hdulist.verify('silentfix+warn')
+    if section is not None:
+        section = tuple(section)
+        if not all([isinstance(s, slice) for s in section]):
+            raise ValueError("section must be a tuple of slices.")
 
-        headers = get_header(hdulist)
+    hdulist = fits.open(filepath, memmap=memmap)
+    try:
         pairs = []
-        for hdu,header in zip(hdulist, headers):
-            pairs.append((hdu.data, header))
+        for hdu in _select_hdus(hdulist, hdus):
+            hdu.verify('silentfix+warn')
+            header = _format_header(hdu, comments=comments)
+            if section is not None and hdu.is_image and hdu.header['NAXIS'] > 0:
+                data = hdu.section[section]
+                _section_header(header, section, hdu.shape)
+            else:
+                data = hdu.data
+            pairs.append((data, header))
     finally:
         hdulist.close()
 
     return pairs
 
-def get_header(afile):
+def get_header(afile, hdus=None, comments=True):
     """
     Read a fits file and return just the headers for all HDU's. In each header,
     the key WAVEUNIT denotes the wavelength unit which is used to describe the
@@ -97,6 +115,11 @@ def get_header(afile):
     ----------
     afile : `str` or fits.HDUList
         The file to be read, or HDUList to process.
+    hdus : `int` or iterable
+        The HDU indexes to read the headers of, defaults to all of them.
+    comments : `bool`, optional
+        If False the COMMENT, HISTORY and KEYCOMMENTS keys of the headers are
+        left empty.
 
     Returns
     -------
@@ -108,39 +131,86 @@ def get_header(afile):
         close = False
     else:
         hdulist = fits.open(afile)
-        hdulist.verify('silentfix')
         close=True
 
     try:
         headers= []
-        for hdu in hdulist:
-            try:
-                comment = "".join(hdu.header['COMMENT']).strip()
-            except KeyError:
-                comment = ""
-            try:
-                history = "".join(hdu.header['HISTORY']).strip()
-            except KeyError:
-                history = ""
-
-            header = FileHeader(hdu.header)
-            header['COMMENT'] = comment
-            header['HISTORY'] = history
-
-            # Strip out KEYCOMMENTS to a dict, the hard way
-            keydict = {}
-            for card in hdu.header.cards:
-                if card.comment != '':
-                    keydict.update({card.keyword:card.comment})
-            header['KEYCOMMENTS'] = keydict
-            header['WAVEUNIT'] = extract_waveunit(header)
-
-            headers.append(header)
+        for hdu in _select_hdus(hdulist, hdus):
+            if close:
+                hdu.verify('silentfix')
+            headers.append(_format_header(hdu, comments=comments))
     finally:
         if close:
             hdulist.close()
     return headers
 
+def _select_hdus(hdulist, hdus):
+    """
+    Return the HDUs with the given indexes. The HDUs of a file are loaded on
+    demand, so HDUs after the last requested one are never read.
+    """
+    if hdus is None:
+        return list(hdulist)
+    if isinstance(hdus, int):
+        hdus = [hdus]
+    return [hdulist[i] for i in hdus]
+
+def _format_header(hdu, comments=True):
+    """Build the FileHeader of a HDU"""
+    header = FileHeader(hdu.header)
+
+    if comments:
+        try:
+            comment = "".join(hdu.header['COMMENT']).strip()
+        except KeyError:
+            comment = ""
+        try:
+            history = "".join(hdu.header['HISTORY']).strip()
+        except KeyError:
+            history = ""
+
+        # Strip out KEYCOMMENTS to a dict, the hard way
+        keydict = {}
+        for card in hdu.header.cards:
+            if card.comment != '':
+                keydict.update({card.keyword:card.comment})
+    else:
+        comment = ""
+        history = ""
+        # The wavelength unit can be given in the comments of these keys
+        keydict = {}
+        for key in ('WAVEUNIT', 'WAVELNTH'):
+            if key in hdu.header and hdu.header.comments[key] != '':
+                keydict[key] = hdu.header.comments[key]
+
+    header['COMMENT'] = comment
+    header['HISTORY'] = history
+    header['KEYCOMMENTS'] = keydict
+    header['WAVEUNIT'] = extract_waveunit(header)
+
+    return header
+
+def _section_header(header, section, shape):
+    """
+    Update the NAXIS, CRPIX, CDELT and CDi_j keywords of a header for a
+    section of the data with the given (numpy order) shape.
+    """
+    naxis = len(shape)
+    for i, sl in enumerate(section):
+        axis = str(naxis - i)
+        start, stop, step = sl.indices(shape[i])
+        header['NAXIS' + axis] = len(range(start, stop, step))
+        if 'CRPIX' + axis in header:
+            header['CRPIX' + axis] = (header['CRPIX' + axis] - 1 - start) / step + 1
+        if step != 1 and 'CDELT' + axis in header:
+            header['CDELT' + axis] = header['CDELT' + axis] * step
+        if step != 1:
+            # CDi_j maps pixel axis j to world axis i
+            for world_axis in range(1, naxis + 1):
+                key = 'CD{0}_{1}'.format(world_axis, axis)
+                if key in header:
+                    header[key] = header[key] * step
+
 def write(fname, data, header, **kwargs):
     """
     Take a data header pair and write a FITS file.
@@ -13,25 +13,52 @@ from sunpy.io.header import FileHeader
 
 __all__ = ['read', 'get_header', 'write']
 
-def read(filepath):
+def read(filepath, rlevel=0, area=None):
     """
     Reads a JPEG2000 file
 
+    JPEG2000 files can be decoded at a reduced resolution, or for a region
+    of the image only, which is much faster than decoding the full image. The
+    NAXIS, CDELT and CRPIX keywords of the returned header describe the data
+    which has been read.
+
     Parameters
     ----------
     filepath : `str`
         The file to be read
+    rlevel : `int`
+        The resolution level to read, each level halves the resolution of
+        the full image, i.e. ``rlevel=2`` reads the image at 1/4 resolution.
+    area : `tuple`
+        The region to read as ``(row0, col0, row1, col1)`` pixels of the full
+        resolution array, with row 0 at the bottom of the image as in the
+        returned data. Defaults to the whole image.
 
     Returns
     -------
     pairs : `list`
         A list of (data, header) tuples
     """
-    header = get_header(filepath)
-
-    data = Jp2k(filepath).read()[::-1]
-
-    return [(data, header[0])]
+    jp2 = Jp2k(filepath)
+    header = _read_header(jp2)
+
+    nrows = _get_key(header, 'NAXIS2')
+    if area is not None:
+        if nrows is None:
+            raise ValueError("The JPEG2000 header does not describe the size "
+                             "of the image, so an area can not be read.")
+        row0, col0, row1, col1 = area
+        # The image is stored with row 0 at the top
+        data = jp2.read(rlevel=rlevel, area=(nrows - row1, col0,
+                                             nrows - row0, col1))[::-1]
+    else:
+        row0, col0 = 0, 0
+        data = jp2.read(rlevel=rlevel)[::-1]
+
+    if rlevel or area is not None:
+        _update_header(header, data.shape, 2 ** rlevel, row0, col0)
+
+    return [(data, header)]
 
 def get_header(filepath):
     """
@@ -47,7 +74,10 @@ def get_header(filepath):
     headers : list
         A list of headers read from the file
     """
-    jp2 = Jp2k(filepath)
+    return [_read_header(Jp2k(filepath))]
+
+def _read_header(jp2):
+    """Read the header from an open `glymur.Jp2k` file"""
     xml_box = [box for box in jp2.box if box.box_id == 'xml ']
     xmlstring = ET.tostring(xml_box[0].xml.find('fits'))
     pydict = xml_to_dict(xmlstring)["fits"]
@@ -63,7 +93,40 @@ def get_header(filepath):
     if 'comment' in pydict:
         pydict['comment'] = pydict['comment'].replace("\n", "")
 
-    return [FileHeader(pydict)]
+    return FileHeader(pydict)
+
+def _get_key(header, key, default=None):
+    """Get the value of a header key, regardless of its case"""
+    for k in header:
+        if k.upper() == key:
+            return header[k]
+    return default
+
+def _set_key(header, key, value):
+    """Set the value of a header key, keeping the case of an existing key"""
+    for k in header:
+        if k.upper() == key:
+            header[k] = value
+            return
+    header[key] = value
+
+def _update_header(header, shape, factor, row0, col0):
+    """
+    Update the NAXIS, CDELT and CRPIX keywords of a header for data which has
+    been read at a reduced resolution and/or offset from the full image.
+    """
+    _set_key(header, 'NAXIS1', shape[1])
+    _set_key(header, 'NAXIS2', shape[0])
+
+    for axis, offset in (('1', col0), ('2', row0)):
+        cdelt = _get_key(header, 'CDELT' + axis)
+        if cdelt is not None:
+            _set_key(header, 'CDELT' + axis, cdelt * factor)
+        crpix = _get_key(header, 'CRPIX' + axis)
+        if crpix is not None:
+            # FITS pixel centres are at integer values, so the edge of the
+            # first pixel is at 0.5
+            _set_key(header, 'CRPIX' + axis, (crpix - 0.5 - offset) / factor + 0.5)
 
 def write(fname, data, header):
     """
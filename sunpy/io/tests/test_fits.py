@@ -1,5 +1,10 @@
+import numpy as np
+from astropy import wcs
+from astropy.io import fits
+
 import sunpy.io.fits
 from sunpy.io.fits import get_header, extract_waveunit
+from sunpy.tests.helpers import is_memmapped
 
 import sunpy.data.test
 import os
@@ -28,6 +33,63 @@ def read_hdus_gen():
     pairs = sunpy.io.fits.read(RHESSI_IMAGE, hdus=xrange(0,1))
     assert len(pairs) == 2
 
+def test_read_memmap():
+    pairs = sunpy.io.fits.read(AIA_171_IMAGE, memmap=True)
+    assert is_memmapped(pairs[0][0])
+    pairs = sunpy.io.fits.read(AIA_171_IMAGE, memmap=False)
+    assert not is_memmapped(pairs[0][0])
+
+def test_read_single_hdu():
+    pairs = sunpy.io.fits.read(RHESSI_IMAGE, hdus=0)
+    assert len(pairs) == 1
+    assert pairs[0][1]['NAXIS'] == 2
+    pairs = sunpy.io.fits.read(RHESSI_IMAGE, hdus=[0, 2])
+    assert len(pairs) == 2
+
+def test_read_section():
+    data, header = sunpy.io.fits.read(AIA_171_IMAGE)[0]
+    sdata, sheader = sunpy.io.fits.read(AIA_171_IMAGE,
+                                        section=(slice(10, 50), slice(20, 100, 2)))[0]
+    np.testing.assert_array_equal(sdata, data[10:50, 20:100:2])
+    assert sheader['NAXIS1'] == 40
+    assert sheader['NAXIS2'] == 40
+    assert sheader['CRPIX1'] == (header['CRPIX1'] - 21) / 2 + 1
+    assert sheader['CRPIX2'] == header['CRPIX2'] - 10
+    assert sheader['CDELT1'] == header['CDELT1'] * 2
+
+def test_read_section_cd_matrix(tmpdir):
+    header = fits.Header()
+    header['CTYPE1'] = 'HPLN-TAN'
+    header['CTYPE2'] = 'HPLT-TAN'
+    header['CUNIT1'] = header['CUNIT2'] = 'arcsec'
+    header['CRPIX1'], header['CRPIX2'] = 30.5, 20.5
+    header['CRVAL1'], header['CRVAL2'] = 10., -5.
+    header['CD1_1'], header['CD1_2'] = 0.6, -0.1
+    header['CD2_1'], header['CD2_2'] = 0.1, 0.6
+    filename = str(tmpdir.join('cd.fits'))
+    fits.writeto(filename, np.zeros((60, 80)), header)
+
+    section = (slice(10, 50, 3), slice(20, 80, 2))
+    sheader = sunpy.io.fits.read(filename, section=section)[0][1]
+    assert sheader['CD1_1'] == 0.6 * 2
+    assert sheader['CD1_2'] == -0.1 * 3
+    # the pixels of the section are at the same world coordinates as the
+    # pixels they were read from
+    full_wcs = wcs.WCS(fits.getheader(filename))
+    section_wcs = wcs.WCS(fits.Header(dict((key, sheader[key])
+                                           for key in header)))
+    pixels = np.array([[0, 0], [3, 5], [29, 13]])
+    np.testing.assert_allclose(
+        section_wcs.wcs_pix2world(pixels, 0),
+        full_wcs.wcs_pix2world(pixels * [2, 3] + [20, 10], 0))
+
+def test_read_no_comments():
+    header = sunpy.io.fits.read(AIA_171_IMAGE, comments=False)[0][1]
+    assert header['HISTORY'] == ''
+    assert header['WAVEUNIT'] == 'angstrom'
+    header = get_header(EIT_195_IMAGE, comments=False)[0]
+    assert list(header['KEYCOMMENTS'].keys()) == ['WAVELNTH']
+
 def test_extract_waveunit_missing_waveunit_key_and_missing_wavelnth_comment():
     waveunit = extract_waveunit(get_header(RHESSI_IMAGE)[0])
     assert waveunit is None
@@ -33,3 +33,33 @@ def test_read_file():
     SunPy map"""
     map_ = Map(AIA_193_JP2)
     assert isinstance(map_, GenericMap)
+
+@skip_glymur
+def test_read_rlevel():
+    """Tests reading the JP2 data at a reduced resolution"""
+    from sunpy.io.jp2 import read
+    data, header = read(AIA_193_JP2)[0]
+    small_data, small_header = read(AIA_193_JP2, rlevel=2)[0]
+    assert small_data.shape == (data.shape[0] // 4, data.shape[1] // 4)
+    assert small_header['NAXIS1'] == small_data.shape[1]
+    assert small_header['CDELT1'] == header['CDELT1'] * 4
+    assert small_header['CRPIX1'] == (header['CRPIX1'] - 0.5) / 4 + 0.5
+
+@skip_glymur
+def test_read_area():
+    """Tests reading a region of the JP2 data"""
+    from sunpy.io.jp2 import read
+    data, header = read(AIA_193_JP2)[0]
+    area_data, area_header = read(AIA_193_JP2, area=(10, 20, 74, 148))[0]
+    assert area_data.shape == (64, 128)
+    np.testing.assert_array_equal(area_data, data[10:74, 20:148])
+    assert area_header['CRPIX1'] == header['CRPIX1'] - 20
+    assert area_header['CRPIX2'] == header['CRPIX2'] - 10
+
+@skip_glymur
+def test_map_rlevel():
+    """Tests making a map at a reduced resolution"""
+    map_ = Map(AIA_193_JP2)
+    small_map = Map(AIA_193_JP2, rlevel=1)
+    assert small_map.data.shape == (map_.data.shape[0] // 2, map_.data.shape[1] // 2)
+    assert small_map.scale.x == map_.scale.x * 2
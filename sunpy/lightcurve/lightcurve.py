@@ -9,7 +9,6 @@ __authors__ = ["Keith Hughitt"]
 __email__ = "keith.hughitt@nasa.gov"
 
 import os.path
-import shutil
 import urllib2
 import warnings
 from datetime import datetime
@@ -20,6 +19,7 @@ import matplotlib.pyplot as plt
 import pandas
 
 from sunpy import config
+from sunpy.net.download import fetch
 from sunpy.time import is_time, TimeRange, parse_time
 from sunpy.util.cond_dispatch import ConditionalDispatch, run_cls
 
@@ -279,17 +279,27 @@ for compatibility with map, please use meta instead""", Warning)
         else:
             overwrite = False
 
+        # update an existing file if the remote file has changed, only
+        # downloading the added bytes if the keyword "append" is present
+        update = kwargs.get("update", False)
+
         # If the file is not already there, download it
         filepath = os.path.join(download_dir, _filename)
 
         if not(os.path.isfile(filepath)) or (overwrite and
                                              os.path.isfile(filepath)):
             try:
-                response = urllib2.urlopen(uri)
-            except (urllib2.HTTPError, urllib2.URLError):
+                # a sunpy.net.datastore.DataStore may be given as "store"
+                fetch(uri, filepath, store=kwargs.get("store"),
+                      validators=True)
+            except IOError:
+                raise urllib2.URLError(err)
+        elif update:
+            try:
+                fetch(uri, filepath, update=True,
+                      append=kwargs.get("append", False))
+            except IOError:
                 raise urllib2.URLError(err)
-            with open(filepath, 'wb') as fp:
-                shutil.copyfileobj(response, fp)
         else:
             warnings.warn("Using existing file rather than downloading, use overwrite=True to override.", RuntimeWarning)
 
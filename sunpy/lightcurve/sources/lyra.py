@@ -7,6 +7,8 @@ import urlparse
 import sys
 from collections import OrderedDict
 
+import numpy as np
+
 from matplotlib import pyplot as plt
 from astropy.io import fits
 import pandas
@@ -153,15 +155,15 @@ class LYRALightCurve(LightCurve):
 
         # First column are times.  For level 2 data, the units are [s].
         # For level 3 data, the units are [min]
+        offsets = np.asarray(fits_record.field(0), dtype=np.float64)
         if hdulist[1].header['TUNIT1'] == 's':
-            times = [start + datetime.timedelta(seconds=n)
-                     for n in fits_record.field(0)]
+            offsets = np.round(offsets * 1e6).astype('timedelta64[us]')
         elif hdulist[1].header['TUNIT1'] == 'MIN':
-            times = [start + datetime.timedelta(minutes=int(n))
-                     for n in fits_record.field(0)]
+            offsets = offsets.astype(np.int64).astype('timedelta64[m]')
         else:
             raise ValueError("Time unit in LYRA fits file not recognised.  "
                              "Value = {0}".format(hdulist[1].header['TUNIT1']))
+        times = np.datetime64(start, 'us') + offsets
 
         # Rest of columns are the data
         table = {}
@@ -10,6 +10,8 @@ from sunpy.map.mapbase import GenericMap
 from sunpy.map.header import MapMeta
 from . mapcube import MapCube
 from . compositemap import CompositeMap
+from . mapdescriptor import MapDescriptor
+from . mapstack import MapStack
 
 from sunpy.map.map_factory import Map
 from sunpy.map import sources
@@ -5,6 +5,8 @@ __email__ = "stuart@mumford.me.uk"
 
 import os
 import glob
+from functools import partial
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
 
@@ -13,8 +15,10 @@ from sunpy.map.mapbase import GenericMap, MAP_CLASSES
 from sunpy.map.header import MapMeta
 from sunpy.map.compositemap import CompositeMap
 from sunpy.map.mapcube import MapCube
+from sunpy.map.mapdescriptor import MapDescriptor
+from sunpy.map.mapstack import MapStack
 
-from sunpy.io.file_tools import read_file
+from sunpy.io.file_tools import read_file, read_file_header, _get_reader_name
 from sunpy.io.header import FileHeader
 
 from sunpy.util.net import download_file
@@ -92,11 +96,36 @@ class MapFactory(BasicRegistrationFactory):
     * Any mixture of the above not in a list
 
     >>> mymap = sunpy.map.Map((data, header), data2, header2, 'file1.fits', url_str, 'eit_*.fits')   # doctest: +SKIP
+
+    * FITS files can be opened lazily, the data is then memory-mapped from
+      the file and only read from disk when it is used
+
+    >>> mymap = sunpy.map.Map('file1.fits', lazy=True)   # doctest: +SKIP
+
+    * JPEG2000 files can be read at a reduced resolution
+
+    >>> mymap = sunpy.map.Map('file1.jp2', rlevel=2)   # doctest: +SKIP
+
+    * Map descriptors, which are built from the headers of files only by
+      `~sunpy.map.map_factory.MapFactory.headers`
+
+    >>> descriptors = sunpy.map.Map.headers('eit_*.fits')   # doctest: +SKIP
+    >>> descriptors.sort(key=lambda d: d.date)   # doctest: +SKIP
+    >>> mymap = sunpy.map.Map(descriptors[-1])   # doctest: +SKIP
     """
 
-    def _read_file(self, fname, **kwargs):
+    # Keywords which are passed to the file readers rather than the map classes
+    _reader_keywords = ('filetype', 'hdus', 'section', 'comments', 'rlevel',
+                        'area', 'debug')
+
+    def _read_file(self, fname, lazy=False, **kwargs):
         """ Read in a file name and return the list of (data, meta) pairs in
-            that file. """
+            that file. If lazy is True FITS data is memory-mapped. """
+
+        # Only the FITS reader supports memory-mapping, other file types are
+        # always decoded in full.
+        if lazy and _get_reader_name(fname, kwargs.get('filetype')) == 'fits':
+            kwargs['memmap'] = True
 
         # File gets read here.  This needs to be generic enough to seamlessly
         #call a fits file or a jpeg2k file, etc
@@ -125,6 +154,10 @@ class MapFactory(BasicRegistrationFactory):
         * url, which will be downloaded and read
         * lists containing any of the above.
 
+        Files are read after all the arguments have been parsed, on the
+        thread pool given as the ``pool`` keyword if there is one. The order of
+        the data-header pairs is the order of the arguments.
+
         Example
         -------
         self._parse_args(data, header,
@@ -135,9 +168,13 @@ class MapFactory(BasicRegistrationFactory):
                          '*.fits')
 
         """
+        pool = kwargs.pop('pool', None)
 
-        data_header_pairs = list()
+        # Each entry is either a list of data-header pairs or a function which
+        # reads a file and returns a list of data-header pairs.
+        parsed = list()
         already_maps = list()
+        read_file = partial(self._read_file, **kwargs)
 
         # Account for nested lists of items
         args = expand_list(args)
@@ -153,21 +190,20 @@ class MapFactory(BasicRegistrationFactory):
                  len(arg) == 2 and
                  isinstance(arg[0],np.ndarray) and
                  isinstance(arg[1],dict)):
-                data_header_pairs.append(arg)
+                parsed.append([arg])
 
             # Data-header pair not in a tuple
             elif (isinstance(arg, np.ndarray) and
                   isinstance(args[i+1],dict)):
                 pair = (args[i], args[i+1])
-                data_header_pairs.append(pair)
+                parsed.append([pair])
                 i += 1 # an extra increment to account for the data-header pairing
 
             # File name
             elif (isinstance(arg,six.string_types) and
                   os.path.isfile(os.path.expanduser(arg))):
                 path = os.path.expanduser(arg)
-                pairs = self._read_file(path, **kwargs)
-                data_header_pairs += pairs
+                parsed.append(partial(read_file, path))
 
             # Directory
             elif (isinstance(arg,six.string_types) and
@@ -175,13 +211,13 @@ class MapFactory(BasicRegistrationFactory):
                 path = os.path.expanduser(arg)
                 files = [os.path.join(path, elem) for elem in os.listdir(path)]
                 for afile in files:
-                    data_header_pairs += self._read_file(afile, **kwargs)
+                    parsed.append(partial(read_file, afile))
 
             # Glob
             elif (isinstance(arg,six.string_types) and '*' in arg):
                 files = glob.glob( os.path.expanduser(arg) )
                 for afile in files:
-                    data_header_pairs += self._read_file(afile, **kwargs)
+                    parsed.append(partial(read_file, afile))
 
             # Already a Map
             elif isinstance(arg, GenericMap):
@@ -193,17 +229,33 @@ class MapFactory(BasicRegistrationFactory):
                 default_dir = sunpy.config.get("downloads", "download_dir")
                 url = arg
                 path = download_file(url, default_dir)
-                pairs = self._read_file(path, **kwargs)
-                data_header_pairs += pairs
+                parsed.append(partial(read_file, path))
 
             # A database Entry
             elif isinstance(arg, DatabaseEntry):
-                data_header_pairs += self._read_file(arg.path, **kwargs)
+                parsed.append(partial(read_file, arg.path))
+
+            # A MapDescriptor built from a header
+            elif isinstance(arg, MapDescriptor):
+                parsed.append(partial(_read_descriptor, arg,
+                                      lazy=kwargs.get('lazy', False)))
 
             else:
                 raise ValueError("File not found or invalid input")
 
             i += 1
+
+        # Read all the files
+        readers = [item for item in parsed if callable(item)]
+        if pool is not None:
+            read_pairs = iter(pool.map(_call, readers))
+        else:
+            read_pairs = iter([reader() for reader in readers])
+
+        data_header_pairs = list()
+        for item in parsed:
+            data_header_pairs += next(read_pairs) if callable(item) else item
+
         #TODO:
         # In the end, if there are already maps it should be put in the same
         # order as the input, currently they are not.
@@ -228,35 +280,75 @@ class MapFactory(BasicRegistrationFactory):
         cube : boolean, optional
             Indicates if collection of maps should be returned as a MapCube
 
+        stack : boolean or str, optional
+            If set with ``cube``, the MapCube is stored in a single array
+            (a `~sunpy.map.MapStack`) which is filled one file at a time. If a
+            file name is given the array is memory-mapped to that file. Only
+            files can be read into a stack.
+
+        workers : int, optional
+            The number of threads used to read files and build the maps. The
+            maps are returned in the same order as they would be without
+            workers. Defaults to reading the files one at a time.
+
         silence_errors : boolean, optional
             If set, ignore data-header pairs which cause an exception.
 
+        lazy : boolean, optional
+            If set, the data of FITS files is memory-mapped rather than read
+            into memory. Pixel data is then only read from disk when it is
+            accessed, so properties derived from the header stay cheap.
+
+        rlevel : int, optional
+            The resolution level to read JPEG2000 files at, each level halves
+            the resolution. See `sunpy.io.jp2.read`.
+
+        area : tuple, optional
+            The ``(row0, col0, row1, col1)`` region of JPEG2000 files to read.
+            See `sunpy.io.jp2.read`.
+
+        Other keywords for the file readers (``filetype``, and ``hdus``,
+        ``section`` and ``comments`` for FITS files) are passed to
+        `sunpy.io.read_file`.
+
         """
 
         # Hack to get around Python 2.x not backporting PEP 3102.
         composite = kwargs.pop('composite', False)
         cube = kwargs.pop('cube', False)
         silence_errors = kwargs.pop('silence_errors', False)
+        lazy = kwargs.pop('lazy', False)
+        stack = kwargs.pop('stack', False)
+        workers = kwargs.pop('workers', None)
+        reader_kwargs = dict((key, kwargs.pop(key)) for key in self._reader_keywords
+                             if key in kwargs)
+
+        # Build the stack from the headers so that only one file has to be in
+        # memory at a time.
+        if cube and stack:
+            return self._build_stack(args, stack, workers, lazy,
+                                     silence_errors, reader_kwargs, kwargs)
+
+        pool = ThreadPool(workers) if workers and workers > 1 else None
+        try:
+            data_header_pairs, already_maps = self._parse_args(*args, lazy=lazy,
+                                                               pool=pool,
+                                                               **reader_kwargs)
+
+            # Loop over each registered type and check to see if WidgetType
+            # matches the arguments.  If it does, use that type.
+            make_map = partial(self._make_map, silence_errors=silence_errors,
+                               **kwargs)
+            if pool is not None:
+                new_maps = pool.map(make_map, data_header_pairs)
+            else:
+                new_maps = [make_map(pair) for pair in data_header_pairs]
+        finally:
+            if pool is not None:
+                pool.close()
 
-        data_header_pairs, already_maps = self._parse_args(*args, **kwargs)
-
-        new_maps = list()
-
-        # Loop over each registered type and check to see if WidgetType
-        # matches the arguments.  If it does, use that type.
-        for pair in data_header_pairs:
-            data, header = pair
-            meta = MapMeta(header)
-
-            try:
-                new_map = self._check_registered_widgets(data, meta, **kwargs)
-            except (NoMatchError, MultipleMatchError, ValidationFunctionError):
-                if not silence_errors:
-                    raise
-            except:
-                raise
-
-            new_maps.append(new_map)
+        # Pairs which did not match any map type when errors are silenced
+        new_maps = [new_map for new_map in new_maps if new_map is not None]
 
         new_maps += already_maps
 
@@ -273,13 +365,113 @@ class MapFactory(BasicRegistrationFactory):
 
         return new_maps
 
+    def _make_map(self, pair, silence_errors=False, **kwargs):
+        """ Build a map from a data-header pair, returns None if the pair does
+        not match any map type and errors are silenced. """
+        data, header = pair
+        meta = MapMeta(header)
+
+        try:
+            return self._check_registered_widgets(data, meta, **kwargs)
+        except (NoMatchError, MultipleMatchError, ValidationFunctionError):
+            if not silence_errors:
+                raise
+
+    def _build_stack(self, args, stack, workers, lazy, silence_errors,
+                     reader_kwargs, kwargs):
+        """ Read the files of args into a MapCube of a MapStack. """
+        hdus = reader_kwargs.pop('hdus', None)
+        descriptors = self.headers(*args, silence_errors=silence_errors,
+                                   filetype=reader_kwargs.get('filetype'))
+        if hdus is not None:
+            hdus = [hdus] if isinstance(hdus, int) else list(hdus)
+            descriptors = [d for d in descriptors if d.index in hdus]
+        if kwargs.get('sortby', 'date') == 'date':
+            descriptors.sort(key=lambda d: d.date)
+        filename = stack if isinstance(stack, six.string_types) else None
+        return MapCube(MapStack.from_descriptors(descriptors,
+                                                 filename=filename,
+                                                 workers=workers, lazy=lazy,
+                                                 **reader_kwargs),
+                       **kwargs)
+
+    def headers(self, *args, **kwargs):
+        """
+        Build `~sunpy.map.MapDescriptor` objects from the headers of files,
+        without reading any of the data.
+
+        The descriptors know which map class the file would be read into and
+        provide the properties of the map which are derived from the header
+        (e.g. ``date``, ``instrument``, ``wavelength`` and ``wcs``). They can be
+        promoted to a full map with `~sunpy.map.MapDescriptor.to_map` or by
+        passing them to ``Map``.
+
+        Parameters
+        ----------
+        args
+            Any mixture (or lists) of file names, directories, globs and
+            database entries.
+
+        silence_errors : boolean, optional
+            If set, ignore headers which cause an exception.
+
+        Returns
+        -------
+        descriptors : list
+            A list of `~sunpy.map.MapDescriptor`, one for each image HDU.
+        """
+        silence_errors = kwargs.pop('silence_errors', False)
+
+        files = list()
+        for arg in expand_list(args):
+            if isinstance(arg, DatabaseEntry):
+                files.append(arg.path)
+            elif not isinstance(arg, six.string_types):
+                raise ValueError("File not found or invalid input")
+            elif os.path.isfile(os.path.expanduser(arg)):
+                files.append(os.path.expanduser(arg))
+            elif os.path.isdir(os.path.expanduser(arg)):
+                path = os.path.expanduser(arg)
+                files += [os.path.join(path, elem) for elem in os.listdir(path)]
+            elif '*' in arg:
+                files += glob.glob(os.path.expanduser(arg))
+            else:
+                raise ValueError("File not found or invalid input")
+
+        descriptors = list()
+        for afile in files:
+            for index, header in enumerate(read_file_header(afile, **kwargs)):
+                meta = MapMeta(header)
+                # Only image HDUs can become maps
+                if (meta.get('naxis', 2) < 2 or
+                        meta.get('xtension') in ('TABLE', 'BINTABLE')):
+                    continue
+                try:
+                    placeholder = MapDescriptor._placeholder_data(header)
+                    map_class = self._get_widget_type(placeholder, meta)
+                    descriptors.append(MapDescriptor(map_class, header, afile,
+                                                     index=index))
+                except (NoMatchError, MultipleMatchError,
+                        ValidationFunctionError, ValueError):
+                    if not silence_errors:
+                        raise
+
+        return descriptors
+
     def _check_registered_widgets(self, data, meta, **kwargs):
 
+        WidgetType = self._get_widget_type(data, meta, **kwargs)
+
+        return WidgetType(data, meta, **kwargs)
+
+    def _get_widget_type(self, data, meta, **kwargs):
+        """ Find the registered map class matching a data-header pair. """
+
         candidate_widget_types = list()
 
-        for key in self.registry:
+        for key in self._candidate_widgets(meta):
 
-            # Call the registered validation function for each registered class
+            # Call the registered validation function for each candidate class
             if self.registry[key](data, meta, **kwargs):
                 candidate_widget_types.append(key)
 
@@ -294,10 +486,16 @@ class MapFactory(BasicRegistrationFactory):
             raise MultipleMatchError("Too many candidate types identified ({0}).  Specify enough keywords to guarantee unique type identification.".format(n_matches))
 
         # Only one is found
-        WidgetType = candidate_widget_types[0]
+        return candidate_widget_types[0]
 
-        return WidgetType(data, meta, **kwargs)
 
+def _call(func):
+    """ Call a function with no arguments, used to run readers on a pool. """
+    return func()
+
+def _read_descriptor(descriptor, lazy=False):
+    """ Read the data-header pair described by a MapDescriptor. """
+    return [(descriptor.read_data(lazy=lazy), MapMeta(descriptor.header))]
 
 def _is_url(arg):
     try:
@@ -11,7 +11,7 @@ __email__ = "stuart@mumford.me.uk"
 import warnings
 import inspect
 from abc import ABCMeta
-from copy import deepcopy
+from copy import copy, deepcopy
 from collections import OrderedDict
 
 import numpy as np
@@ -195,6 +195,35 @@ class GenericMap(NDData):
                               'origin': 'lower'
                               }
 
+    # Meta keywords which define the geometry of the map. The cached WCS and
+    # the derived geometry properties are rebuilt when any of these change.
+    _geometry_keywords = ('naxis1', 'naxis2',
+                          'crpix1', 'crpix2', 'crval1', 'crval2',
+                          'cdelt1', 'cdelt2', 'ctype1', 'ctype2',
+                          'cunit1', 'cunit2', 'crota2',
+                          'pc1_1', 'pc1_2', 'pc2_1', 'pc2_2',
+                          'cd1_1', 'cd1_2', 'cd2_1', 'cd2_2')
+
+    def _cached_geometry(self, name, func):
+        """
+        Return the value of ``func()``, cached under ``name`` for as long as
+        the geometry keywords of the meta data are unchanged. The cached value
+        itself is returned, callers must copy mutable values before handing
+        them out.
+        """
+        key = tuple(map(self.meta.get, self._geometry_keywords))
+
+        cache = getattr(self, '_geometry_cache', None)
+        if cache is None or cache[0] != key:
+            # Replace rather than clear the cache, it may be shared with a
+            # copy of this map.
+            cache = (key, {})
+            self._geometry_cache = cache
+
+        if name not in cache[1]:
+            cache[1][name] = func()
+        return cache[1][name]
+
     def __getitem__(self, key):
         """ This should allow indexing by physical coordinate """
         raise NotImplementedError(
@@ -228,7 +257,15 @@ scale:\t\t {scale}
     def wcs(self):
         """
         The `~astropy.wcs.WCS` property of the map.
+
+        The WCS is cached until the geometry keywords of the meta data change
+        and the same object is returned on every access, it should be treated
+        as read-only. Change the meta data of the map instead.
         """
+        return self._cached_geometry('wcs', self._make_wcs)
+
+    def _make_wcs(self):
+        """Build the `~astropy.wcs.WCS` from the meta data."""
         w2 = astropy.wcs.WCS(naxis=2)
         w2.wcs.crpix = u.Quantity(self.reference_pixel)
         # Make these a quantity array to prevent the numpy setting element of
@@ -508,32 +545,42 @@ scale:\t\t {scale}
     def reference_coordinate(self):
         """Reference point WCS axes in data units (i.e. crval1, crval2). This value
         includes a shift if one is set."""
-        return Pair(self.meta.get('crval1', 0.) * self.units.x,
-                    self.meta.get('crval2', 0.) * self.units.y)
+        return self._cached_geometry('reference_coordinate',
+                                     lambda: Pair(self.meta.get('crval1', 0.) * self.units.x,
+                                                  self.meta.get('crval2', 0.) * self.units.y))
 
     @property
     def reference_pixel(self):
         """Reference point axes in pixels (i.e. crpix1, crpix2)"""
-        return Pair(self.meta.get('crpix1', (self.meta.get('naxis1') + 1) / 2.) * u.pixel,
-                    self.meta.get('crpix2', (self.meta.get('naxis2') + 1) / 2.) * u.pixel)
+        return self._cached_geometry('reference_pixel',
+                                     lambda: Pair(self.meta.get('crpix1', (self.meta.get('naxis1') + 1) / 2.) * u.pixel,
+                                                  self.meta.get('crpix2', (self.meta.get('naxis2') + 1) / 2.) * u.pixel))
 
     @property
     def scale(self):
         """Image scale along the x and y axes in units/pixel (i.e. cdelt1, cdelt2)"""
         #TODO: Fix this if only CDi_j matrix is provided
-        return Pair(self.meta.get('cdelt1', 1.) * self.units.x / u.pixel,
-                    self.meta.get('cdelt2', 1.) * self.units.y / u.pixel)
+        return self._cached_geometry('scale',
+                                     lambda: Pair(self.meta.get('cdelt1', 1.) * self.units.x / u.pixel,
+                                                  self.meta.get('cdelt2', 1.) * self.units.y / u.pixel))
 
     @property
     def units(self):
         """Image coordinate units along the x and y axes (i.e. cunit1, cunit2)."""
-        return Pair(u.Unit(self.meta.get('cunit1', 'arcsec')),
-                    u.Unit(self.meta.get('cunit2', 'arcsec')))
+        return self._cached_geometry('units',
+                                     lambda: Pair(u.Unit(self.meta.get('cunit1', 'arcsec')),
+                                                  u.Unit(self.meta.get('cunit2', 'arcsec'))))
 
     @property
     def rotation_matrix(self):
         """Matrix describing the rotation required to align solar North with
         the top of the image."""
+        # The matrix is the only mutable cached value, hand out a copy
+        return self._cached_geometry('rotation_matrix',
+                                     self._make_rotation_matrix).copy()
+
+    def _make_rotation_matrix(self):
+        """Build the rotation matrix from the PCi_j, CDi_j or CROTA meta data."""
         if 'PC1_1' in self.meta:
             return np.matrix([[self.meta['PC1_1'], self.meta['PC1_2']],
                               [self.meta['PC2_1'], self.meta['PC2_2']]])
@@ -711,6 +758,26 @@ scale:\t\t {scale}
 
 # #### Image processing routines #### #
 
+    def _new_map(self, data, meta):
+        """
+        Returns a new map of the same type as this map with the given data
+        and meta.
+
+        Unlike a `~copy.deepcopy` of the map this does not copy the data of
+        this map, only the plot settings and the mask are copied. The mask is
+        dropped if the shape of the data changes. ``meta`` should already be
+        a copy of this map's meta.
+        """
+        new_map = copy(self)
+        new_map.plot_settings = deepcopy(self.plot_settings)
+        new_map.data = data
+        new_map.meta = meta
+        if self.mask is not None and self.mask.shape == np.shape(data):
+            new_map.mask = self.mask.copy()
+        else:
+            new_map.mask = None
+        return new_map
+
     @u.quantity_input(dimensions=u.pixel)
     def resample(self, dimensions, method='linear'):
         """Returns a new Map that has been resampled up or down
@@ -750,17 +817,17 @@ scale:\t\t {scale}
         # Note: "center" defaults to True in this function because data
         #   coordinates in a Map are at pixel centers
 
-        # Make a copy of the original data and perform resample
-        new_data = sunpy_image_resample(self.data.copy().T, dimensions,
+        # Perform the resample, this creates a new array so the original data
+        # does not need to be copied
+        new_data = sunpy_image_resample(self.data.T, dimensions,
                                     method, center=True)
         new_data = new_data.T
 
         scale_factor_x = float(self.dimensions[0] / dimensions[0])
         scale_factor_y = float(self.dimensions[1] / dimensions[1])
 
-        new_map = deepcopy(self)
         # Update image scale and number of pixels
-        new_meta = self.meta.copy()
+        new_meta = deepcopy(self.meta)
 
         # Update metadata
         new_meta['cdelt1'] *= scale_factor_x
@@ -776,9 +843,7 @@ scale:\t\t {scale}
         new_meta['crval2'] = self.center.y.value
 
         # Create new map instance
-        new_map.data = new_data
-        new_map.meta = new_meta
-        return new_map
+        return self._new_map(new_data, new_meta)
 
     def rotate(self, angle=None, rmatrix=None, order=4, scale=1.0,
                recenter=False, missing=0.0, use_scipy=False):
@@ -878,8 +943,8 @@ scale:\t\t {scale}
         rotation_center = u.Quantity([self.reference_coordinate.x,
                                       self.reference_coordinate.y])
 
-        # Copy Map
-        new_map = deepcopy(self)
+        # Copy the meta data only, the rotated data is a new array
+        new_map = self._new_map(self.data, deepcopy(self.meta))
 
         if angle is not None:
             # Calculate the parameters for the affine_transform
@@ -970,9 +1035,12 @@ scale:\t\t {scale}
         new_map.meta.pop('CD2_1', None)
         new_map.meta.pop('CD2_2', None)
 
+        if new_map.mask is not None and new_map.mask.shape != new_map.data.shape:
+            new_map.mask = None
+
         return new_map
 
-    def submap(self, range_a, range_b):
+    def submap(self, range_a, range_b, copy=False):
         """
         Returns a submap of the map with the specified range.
 
@@ -984,6 +1052,11 @@ scale:\t\t {scale}
         range_b : `astropy.units.Quantity`
             The range of the Map to select across either the y axis.
             Can be either in data units (normally arcseconds) or pixel units.
+        copy : bool
+            If True the data (and mask) of the submap are copied, otherwise
+            they are views of the data of this map, so modifying them will
+            modify this map.
+            Default: False
 
         Returns
         -------
@@ -1105,19 +1178,22 @@ scale:\t\t {scale}
         # Get ndarray representation of submap
         xslice = slice(x_pixels[0], x_pixels[1])
         yslice = slice(y_pixels[0], y_pixels[1])
-        new_data = self.data[yslice, xslice].copy()
+        new_data = self.data[yslice, xslice]
+        if copy:
+            new_data = new_data.copy()
 
         # Make a copy of the header with updated centering information
-        new_map = deepcopy(self)
-        new_map.meta['crpix1'] = self.reference_pixel.x.value - x_pixels[0]
-        new_map.meta['crpix2'] = self.reference_pixel.y.value - y_pixels[0]
-        new_map.meta['naxis1'] = new_data.shape[1]
-        new_map.meta['naxis2'] = new_data.shape[0]
+        new_meta = deepcopy(self.meta)
+        new_meta['crpix1'] = self.reference_pixel.x.value - x_pixels[0]
+        new_meta['crpix2'] = self.reference_pixel.y.value - y_pixels[0]
+        new_meta['naxis1'] = new_data.shape[1]
+        new_meta['naxis2'] = new_data.shape[0]
 
         # Create new map instance
-        new_map.data = new_data
+        new_map = self._new_map(new_data, new_meta)
         if self.mask is not None:
-            new_map.mask = self.mask[yslice, xslice].copy()
+            new_mask = self.mask[yslice, xslice]
+            new_map.mask = new_mask.copy() if copy else new_mask
 
         return new_map
 
@@ -1154,8 +1230,9 @@ scale:\t\t {scale}
         # Note: "center" defaults to True in this function because data
         #   coordinates in a Map are at pixel centers
 
-        # Make a copy of the original data and perform reshaping
-        reshaped = reshape_image_to_4d_superpixel(self.data.copy(),
+        # Reshape the original data, the sum below creates a new array so the
+        # original data does not need to be copied
+        reshaped = reshape_image_to_4d_superpixel(self.data,
                                                   [dimensions.value[1], dimensions.value[0]])
         if method == 'sum':
             new_data = reshaped.sum(axis=3).sum(axis=1)
@@ -1164,8 +1241,7 @@ scale:\t\t {scale}
                     np.float32(dimensions[0] * dimensions[1]))
 
         # Update image scale and number of pixels
-        new_map = deepcopy(self)
-        new_meta = new_map.meta
+        new_meta = deepcopy(self.meta)
 
         new_nx = (self.dimensions[0] / dimensions[0]).value
         new_ny = (self.dimensions[1] / dimensions[1]).value
@@ -1184,8 +1260,7 @@ scale:\t\t {scale}
         new_meta['crval2'] = self.center.y.value
 
         # Create new map instance
-        new_map.data = new_data
-        return new_map
+        return self._new_map(new_data, new_meta)
 
 # #### Visualization #### #
 
@@ -8,6 +8,7 @@ import numpy as np
 import matplotlib.animation
 
 from sunpy.map import GenericMap
+from sunpy.map.mapstack import MapStack
 
 from sunpy.visualization.mapcubeanimator import MapCubeAnimator
 from sunpy.visualization import wcsaxes_compat
@@ -25,8 +26,9 @@ class MapCube(object):
 
     Parameters
     ----------
-    args : {List}
-        A list of Map instances
+    args : {List, MapStack}
+        A list of Map instances, or a `~sunpy.map.MapStack` holding the maps
+        in a single (optionally memory-mapped) array.
     sortby : {"date", None}
         Method by which the MapCube should be sorted along the z-axis.
     derotate : {None}
@@ -37,14 +39,20 @@ class MapCube(object):
 
     Attributes
     ----------
-    maps : {List}
-        This attribute holds the list of Map instances obtained from parameter args.
+    maps : {List, MapStack}
+        This attribute holds the list of Map instances obtained from parameter
+        args, or the MapStack.
 
     Examples
     --------
     >>> import sunpy.map
     >>> mapcube = sunpy.map.Map('images/*.fits', cube=True)   # doctest: +SKIP
 
+    A mapcube which is too large to fit in memory can be stored in a
+    memory-mapped file
+
+    >>> mapcube = sunpy.map.Map('images/*.fits', cube=True, stack='cube.dat')   # doctest: +SKIP
+
     Mapcubes can be co-aligned using the routines in sunpy.image.coalignment.
     """
     #pylint: disable=W0613,E1101
@@ -55,12 +63,15 @@ class MapCube(object):
         sortby = kwargs.pop('sortby', 'date')
         derotate = kwargs.pop('derotate', False)
 
-        self.maps = expand_list(args)
+        if len(args) == 1 and isinstance(args[0], MapStack):
+            self.maps = args[0]
+        else:
+            self.maps = expand_list(args)
 
-        for m in self.maps:
-            if not isinstance(m, GenericMap):
-                raise ValueError(
-                           'CompositeMap expects pre-constructed map objects.')
+            for m in self.maps:
+                if not isinstance(m, GenericMap):
+                    raise ValueError(
+                               'CompositeMap expects pre-constructed map objects.')
 
         # Optionally sort data
         if sortby is not None:
@@ -77,10 +88,11 @@ class MapCube(object):
         then a map object is returned.  This allows functions like enumerate to
         work.  Otherwise, a mapcube is returned."""
 
-        if isinstance(self.maps[key], GenericMap):
-            return self.maps[key]
+        item = self.maps[key]
+        if isinstance(item, GenericMap):
+            return item
         else:
-            return MapCube(self.maps[key])
+            return MapCube(item)
 
     def __len__(self):
         """Return the number of maps in a mapcube."""
@@ -172,20 +184,20 @@ class MapCube(object):
         removes = []
 
         # Normal plot
-        def annotate_frame(i):
-            axes.set_title("{s.name}".format(s=self[i]))
+        def annotate_frame(amap):
+            axes.set_title("{s.name}".format(s=amap))
 
             # x-axis label
-            if self[0].coordinate_system.x == 'HG':
-                xlabel = 'Longitude [{lon}'.format(lon=self[i].units.x)
+            if amap.coordinate_system.x == 'HG':
+                xlabel = 'Longitude [{lon}'.format(lon=amap.units.x)
             else:
-                xlabel = 'X-position [{xpos}]'.format(xpos=self[i].units.x)
+                xlabel = 'X-position [{xpos}]'.format(xpos=amap.units.x)
 
             # y-axis label
-            if self[0].coordinate_system.y == 'HG':
-                ylabel = 'Latitude [{lat}]'.format(lat=self[i].units.y)
+            if amap.coordinate_system.y == 'HG':
+                ylabel = 'Latitude [{lat}]'.format(lat=amap.units.y)
             else:
-                ylabel = 'Y-position [{ypos}]'.format(ypos=self[i].units.y)
+                ylabel = 'Y-position [{ypos}]'.format(ypos=amap.units.y)
 
             axes.set_xlabel(xlabel)
             axes.set_ylabel(ylabel)
@@ -204,24 +216,29 @@ class MapCube(object):
             while removes:
                 removes.pop(0).remove()
 
-            im.set_array(ani_data[i].data)
-            im.set_cmap(self.maps[i].plot_settings['cmap'])
+            # The maps of a MapStack are created on access, so only get the
+            # map of this frame once.
+            amap = self.maps[i]
+            frame = amap if ani_data is self.maps else ani_data[i]
 
-            norm = deepcopy(self.maps[i].plot_settings['norm'])
+            im.set_array(frame.data)
+            im.set_cmap(amap.plot_settings['cmap'])
+
+            norm = deepcopy(amap.plot_settings['norm'])
             # The following explicit call is for bugged versions of Astropy's ImageNormalize
-            norm.autoscale_None(ani_data[i].data)
+            norm.autoscale_None(frame.data)
             im.set_norm(norm)
 
             if wcsaxes_compat.is_wcsaxes(axes):
-                im.axes.reset_wcs(self.maps[i].wcs)
+                im.axes.reset_wcs(amap.wcs)
                 wcsaxes_compat.default_wcs_grid(axes)
             else:
-                im.set_extent(np.concatenate((self.maps[i].xrange.value,
-                                              self.maps[i].yrange.value)))
+                im.set_extent(np.concatenate((amap.xrange.value,
+                                              amap.yrange.value)))
 
             if annotate:
-                annotate_frame(i)
-            removes += list(plot_function(fig, axes, self.maps[i]))
+                annotate_frame(amap)
+            removes += list(plot_function(fig, axes, amap))
 
         ani = matplotlib.animation.FuncAnimation(fig, updatefig,
                                                 frames=list(range(0, len(self.maps))),
@@ -315,6 +332,8 @@ class MapCube(object):
         Tests if all the maps have the same number pixels in the x and y
         directions.
         """
+        if isinstance(self.maps, MapStack):
+            return True
         return np.all([m.data.shape == self.maps[0].data.shape for m in self.maps])
 
     def as_array(self):
@@ -322,9 +341,14 @@ class MapCube(object):
         If all the map shapes are the same, their image data is copied
         into a single single ndarray. The ndarray is ordered as (ny, nx, nt).
         Otherwise, a ValueError is thrown.
+
+        If the mapcube is stored in a `~sunpy.map.MapStack` no data is copied,
+        the returned array is a view of the data of the stack.
         """
-        if self.all_maps_same_shape():
-            return np.swapaxes(np.swapaxes(np.asarray([m.data for m in self.maps]), 0, 1).copy(), 1, 2).copy()
+        if isinstance(self.maps, MapStack):
+            return self.maps.data.transpose(1, 2, 0)
+        elif self.all_maps_same_shape():
+            return np.dstack([m.data for m in self.maps])
         else:
             raise ValueError('Not all maps have the same shape.')
 
@@ -332,4 +356,6 @@ class MapCube(object):
         """
         Return all the meta objects as a list.
         """
+        if isinstance(self.maps, MapStack):
+            return list(self.maps.meta)
         return [m.meta for m in self.maps]
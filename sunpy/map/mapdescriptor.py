@@ -0,0 +1,207 @@
+"""A header-only description of a Map"""
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+
+from sunpy.map.header import MapMeta
+from sunpy.io.file_tools import read_file, _get_reader_name
+
+__all__ = ['MapDescriptor']
+
+# numpy types for the FITS BITPIX values
+_BITPIX_DTYPES = {8: np.uint8,
+                  16: np.int16,
+                  32: np.int32,
+                  64: np.int64,
+                  -32: np.float32,
+                  -64: np.float64}
+
+
+class MapDescriptor(object):
+    """
+    MapDescriptor
+
+    A lightweight description of a map which has been built from the header
+    of a file only. The pixel data is not read until the descriptor is
+    promoted to a full map with `~sunpy.map.MapDescriptor.to_map`, or by
+    passing it to `~sunpy.map.Map`.
+
+    Descriptors are normally created with ``sunpy.map.Map.headers``.
+
+    Parameters
+    ----------
+    map_class : type
+        The `~sunpy.map.GenericMap` subclass the file would be read into.
+    header : `~sunpy.io.header.FileHeader`
+        The header as read from the file.
+    filepath : str
+        The file the header was read from.
+    index : int
+        The index of the header (i.e. the HDU) within the file.
+
+    Examples
+    --------
+    >>> import astropy.units as u
+    >>> import sunpy.map
+    >>> descriptors = sunpy.map.Map.headers('local_dir/*.fits')   # doctest: +SKIP
+    >>> aia_171 = [d for d in descriptors if d.wavelength == 171 * u.AA]   # doctest: +SKIP
+    >>> mapcube = sunpy.map.Map(aia_171, cube=True)   # doctest: +SKIP
+    """
+    def __init__(self, map_class, header, filepath, index=0):
+        self.map_class = map_class
+        self.header = header
+        self.filepath = filepath
+        self.index = index
+
+        # A map of the right type built on a placeholder array which does
+        # not use any memory, all the metadata properties are taken from it.
+        self._map = map_class(self._placeholder_data(header), MapMeta(header))
+
+    def __repr__(self):
+        return "<{cls} {name} {fname}[{index}]>".format(cls=self.__class__.__name__,
+                                                        name=self.map_class.__name__,
+                                                        fname=self.filepath,
+                                                        index=self.index)
+
+    @staticmethod
+    def _placeholder_data(header):
+        """Build a read-only, zero memory array with the shape and type
+        described by a header."""
+        meta = MapMeta(header)
+        try:
+            shape = (meta['naxis2'], meta['naxis1'])
+        except KeyError:
+            raise ValueError("The header does not describe the shape of the data.")
+
+        dtype = _BITPIX_DTYPES.get(meta.get('bitpix'), np.float64)
+        # Scaled integer data is returned as floats by the readers
+        if 'bscale' in meta or 'bzero' in meta:
+            dtype = np.float32 if np.dtype(dtype).itemsize <= 2 else np.float64
+
+        # np.broadcast_to needs numpy 1.10, a zero stride view does the same
+        data = np.lib.stride_tricks.as_strided(np.zeros(1, dtype=dtype),
+                                               shape=shape, strides=(0, 0))
+        data.flags.writeable = False
+        return data
+
+    def read(self, lazy=False, **kwargs):
+        """
+        Read the data and the header described by this descriptor from the
+        file.
+
+        Parameters
+        ----------
+        lazy : bool
+            If True the data of FITS files is memory-mapped.
+
+        Other keywords (e.g. ``filetype``, ``section`` or ``rlevel``) are
+        passed to `sunpy.io.read_file`.
+
+        Returns
+        -------
+        pair : tuple
+            The data and the `~sunpy.io.header.FileHeader` as returned by the
+            reader, which reflects e.g. a ``section`` that has been read.
+        """
+        if _get_reader_name(self.filepath, kwargs.get('filetype')) == 'fits':
+            # Only read the HDU of this descriptor
+            return read_file(self.filepath, hdus=self.index,
+                             memmap=True if lazy else None, **kwargs)[0]
+        return read_file(self.filepath, **kwargs)[self.index]
+
+    def read_data(self, lazy=False, **kwargs):
+        """
+        Read the data described by this descriptor from the file.
+
+        Parameters
+        ----------
+        lazy : bool
+            If True the data of FITS files is memory-mapped.
+
+        Other keywords are passed to `sunpy.io.read_file`.
+
+        Returns
+        -------
+        data : `~numpy.ndarray`
+        """
+        return self.read(lazy=lazy, **kwargs)[0]
+
+    def to_map(self, lazy=False):
+        """
+        Read the data and return the full map.
+
+        Parameters
+        ----------
+        lazy : bool
+            If True the data of FITS files is memory-mapped.
+
+        Returns
+        -------
+        out : `~sunpy.map.GenericMap` or subclass
+        """
+        return self.map_class(self.read_data(lazy=lazy), MapMeta(self.header))
+
+    @property
+    def meta(self):
+        """The meta data of the map, as normalised by the map class."""
+        return self._map.meta
+
+    @property
+    def name(self):
+        """Human-readable description of the map"""
+        return self._map.name
+
+    @property
+    def date(self):
+        """Image observation time"""
+        return self._map.date
+
+    @property
+    def observatory(self):
+        """Observatory or Telescope name"""
+        return self._map.observatory
+
+    @property
+    def instrument(self):
+        """Instrument name"""
+        return self._map.instrument
+
+    @property
+    def detector(self):
+        """Detector name"""
+        return self._map.detector
+
+    @property
+    def measurement(self):
+        """Measurement name"""
+        return self._map.measurement
+
+    @property
+    def wavelength(self):
+        """Wavelength of the observation"""
+        return self._map.wavelength
+
+    @property
+    def exposure_time(self):
+        """Exposure time of the image in seconds."""
+        return self._map.exposure_time
+
+    @property
+    def dimensions(self):
+        """The dimensions of the array (x axis first, y axis second)."""
+        return self._map.dimensions
+
+    @property
+    def dtype(self):
+        """The `numpy.dtype` the data will be read as."""
+        return self._map.dtype
+
+    @property
+    def scale(self):
+        """Image scale along the x and y axes in units/pixel"""
+        return self._map.scale
+
+    @property
+    def wcs(self):
+        """The `~astropy.wcs.WCS` of the map."""
+        return self._map.wcs
@@ -0,0 +1,237 @@
+"""A sequence of Maps stored in a single array"""
+from __future__ import absolute_import, division, print_function
+
+from collections import deque
+from copy import deepcopy
+from functools import partial
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+
+from sunpy.map.mapbase import GenericMap
+from sunpy.map.header import MapMeta
+from sunpy.extern.six.moves import range
+
+__all__ = ['MapStack']
+
+
+def _read_descriptor(descriptor, lazy=False, **kwargs):
+    return descriptor.read(lazy=lazy, **kwargs)
+
+
+def _read_ahead(pool, func, items, ahead):
+    """
+    Yield ``func(item)`` for each of the items in order, calling it on the
+    pool for at most ``ahead`` items beyond the one being yielded so that the
+    results which are waiting to be consumed stay bounded.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(pool.apply_async(func, (item,)))
+        if len(pending) > ahead:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+class MapStack(object):
+    """
+    MapStack(data, meta, map_classes=None)
+
+    A sequence of spatially aligned maps which stores the data of all the maps
+    in a single (nt, ny, nx) array along with the meta data of each frame.
+
+    The array can be a `numpy.memmap`, in which case the stack can be larger
+    than the available memory. Each frame is stored contiguously, so reading
+    one map from a memory-mapped stack only reads that frame from disk.
+
+    Maps are only created when they are accessed, their data is a view of the
+    frame in the stack so changes to the data of a map are written to the
+    stack. Each access creates a new map with a copy of the meta data of the
+    frame, changes to the meta data or the ``plot_settings`` of a map are not
+    kept by the stack. Keep a reference to a map to use it more than once. A
+    MapStack can be given to `~sunpy.map.MapCube` in place of a list of maps.
+
+    Parameters
+    ----------
+    data : `~numpy.ndarray`
+        A (nt, ny, nx) array holding the data of all the frames.
+    meta : list
+        The meta data of each frame.
+    map_classes : list, optional
+        The map class of each frame, defaults to `~sunpy.map.GenericMap`.
+
+    Examples
+    --------
+    >>> import sunpy.map
+    >>> from sunpy.map import MapStack, MapCube
+    >>> descriptors = sunpy.map.Map.headers('aia_*.fits')   # doctest: +SKIP
+    >>> stack = MapStack.from_descriptors(descriptors, filename='aia.dat')   # doctest: +SKIP
+    >>> mapcube = MapCube(stack)   # doctest: +SKIP
+    """
+    def __init__(self, data, meta, map_classes=None):
+        if data.ndim != 3:
+            raise ValueError("The data of a MapStack must be three dimensional.")
+        if len(meta) != data.shape[0]:
+            raise ValueError("There must be one meta object for each frame.")
+        if map_classes is None:
+            map_classes = [GenericMap] * len(meta)
+        elif len(map_classes) != len(meta):
+            raise ValueError("There must be one map class for each frame.")
+
+        self.data = data
+        self.meta = [MapMeta(m) if not isinstance(m, MapMeta) else m for m in meta]
+        self.map_classes = list(map_classes)
+
+    @staticmethod
+    def _allocate(shape, dtype, filename=None):
+        """Create the array for a stack, on disk if a filename is given."""
+        if filename is None:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(filename, dtype=dtype, mode='w+', shape=shape)
+
+    @classmethod
+    def from_maps(cls, maps, filename=None):
+        """
+        Create a MapStack by copying the data of some maps.
+
+        Parameters
+        ----------
+        maps : list
+            The maps, they must all have the same shape.
+        filename : str, optional
+            If given the stack is a `numpy.memmap` stored in this file.
+        """
+        maps = list(maps)
+        if not maps:
+            raise ValueError("A MapStack needs at least one map.")
+        shape = maps[0].data.shape
+        if not all([m.data.shape == shape for m in maps]):
+            raise ValueError('Not all maps have the same shape.')
+
+        data = cls._allocate((len(maps),) + shape,
+                             np.result_type(*[m.dtype for m in maps]),
+                             filename=filename)
+        for i, amap in enumerate(maps):
+            data[i] = amap.data
+        if isinstance(data, np.memmap):
+            data.flush()
+
+        return cls(data, [deepcopy(m.meta) for m in maps],
+                   map_classes=[m.__class__ for m in maps])
+
+    @classmethod
+    def from_descriptors(cls, descriptors, filename=None, workers=None,
+                         lazy=False, **kwargs):
+        """
+        Create a MapStack from `~sunpy.map.MapDescriptor` objects, reading
+        the files one at a time.
+
+        Only the files being read and copied are held in memory, at most
+        ``workers`` of them, so combined with a ``filename`` this can build
+        stacks larger than the available memory.
+
+        Parameters
+        ----------
+        descriptors : list
+            The descriptors, as returned by ``sunpy.map.Map.headers``. They
+            must all have the same dimensions.
+        filename : str, optional
+            If given the stack is a `numpy.memmap` stored in this file.
+        workers : int, optional
+            The number of threads reading the files.
+        lazy : bool, optional
+            If True the data of FITS files is memory-mapped while it is copied
+            into the stack.
+
+        Other keywords (e.g. ``section`` or ``rlevel``) are passed to
+        `sunpy.io.read_file` for every file.
+        """
+        descriptors = list(descriptors)
+        if not descriptors:
+            raise ValueError("A MapStack needs at least one map.")
+        dimensions = descriptors[0].dimensions
+        if not all([d.dimensions == dimensions for d in descriptors]):
+            raise ValueError('Not all maps have the same shape.')
+
+        read = partial(_read_descriptor, lazy=lazy, **kwargs)
+        pool = ThreadPool(workers) if workers and workers > 1 else None
+        try:
+            pairs = (_read_ahead(pool, read, descriptors, workers)
+                     if pool is not None else (read(d) for d in descriptors))
+            data = None
+            meta = []
+            for i, (frame, header) in enumerate(pairs):
+                # The readers may return less than the header describes, e.g.
+                # for a section, so the stack is allocated from the first frame
+                if data is None:
+                    data = cls._allocate(
+                        (len(descriptors),) + frame.shape,
+                        np.result_type(*[d.dtype for d in descriptors]),
+                        filename=filename)
+                elif frame.shape != data.shape[1:]:
+                    raise ValueError('Not all maps have the same shape.')
+                data[i] = frame
+                meta.append(MapMeta(header))
+        finally:
+            if pool is not None:
+                pool.close()
+        if isinstance(data, np.memmap):
+            data.flush()
+
+        return cls(data, meta,
+                   map_classes=[d.map_class for d in descriptors])
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __getitem__(self, key):
+        """Return a map for an integer key, or a MapStack (which shares the
+        data of this one) for a slice."""
+        if isinstance(key, slice):
+            return MapStack(self.data[key], self.meta[key],
+                            map_classes=self.map_classes[key])
+
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("MapStack index out of range")
+
+        return self.map_classes[key](self.data[key], self.meta[key].copy())
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def sort(self, key):
+        """
+        Sort the frames of the stack in place.
+
+        Parameters
+        ----------
+        key : function
+            A function which takes a map and returns the value to sort on.
+        """
+        order = sorted(range(len(self)), key=lambda i: key(self[i]))
+        if order == list(range(len(self))):
+            return
+
+        # Follow the cycles of the permutation so that only one frame is held
+        # in memory at a time, which matters for memory-mapped stacks.
+        done = [False] * len(order)
+        for start in range(len(order)):
+            if done[start]:
+                continue
+            frame = self.data[start].copy()
+            j = start
+            while True:
+                done[j] = True
+                k = order[j]
+                if k == start:
+                    self.data[j] = frame
+                    break
+                self.data[j] = self.data[k]
+                j = k
+
+        self.meta = [self.meta[k] for k in order]
+        self.map_classes = [self.map_classes[k] for k in order]
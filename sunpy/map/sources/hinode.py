@@ -77,6 +77,8 @@ class XRTMap(GenericMap):
         fw2 = self.meta.get('EC_FW2_').replace("_", " ")
         return "{0}-{1}".format(fw1, fw2)
 
+    _factory_dispatch = {'instrume': ('XRT',)}
+
     @classmethod
     def is_datasource_for(cls, data, header, **kwargs):
         """Determines if header corresponds to an XRT image"""
@@ -135,6 +137,8 @@ class SOTMap(GenericMap):
 
         self.plot_settings['cmap'] = cm.get_cmap('hinodesot' + color[self.instrument])
 
+    _factory_dispatch = {'instrume': tuple(Instruments)}
+
     @classmethod
     def is_datasource_for(cls, data, header, **kwargs):
         """Determines if header corresponds to an SOT image."""
@@ -40,6 +40,8 @@ class SWAPMap(GenericMap):
         self._nickname = self.detector
         self.plot_settings['cmap'] = cm.get_cmap(name='sdoaia171')
 
+    _factory_dispatch = {'instrume': ('SWAP',)}
+
     @classmethod
     def is_datasource_for(cls, data, header, **kwargs):
         """Determines if header corresponds to an SWAP image"""
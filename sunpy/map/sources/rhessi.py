@@ -62,6 +62,8 @@ class RHESSIMap(GenericMap):
         """
         return self.meta['telescop']
 
+    _factory_dispatch = {'instrume': ('RHESSI',)}
+
     @classmethod
     def is_datasource_for(cls, data, header, **kwargs):
         """Determines if header corresponds to an RHESSI image"""
@@ -20,6 +20,16 @@ from sunpy.cm import cm
 __all__ = ['EITMap', 'LASCOMap', 'MDIMap']
 
 
+class _SymmetricNormalize(colors.Normalize):
+    """Normalize symmetrically around zero. Unset limits are taken from the
+    largest absolute value of the data the first time it is drawn, so that
+    creating a map does not read its data."""
+    def autoscale_None(self, A):
+        if self.vmin is None or self.vmax is None:
+            limit = np.abs(np.ma.masked_invalid(A)).max()
+            self.vmin, self.vmax = -limit, limit
+
+
 def _dsunAtSoho(date, rad_d, rad_1au=None):
     """Determines the distance to the Sun from SOhO following
     d_{\sun,Object} =
@@ -80,6 +90,8 @@ class EITMap(GenericMap):
     def _fix_dsun(self):
         self.meta['dsun_obs'] = _dsunAtSoho(self.date, self.rsun_obs)
 
+    _factory_dispatch = {'instrume': ('EIT',)}
+
     @classmethod
     def is_datasource_for(cls, data, header, **kwargs):
         """Determines if header corresponds to an EIT image"""
@@ -141,6 +153,8 @@ class LASCOMap(GenericMap):
         # TODO: This needs to do more than white-light.  Should give B, pB, etc.
         return "white-light"
 
+    _factory_dispatch = {'instrume': ('LASCO',)}
+
     @classmethod
     def is_datasource_for(cls, data, header, **kwargs):
         """Determines if header corresponds to an LASCO image."""
@@ -182,12 +196,7 @@ class MDIMap(GenericMap):
         self.meta['wavelnth'] = np.nan
         self.meta['waveunit'] = 'nm'
         self._nickname = self.detector + " " + self.measurement
-        vmin = np.nanmin(self.data)
-        vmax = np.nanmax(self.data)
-        if abs(vmin) > abs(vmax):
-            self.plot_settings['norm'] = colors.Normalize(-vmin, vmin)
-        else:
-            self.plot_settings['norm'] = colors.Normalize(-vmax, vmax)
+        self.plot_settings['norm'] = _SymmetricNormalize()
 
 
     @property
@@ -222,6 +231,8 @@ class MDIMap(GenericMap):
         else:
             self.meta['dsun_obs'] = _dsunAtSoho(self.date, radius)
 
+    _factory_dispatch = {'instrume': ('MDI',), 'camera': ('MDI',)}
+
     @classmethod
     def is_datasource_for(cls, data, header, **kwargs):
         """Determines if header corresponds to an MDI image"""
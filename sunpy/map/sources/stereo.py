@@ -56,6 +56,8 @@ class EUVIMap(GenericMap):
         """
         return self.meta.get('rsun', None)
 
+    _factory_dispatch = {'detector': ('EUVI',)}
+
     @classmethod
     def is_datasource_for(cls, data, header, **kwargs):
         """Determines if header corresponds to an EUVI image"""
@@ -6,6 +6,8 @@ This particular test file pertains to MDIMap.
 import os
 import glob
 
+import numpy as np
+
 from sunpy.map.sources.soho import MDIMap
 from sunpy.map import Map
 import sunpy.data.test
@@ -32,3 +34,11 @@ def test_observatory():
 def test_measurement():
     """Tests the measurement property of the MDIMap object."""
     assert mdi.measurement == "continuum"
+
+def test_norm():
+    """Tests that the plot limits are symmetric and computed when drawn."""
+    norm = Map(fitspath).plot_settings['norm']
+    assert norm.vmin is None and norm.vmax is None
+    norm(mdi.data)
+    limit = np.nanmax(np.abs(mdi.data))
+    assert (norm.vmin, norm.vmax) == (-limit, limit)
@@ -58,6 +58,8 @@ class TRACEMap(GenericMap):
         self.plot_settings['cmap'] = cm.get_cmap('trace' + self.measurement)
         self.plot_settings['norm'] = colors.LogNorm()
 
+    _factory_dispatch = {'instrume': ('TRACE',)}
+
     @classmethod
     def is_datasource_for(cls, data, header, **kwargs):
         """Determines if header corresponds to an TRACE image"""
@@ -78,6 +78,8 @@ class SXTMap(GenericMap):
             s = 'white light'
         return s
 
+    _factory_dispatch = {'instrume': ('SXT',)}
+
     @classmethod
     def is_datasource_for(cls, data, header, **kwargs):
         """Determines if header corresponds to an SXT image"""
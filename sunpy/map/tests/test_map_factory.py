@@ -14,6 +14,7 @@ import pytest
 import sunpy
 import sunpy.map
 import sunpy.data.test
+from sunpy.tests.helpers import is_memmapped
 
 try:
     import sqlalchemy
@@ -29,6 +30,7 @@ a_fname = a_list_of_many[0]
 AIA_171_IMAGE = os.path.join(filepath, 'aia_171_level1.fits')
 RHESSI_IMAGE = os.path.join(filepath, 'hsi_image_20101016_191218.fits')
 
+
 #==============================================================================
 # Map Factory Tests
 #==============================================================================
@@ -92,6 +94,57 @@ class TestMap(object):
         amap = sunpy.map.Map("http://data.sunpy.org/sample-data/AIA20110319_105400_0171.fits")
         assert isinstance(amap, sunpy.map.GenericMap)
 
+    def test_lazy(self):
+        # Lazily loaded FITS data is memory-mapped rather than read
+        aia = sunpy.map.Map(AIA_171_IMAGE, lazy=True)
+        assert isinstance(aia, sunpy.map.sources.AIAMap)
+        assert is_memmapped(aia.data)
+        assert aia.date == sunpy.map.Map(AIA_171_IMAGE).date
+        # Lists of files are memory-mapped as well
+        maps = sunpy.map.Map(a_list_of_many, lazy=True)
+        assert all([is_memmapped(amap.data) for amap in maps])
+
+    def test_workers(self):
+        # Reading on a thread pool gives the same maps in the same order
+        maps = sunpy.map.Map(a_list_of_many)
+        pool_maps = sunpy.map.Map(a_list_of_many, workers=4)
+        assert len(pool_maps) == len(maps)
+        for pool_map, amap in zip(pool_maps, maps):
+            assert isinstance(pool_map, sunpy.map.sources.EITMap)
+            assert pool_map.date == amap.date
+            assert np.all(pool_map.data == amap.data)
+
+        cube = sunpy.map.Map(os.path.join(filepath, "EIT"), cube=True, workers=4)
+        assert isinstance(cube, sunpy.map.MapCube)
+        assert len(cube) == len(a_list_of_many)
+
+    def test_headers(self):
+        # Descriptors are built from the headers only
+        descriptors = sunpy.map.Map.headers(os.path.join(filepath, "EIT"))
+        assert len(descriptors) == len(a_list_of_many)
+        assert all([isinstance(d, sunpy.map.MapDescriptor) for d in descriptors])
+        assert all([d.map_class is sunpy.map.sources.EITMap for d in descriptors])
+
+        eitmap = sunpy.map.Map(a_fname)
+        descriptor = sunpy.map.Map.headers(a_fname)[0]
+        assert descriptor.date == eitmap.date
+        assert descriptor.wavelength == eitmap.wavelength
+        assert descriptor.dimensions == eitmap.dimensions
+        assert np.all(descriptor.wcs.wcs.crpix == eitmap.wcs.wcs.crpix)
+
+        # Table HDUs are skipped
+        assert len(sunpy.map.Map.headers(RHESSI_IMAGE)) == 1
+
+    def test_headers_promote(self):
+        descriptor = sunpy.map.Map.headers(a_fname)[0]
+        eitmap = sunpy.map.Map(a_fname)
+        for amap in [descriptor.to_map(), sunpy.map.Map(descriptor)]:
+            assert isinstance(amap, sunpy.map.sources.EITMap)
+            assert np.all(amap.data == eitmap.data)
+        cube = sunpy.map.Map(sunpy.map.Map.headers(a_list_of_many), cube=True)
+        assert isinstance(cube, sunpy.map.MapCube)
+        assert len(cube) == len(a_list_of_many)
+
     def test_save(self):
         #Test save out
         eitmap = sunpy.map.Map(a_fname)
@@ -7,6 +7,7 @@ from __future__ import absolute_import
 import os
 import pytest
 import datetime
+import timeit
 
 import numpy as np
 
@@ -21,6 +22,7 @@ import sunpy.sun
 import sunpy.map
 import sunpy.data.test
 from sunpy.time import parse_time
+from sunpy.map.mapbase import Pair
 from sunpy.tests.helpers import figure_test, skip_wcsaxes
 
 testpath = sunpy.data.test.rootdir
@@ -80,6 +82,38 @@ def test_wcs(aia171_test_map):
     np.testing.assert_allclose(wcs.wcs.pc, aia171_test_map.rotation_matrix)
     assert set(wcs.wcs.cunit) == set([u.Unit(a) for a in aia171_test_map.units])
 
+
+def test_wcs_cache(aia171_test_map):
+    wcs = aia171_test_map.wcs
+    assert aia171_test_map.wcs is wcs
+    assert aia171_test_map.scale is aia171_test_map.scale
+    # The rotation matrix is mutable, modifying it does not change the cache
+    rotation_matrix = aia171_test_map.rotation_matrix
+    rotation_matrix[0, 0] = 42
+    assert aia171_test_map.rotation_matrix[0, 0] != 42
+
+    # Changing a geometry keyword rebuilds the WCS
+    aia171_test_map.meta['crpix1'] += 10
+    assert aia171_test_map.wcs is not wcs
+    assert aia171_test_map.wcs.wcs.crpix[0] == wcs.wcs.crpix[0] + 10
+    assert aia171_test_map.reference_pixel.x.value == wcs.wcs.crpix[0] + 10
+
+    # Copies of the map do not see the changes to the meta of another
+    submap = aia171_test_map.submap([0, 10]*u.pix, [0, 10]*u.pix)
+    assert aia171_test_map.reference_pixel.x.value == wcs.wcs.crpix[0] + 10
+    assert submap.reference_pixel.x.value == wcs.wcs.crpix[0] + 10
+
+
+def test_geometry_cache_speed(aia171_test_map):
+    # A cached access is cheaper than building the value from the meta data
+    aia171_test_map.scale
+    cached = min(timeit.repeat(lambda: aia171_test_map.scale,
+                               number=200, repeat=3))
+    built = min(timeit.repeat(lambda: Pair(aia171_test_map.meta['cdelt1'] * u.arcsec / u.pix,
+                                           aia171_test_map.meta['cdelt2'] * u.arcsec / u.pix),
+                              number=200, repeat=3))
+    assert cached < built
+
 def test_dtype(generic_map):
     assert generic_map.dtype == np.float64
 
@@ -313,6 +347,38 @@ def test_submap(generic_map):
                              width/2:width] == submap.data).all()
 
 
+def test_submap_copy(generic_map):
+    """Check that a submap is a view on the data unless a copy is requested"""
+    width = generic_map.data.shape[1]
+    height = generic_map.data.shape[0]
+
+    submap = generic_map.submap([0, width/2.]*u.pix, [0, height/2.]*u.pix)
+    assert np.may_share_memory(submap.data, generic_map.data)
+    assert submap.meta is not generic_map.meta
+
+    submap = generic_map.submap([0, width/2.]*u.pix, [0, height/2.]*u.pix,
+                                copy=True)
+    assert not np.may_share_memory(submap.data, generic_map.data)
+
+
+def test_new_map_mask(generic_map):
+    """Check that derived maps copy the mask, only submap views share it"""
+    generic_map.mask = np.zeros(generic_map.data.shape, dtype=bool)
+    generic_map.mask[0, 0] = True
+
+    submap = generic_map.submap([0, 3]*u.pix, [0, 3]*u.pix)
+    assert np.may_share_memory(submap.mask, generic_map.mask)
+    submap = generic_map.submap([0, 3]*u.pix, [0, 3]*u.pix, copy=True)
+    assert not np.may_share_memory(submap.mask, generic_map.mask)
+
+    resampled = generic_map.resample((6, 6)*u.pixel)
+    assert np.all(resampled.mask == generic_map.mask)
+    assert not np.may_share_memory(resampled.mask, generic_map.mask)
+    # the mask is dropped when the shape of the data changes
+    assert generic_map.resample((3, 3)*u.pixel).mask is None
+    assert generic_map.superpixel((2, 2)*u.pix).mask is None
+
+
 resample_test_data = [('linear', (100, 200)*u.pixel),
                       ('neighbor', (128, 256)*u.pixel),
                       ('nearest', (512, 128)*u.pixel),
@@ -346,6 +412,16 @@ def test_resample_metadata(generic_map, sample_method, new_dimensions):
             assert resampled_map.meta[key] == generic_map.meta[key]
 
 
+def test_resample_does_not_modify(generic_map):
+    """Check that resample leaves the original map untouched"""
+    original_data = generic_map.data.copy()
+    original_crpix1 = generic_map.meta['crpix1']
+    resampled = generic_map.resample((64, 64)*u.pixel)
+    assert not np.may_share_memory(resampled.data, generic_map.data)
+    assert np.all(generic_map.data == original_data)
+    assert generic_map.meta['crpix1'] == original_crpix1
+
+
 def test_superpixel(aia171_test_map):
     dimensions = (2, 2)*u.pix
     superpixel_map_sum = aia171_test_map.superpixel(dimensions)
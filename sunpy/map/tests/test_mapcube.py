@@ -9,8 +9,12 @@ import astropy.units as u
 import sunpy
 import sunpy.map
 from sunpy.map.header import MapMeta
+from sunpy.map.mapstack import _read_ahead
 import pytest
 import os
+import threading
+import time
+from multiprocessing.pool import ThreadPool
 import sunpy.data.test
 
 @pytest.fixture
@@ -58,3 +62,94 @@ def test_all_meta(mapcube_all_the_same):
     assert len(meta) == 2
     assert np.all(np.asarray([isinstance(h, MapMeta) for h in meta]))
     assert np.all(np.asarray([meta[i] == mapcube_all_the_same[i].meta for i in range(0, len(meta))]))
+
+
+@pytest.fixture
+def mapcube_stack(tmpdir):
+    testpath = sunpy.data.test.rootdir
+    eit_files = os.path.join(testpath, "EIT", "*")
+    return sunpy.map.Map(eit_files, cube=True,
+                         stack=str(tmpdir.join('cube.dat')))
+
+
+def test_stack(mapcube_stack):
+    """A stacked mapcube is stored in a single memory-mapped array and gives
+    the same maps as a normal mapcube"""
+    testpath = sunpy.data.test.rootdir
+    mapcube = sunpy.map.Map(os.path.join(testpath, "EIT", "*"), cube=True)
+    assert isinstance(mapcube_stack.maps, sunpy.map.MapStack)
+    assert isinstance(mapcube_stack.maps.data, np.memmap)
+    assert len(mapcube_stack) == len(mapcube)
+    for stack_map, amap in zip(mapcube_stack, mapcube):
+        assert isinstance(stack_map, sunpy.map.sources.EITMap)
+        assert stack_map.date == amap.date
+        assert np.all(stack_map.data == amap.data)
+    assert isinstance(mapcube_stack[1:3], sunpy.map.MapCube)
+    assert len(mapcube_stack[1:3]) == 2
+
+
+def test_stack_as_array(mapcube_stack):
+    """as_array of a stacked mapcube is a view of the stack"""
+    returned_array = mapcube_stack.as_array()
+    assert returned_array.shape == (mapcube_stack[0].data.shape +
+                                    (len(mapcube_stack),))
+    assert np.may_share_memory(returned_array, mapcube_stack.maps.data)
+    assert np.all(returned_array[..., 1] == mapcube_stack[1].data)
+    assert mapcube_stack.all_maps_same_shape()
+
+
+def test_stack_meta_copy(mapcube_stack):
+    """The maps of a stack share its data but not its meta data"""
+    amap = mapcube_stack[0]
+    amap.meta['telescop'] = 'test'
+    amap.data[0, 0] = 42
+    assert mapcube_stack[0].meta['telescop'] != 'test'
+    assert mapcube_stack[0].data[0, 0] == 42
+
+
+def test_stack_read_ahead():
+    """At most ``workers`` frames are read ahead of the one being copied"""
+    started = []
+    lock = threading.Lock()
+
+    def read(i):
+        with lock:
+            started.append(i)
+        return i
+
+    pool = ThreadPool(2)
+    try:
+        for i in _read_ahead(pool, read, range(20), 2):
+            # give the threads time to read ahead
+            time.sleep(0.01)
+            with lock:
+                assert len(started) <= i + 1 + 2
+    finally:
+        pool.close()
+    assert len(started) == 20
+
+
+def test_stack_keywords(mapcube_stack):
+    """The workers and reader keywords apply to stacks as well"""
+    testpath = sunpy.data.test.rootdir
+    section = (slice(10, 50), slice(20, 100))
+    stack = sunpy.map.Map(os.path.join(testpath, "EIT", "*"), cube=True,
+                          stack=True, workers=2, lazy=True, section=section)
+    assert isinstance(stack, sunpy.map.MapCube)
+    assert len(stack) == len(mapcube_stack)
+    for stack_map, amap in zip(stack, mapcube_stack):
+        assert stack_map.data.shape == (40, 80)
+        assert stack_map.date == amap.date
+        assert np.all(stack_map.data == amap.data[section])
+        assert stack_map.meta['naxis1'] == 80
+
+
+def test_stack_sort(mapcube_all_the_same):
+    """Sorting a stack reorders the data along with the meta data"""
+    maps = [mapcube_all_the_same[0], mapcube_all_the_same[0].shift(1*u.arcsec, 0*u.arcsec)]
+    maps[1].meta['date-obs'] = '2000-01-01T00:00:00'
+    stack = sunpy.map.MapStack.from_maps(maps)
+    stack.data[1] += 1
+    cube = sunpy.map.MapCube(stack)
+    assert cube[0].meta['date-obs'] == '2000-01-01T00:00:00'
+    assert np.all(cube[0].data == maps[0].data + 1)
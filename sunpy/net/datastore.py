@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+A local store of downloaded files which is shared by all clients.
+
+A `DataStore` keeps one copy of every downloaded file under its checksum
+and indexes it by a key, the URL of the file or e.g. the provider and file
+ID of a VSO record. Pass it as ``store`` to `sunpy.net.download.fetch`,
+`sunpy.net.download.Downloader` or `sunpy.util.net.download_file` and a
+file which is requested again is copied from the store instead of being
+downloaded::
+
+    >>> from sunpy.net import vso
+    >>> from sunpy.net.download import Downloader
+    >>> from sunpy.net.datastore import DataStore
+    >>> store = DataStore(maxbytes=50 * 1024 ** 3)   # doctest: +SKIP
+    >>> client = vso.VSOClient()   # doctest: +SKIP
+    >>> res = client.get(qr, downloader=Downloader(store=store))   # doctest: +SKIP
+
+The store can be used by several processes at once. Files are only added
+once they are complete and are copied to their destination
+through a temporary name, so a file is never seen half-written. A file in
+the store whose size has changed, e.g. because it has been truncated, is
+dropped and downloaded again. The stored files are never shared with the
+files handed out, so editing a downloaded file does not change the store.
+"""
+from __future__ import absolute_import
+
+import os
+import time
+import shutil
+import sqlite3
+import hashlib
+import tempfile
+import threading
+
+from functools import partial
+
+import sunpy
+from sunpy.extern import six
+
+__all__ = ['DataStore']
+
+
+class _StoredResponse(object):
+    """Stands in for the response given to the ``path`` functions of
+    `sunpy.net.download.fetch` when a file comes from the store, with the
+    Content-Disposition header of the original download."""
+    status = 200
+
+    def __init__(self, disposition, url):
+        self.headers = {}
+        if disposition is not None:
+            self.headers['Content-Disposition'] = disposition
+        self.url = url
+
+
+def _place(source, destination):
+    """Copy source to destination through a temporary file in the
+    destination directory. The modification time is copied as well, it is
+    used for later conditional downloads of the file."""
+    dirname = os.path.dirname(os.path.abspath(destination))
+    if not os.path.isdir(dirname):
+        os.makedirs(dirname)
+    fd, tmp = tempfile.mkstemp(dir=dirname, suffix='.part')
+    os.close(fd)
+    os.remove(tmp)
+    try:
+        shutil.copyfile(source, tmp)
+        shutil.copystat(source, tmp)
+        if os.path.exists(destination):
+            os.remove(destination)
+        os.rename(tmp, destination)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class DataStore(object):
+    """
+    A content-addressed store of downloaded files.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the store. Defaults to ``datastore`` in the SunPy
+        working directory.
+    maxbytes : int or None
+        Upper limit of the size of the stored files. When it is exceeded,
+        the least recently used files are removed from the store.
+    algorithm : str
+        The `hashlib` algorithm of the checksums.
+    verify : bool
+        Compare the checksum of a stored file every time it is used, not only
+        its size.
+    """
+    def __init__(self, path=None, maxbytes=None, algorithm='sha256',
+                 verify=False, chunk_size=65536):
+        if path is None:
+            path = os.path.join(
+                sunpy.config.get('general', 'working_dir'), 'datastore')
+        self.path = path
+        self.maxbytes = maxbytes
+        self.algorithm = algorithm
+        self.verify = verify
+        self.chunk_size = chunk_size
+        self._objects = os.path.join(path, 'objects')
+        if not os.path.isdir(self._objects):
+            os.makedirs(self._objects)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(os.path.join(path, 'index.sqlite'),
+                                     timeout=60, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS files ('
+                'key TEXT PRIMARY KEY, digest TEXT, disposition TEXT)')
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS ix_files_digest ON files (digest)')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS blobs ('
+                'digest TEXT PRIMARY KEY, size INTEGER, accessed REAL)')
+
+    def _blob(self, digest):
+        return os.path.join(self._objects, digest[:2], digest)
+
+    def checksum(self, filename):
+        """The checksum of a file."""
+        digest = hashlib.new(self.algorithm)
+        with open(filename, 'rb') as fd:
+            for chunk in iter(partial(fd.read, self.chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the name of the stored file of ``key`` or None if there is
+        none or it is damaged."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT files.digest, blobs.size FROM files JOIN blobs '
+                'ON files.digest = blobs.digest WHERE files.key = ?',
+                (key, )).fetchone()
+            if row is None:
+                return None
+            digest, size = row
+            blob = self._blob(digest)
+            try:
+                valid = os.path.getsize(blob) == size and (
+                    not self.verify or self.checksum(blob) == digest)
+            except OSError:
+                valid = False
+            if not valid:
+                self._drop(digest)
+                return None
+            with self._conn:
+                self._conn.execute(
+                    'UPDATE blobs SET accessed = ? WHERE digest = ?',
+                    (time.time(), digest))
+            return blob
+
+    def retrieve(self, key, path, url=None):
+        """Place the stored file of ``key`` at ``path`` and return its name,
+        or return None if the file is not in the store. ``path`` is a file
+        name or a function like those of `sunpy.net.download.fetch`."""
+        with self._lock:
+            blob = self.get(key)
+            if blob is None:
+                return None
+            row = self._conn.execute(
+                'SELECT disposition FROM files WHERE key = ?',
+                (key, )).fetchone()
+        if row is None:
+            # another process removed the key since get
+            return None
+        if isinstance(path, six.string_types):
+            filename = path
+        else:
+            filename = path(_StoredResponse(row[0], url), url)
+        try:
+            _place(blob, filename)
+        except (IOError, OSError):
+            if os.path.exists(blob):
+                raise
+            # the file has been evicted since get, download it instead
+            return None
+        return filename
+
+    def add(self, key, filename, disposition=None):
+        """Add a complete file to the store under ``key`` and return the name
+        of the stored file. ``disposition`` is the Content-Disposition
+        header the file was downloaded with."""
+        digest = self.checksum(filename)
+        size = os.path.getsize(filename)
+        blob = self._blob(digest)
+        with self._lock:
+            if not (os.path.exists(blob) and os.path.getsize(blob) == size):
+                _place(filename, blob)
+            with self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO blobs VALUES (?, ?, ?)',
+                    (digest, size, time.time()))
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO files VALUES (?, ?, ?)',
+                    (key, digest, disposition))
+            self._evict(keep=digest)
+        return blob
+
+    def _drop(self, digest):
+        """Remove a stored file and the keys which refer to it."""
+        with self._conn:
+            self._conn.execute('DELETE FROM files WHERE digest = ?', (digest, ))
+            self._conn.execute('DELETE FROM blobs WHERE digest = ?', (digest, ))
+        try:
+            os.remove(self._blob(digest))
+        except OSError:
+            pass
+
+    def _evict(self, keep=None):
+        if self.maxbytes is None:
+            return
+        total = self.currbytes
+        if total <= self.maxbytes:
+            return
+        rows = self._conn.execute(
+            'SELECT digest, size FROM blobs ORDER BY accessed').fetchall()
+        for digest, size in rows:
+            if total <= self.maxbytes:
+                break
+            if digest != keep:
+                self._drop(digest)
+                total -= size
+
+    def remove(self, key):
+        """Remove the key from the store, and its file if no other key
+        refers to it."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT digest FROM files WHERE key = ?', (key, )).fetchone()
+            if row is None:
+                raise KeyError(key)
+            with self._conn:
+                self._conn.execute('DELETE FROM files WHERE key = ?', (key, ))
+            others = self._conn.execute(
+                'SELECT 1 FROM files WHERE digest = ?', row).fetchone()
+            if others is None:
+                self._drop(row[0])
+
+    def clear(self):
+        """Remove all files from the store."""
+        with self._lock:
+            for digest, in self._conn.execute(
+                    'SELECT digest FROM blobs').fetchall():
+                self._drop(digest)
+
+    @property
+    def currbytes(self):
+        """The size of all stored files."""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -3,83 +3,523 @@
 #
 # This module was developed with funding provided by
 # the ESA Summer of Code (2011).
-
-
+"""
+Download files over HTTP with pooled keep-alive connections.
+
+`fetch` downloads one file in the calling thread, `Downloader` downloads
+many files on a bounded number of threads. Both retry failed transfers with
+an exponential backoff, continue partial transfers with HTTP Range requests
+and can verify the size and checksum of the downloaded files. Other URL
+schemes, e.g. ftp, are downloaded with ``urlopen`` without these features.
+"""
 from __future__ import absolute_import
 
 import os
 import re
-import urllib2
+import socket
+import shutil
+import hashlib
 import threading
+import time
 
 from functools import partial
 from contextlib import closing
-from collections import defaultdict, deque
+from email.utils import formatdate, parsedate_tz, mktime_tz
+from collections import defaultdict, OrderedDict
 
 import sunpy
+from sunpy.extern import six
+from sunpy.extern.six.moves import http_client, range
+from sunpy.extern.six.moves.urllib.parse import urlsplit, urlunsplit, urljoin
+from sunpy.extern.six.moves.urllib.request import (urlopen, getproxies,
+                                                   proxy_bypass)
+
+__all__ = ['DownloadError', 'ConnectionPool', 'fetch', 'Downloader',
+           'default_name']
+
+# HTTP status codes after which a download is attempted again
+_RETRY_STATUS = (408, 429, 500, 502, 503, 504)
+_REDIRECT_STATUS = (301, 302, 303, 307, 308)
+_MAX_REDIRECTS = 5
+
 
 def default_name(path, sock, url):
     name = sock.headers.get('Content-Disposition', url.rsplit('/', 1)[-1])
     return os.path.join(path, name)
 
 
+class DownloadError(IOError):
+    """This exception is raised if a file cannot be downloaded, the
+    ``retry`` attribute tells whether attempting the download again may
+    succeed."""
+    def __init__(self, url, reason, retry=False):
+        IOError.__init__(self, reason)
+        self.url = url
+        self.reason = reason
+        self.retry = retry
+
+    def __str__(self):  # pragma: no cover
+        return 'cannot download {0}: {1}'.format(self.url, self.reason)
+
+
+class ConnectionPool(object):
+    """
+    A thread-safe pool of idle HTTP connections for each host, so that
+    several downloads from the same host use the same keep-alive
+    connections. The proxies of the ``http_proxy`` and ``https_proxy``
+    environment variables are used like by ``urlopen``.
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum number of idle connections kept for each host.
+    timeout : float
+        The timeout of the connections in seconds.
+    """
+    def __init__(self, maxsize=5, timeout=60):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._idle = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def get(self, scheme, netloc):
+        """Return an idle connection to the host or a new one, and whether the
+        connection has been used before."""
+        with self._lock:
+            idle = self._idle[(scheme, netloc)]
+            if idle:
+                return idle.pop(), True
+        return self.connect(scheme, netloc), False
+
+    @staticmethod
+    def proxy(scheme, netloc):
+        """Return the host of the proxy for the host, or None if it is
+        accessed directly."""
+        proxy = getproxies().get(scheme)
+        if not proxy or proxy_bypass(netloc.rsplit(':', 1)[0]):
+            return None
+        if '://' not in proxy:
+            proxy = '//' + proxy
+        return urlsplit(proxy).netloc.rpartition('@')[2] or None
+
+    def connect(self, scheme, netloc):
+        """Open a new connection to the host, through a proxy if one is
+        configured. HTTPS is tunnelled through the proxy."""
+        proxy = self.proxy(scheme, netloc)
+        if scheme == 'https':
+            conn = http_client.HTTPSConnection(proxy or netloc,
+                                               timeout=self.timeout)
+            if proxy is not None:
+                conn.set_tunnel(netloc)
+            return conn
+        return http_client.HTTPConnection(proxy or netloc,
+                                          timeout=self.timeout)
+
+    def put(self, scheme, netloc, conn):
+        """Give back a connection whose last response has been read
+        completely."""
+        with self._lock:
+            idle = self._idle[(scheme, netloc)]
+            if len(idle) < self.maxsize:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def clear(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, defaultdict(list)
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+_default_pool = ConnectionPool()
+
+
+class _ResumePartial(Exception):
+    """Raised to request the rest of a partial download found on disk."""
+
+
+class _Response(object):
+    """The response given to the ``path`` functions, which use the
+    ``headers`` like those of a ``urlopen`` response."""
+    def __init__(self, response, url):
+        self.response = response
+        self.headers = response.msg
+        self.url = url
+        self.status = response.status
+
+
+def _request(pool, url, headers):
+    """Send a GET request on a pooled connection and follow redirects,
+    return the connection, the response, the host and the final URL."""
+    for _ in range(_MAX_REDIRECTS + 1):
+        scheme, netloc, path, query, _fragment = urlsplit(url)
+        target = urlunsplit(('', '', path or '/', query, ''))
+        if scheme == 'http' and pool.proxy(scheme, netloc) is not None:
+            # plain HTTP proxies expect the absolute URI
+            target = urlunsplit((scheme, netloc, path or '/', query, ''))
+        conn, reused = pool.get(scheme, netloc)
+        try:
+            conn.request('GET', target, headers=headers)
+            response = conn.getresponse()
+        except (socket.error, http_client.HTTPException):
+            conn.close()
+            if not reused:
+                raise
+            # the server closed the idle connection, try a new one
+            conn = pool.connect(scheme, netloc)
+            try:
+                conn.request('GET', target, headers=headers)
+                response = conn.getresponse()
+            except BaseException:
+                conn.close()
+                raise
+        if response.status not in _REDIRECT_STATUS:
+            return conn, response, (scheme, netloc), url
+        location = response.getheader('Location')
+        response.read()
+        _release(pool, (scheme, netloc), conn, response)
+        if location is None:
+            raise DownloadError(url, 'redirect without a location')
+        url = urljoin(url, location)
+    raise DownloadError(url, 'too many redirects')
+
+
+def _release(pool, host, conn, response):
+    """Give back the connection of a response which has been read."""
+    if response.will_close:
+        conn.close()
+    else:
+        pool.put(host[0], host[1], conn)
+
+
+def _file_hash(filename, algorithm, chunk_size):
+    digest = hashlib.new(algorithm)
+    with open(filename, 'rb') as fd:
+        for chunk in iter(partial(fd.read, chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _remove(filename):
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
+
+
+class _Transfer(object):
+    """The state of one download which is kept across its attempts."""
+    def __init__(self, url, path, pool, chunk_size, checksum, size):
+        self.url = url
+        self.path = path
+        self.pool = pool
+        self.chunk_size = chunk_size
+        self.checksum = checksum
+        self.size = size
+        self.fullname = None
+        self.validator = None
+        self.disposition = None
+        # headers of a conditional request for a file which exists already
+        self.conditional = {}
+        self.modified = True
+        self.last_modified = None
+        self.etag = None
+
+    @property
+    def part(self):
+        return self.fullname + '.part'
+
+    def attempt(self):
+        """Download the file or the rest of it, return its name."""
+        if urlsplit(self.url).scheme not in ('http', 'https'):
+            return self._attempt_urlopen()
+        headers = {'Accept-Encoding': 'identity'}
+        offset = 0
+        if self.fullname is not None and os.path.exists(self.part):
+            offset = os.path.getsize(self.part)
+        if offset:
+            headers['Range'] = 'bytes={0}-'.format(offset)
+            if self.validator is not None:
+                headers['If-Range'] = self.validator
+        headers.update(self.conditional)
+        conn, response, host, url = _request(self.pool, self.url, headers)
+        try:
+            fullname = self._handle(response, url, offset)
+        except BaseException:
+            conn.close()
+            raise
+        _release(self.pool, host, conn, response)
+        return fullname
+
+    def _handle(self, response, url, offset):
+        status = response.status
+        if status == 304 and self.conditional:
+            # the existing file has not changed
+            response.read()
+            _remove(self.part)
+            self.modified = False
+            return self.fullname
+        if status == 416 and offset:
+            response.read()
+            match = re.match(r'bytes \*/(\d+)',
+                             response.getheader('Content-Range', ''))
+            if match is not None and int(match.group(1)) < offset:
+                # the remote file is shorter than the local one, so it has
+                # been replaced and is downloaded again completely
+                _remove(self.part)
+                self.conditional = {}
+                raise DownloadError(url, 'the remote file has been replaced',
+                                    retry=True)
+            # the part is complete already
+            return self._finish(None)
+        if status >= 400:
+            raise DownloadError(
+                url, 'HTTP status {0} {1}'.format(status, response.reason),
+                retry=status in _RETRY_STATUS)
+        self.etag = response.getheader('ETag')
+        self.last_modified = response.getheader('Last-Modified')
+        self.validator = self.etag or self.last_modified
+        if self.fullname is None:
+            self.disposition = response.getheader('Content-Disposition')
+            self.fullname = self.path(_Response(response, url), self.url)
+            if (os.path.exists(self.part) and os.path.getsize(self.part) and
+                    response.getheader('Accept-Ranges') == 'bytes'):
+                # continue a download which was interrupted before
+                raise _ResumePartial()
+
+        expected = response.getheader('Content-Length')
+        expected = int(expected) if expected is not None else None
+        mode = 'wb'
+        if status == 206:
+            match = re.match(r'bytes (\d+)-\d+/(\d+|\*)',
+                             response.getheader('Content-Range', ''))
+            if match is None or int(match.group(1)) != offset:
+                raise DownloadError(url, 'unexpected Content-Range', retry=True)
+            mode = 'ab'
+            if expected is not None:
+                expected += offset
+        with open(self.part, mode) as fd:
+            for chunk in iter(partial(response.read, self.chunk_size), b''):
+                fd.write(chunk)
+        return self._finish(expected)
+
+    def _attempt_urlopen(self):
+        with closing(urlopen(self.url)) as sock:
+            if self.fullname is None:
+                self.disposition = sock.headers.get('Content-Disposition')
+                self.fullname = self.path(sock, self.url)
+            with open(self.part, 'wb') as fd:
+                for chunk in iter(partial(sock.read, self.chunk_size), b''):
+                    fd.write(chunk)
+        return self._finish(None)
+
+    def _finish(self, expected):
+        """Verify the downloaded part and move it to the final name."""
+        actual = os.path.getsize(self.part)
+        for size in (expected, self.size):
+            if size is not None and actual != size:
+                if actual > size:
+                    _remove(self.part)
+                raise DownloadError(
+                    self.url, 'received {0} of {1} bytes'.format(actual, size),
+                    retry=True)
+        if self.checksum is not None:
+            algorithm, hexdigest = self.checksum
+            if _file_hash(self.part, algorithm,
+                          self.chunk_size) != hexdigest.lower():
+                _remove(self.part)
+                raise DownloadError(
+                    self.url, '{0} checksum mismatch'.format(algorithm),
+                    retry=True)
+        if os.path.exists(self.fullname):
+            os.remove(self.fullname)
+        os.rename(self.part, self.fullname)
+        return self.fullname
+
+    def prepare_update(self, filename, append):
+        """Make the request conditional on the remote file having changed
+        since ``filename`` has been downloaded. If ``append``, only the bytes
+        after the end of the existing file are requested."""
+        self.fullname = filename
+        etag = _read_etag(filename)
+        if etag is not None:
+            self.conditional['If-None-Match'] = etag
+        self.conditional['If-Modified-Since'] = formatdate(
+            os.path.getmtime(filename), usegmt=True)
+        if append:
+            shutil.copyfile(filename, self.part)
+
+    def save_validators(self):
+        """Remember the validators of the downloaded file for the next
+        conditional request."""
+        if self.last_modified is not None:
+            parsed = parsedate_tz(self.last_modified)
+            if parsed is not None:
+                mtime = mktime_tz(parsed)
+                os.utime(self.fullname, (mtime, mtime))
+        etag_file = _etag_file(self.fullname)
+        if self.etag is not None:
+            with open(etag_file, 'w') as fd:
+                fd.write(self.etag)
+        else:
+            _remove(etag_file)
+
+
+def _etag_file(filename):
+    return filename + '.etag'
+
+
+def _read_etag(filename):
+    try:
+        with open(_etag_file(filename)) as fd:
+            return fd.read().strip() or None
+    except IOError:
+        return None
+
+
+def fetch(url, path, pool=None, chunk_size=65536, retries=3, backoff=1.,
+          checksum=None, size=None, store=None, key=None, update=False,
+          append=False, validators=False):
+    """
+    Download a file and return its name.
+
+    The file is written to ``<name>.part`` and renamed when it is complete.
+    If the transfer fails, it is attempted again after ``backoff``,
+    ``2 * backoff``, ``4 * backoff``... seconds and continued where it
+    stopped if the server supports Range requests. A ``.part`` file left
+    behind by an earlier call is continued as well.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the file.
+    path : str or function
+        The name of the file, or a function with the signature
+        ``(response, url)`` which returns it. The headers of the response
+        are available as ``response.headers``.
+    pool : `ConnectionPool`, optional
+        The connections to use, by default a pool shared by all downloads.
+    chunk_size : int, optional
+        The number of bytes which are read and written at once.
+    retries : int, optional
+        The number of times a failed transfer is attempted again.
+    backoff : float, optional
+        The number of seconds to wait before the first retry.
+    checksum : tuple, optional
+        An ``(algorithm, hexdigest)`` pair, e.g. ``('md5', '1a79...')``, the
+        download fails if the file does not have this digest.
+    size : int, optional
+        The expected size of the file in bytes.
+    store : `sunpy.net.datastore.DataStore`, optional
+        A store the file is taken from if it has been downloaded before, and
+        added to otherwise.
+    key : str, optional
+        The key of the file in the store, defaults to the URL.
+    update : bool, optional
+        If the file ``path`` exists, only download it again if the remote
+        file has changed, using the ETag and modification time of the
+        earlier download for a conditional request.
+    append : bool, optional
+        With ``update``, assume that the remote file only grows, e.g. a
+        daily file of near real time data, and only download the bytes
+        which have been added to it.
+    validators : bool, optional
+        Save the ETag and the modification time of the downloaded file for a
+        later ``update``, as every ``update`` does.
+
+    Raises
+    ------
+    DownloadError
+        If the file cannot be downloaded.
+    """
+    if store is not None:
+        if key is None:
+            key = url
+        # an update asks the server whether the stored file is still current
+        fullname = None if update else store.retrieve(key, path, url)
+        if fullname is not None:
+            return fullname
+    if pool is None:
+        pool = _default_pool
+    existing = None
+    if isinstance(path, six.string_types):
+        if update and os.path.isfile(path):
+            existing = path
+        path = partial(lambda filename, sock, url: filename, path)
+    elif update:
+        raise ValueError('update requires the file name as path')
+    transfer = _Transfer(url, path, pool, chunk_size, checksum, size)
+    if existing is not None:
+        transfer.prepare_update(existing, append)
+    attempt = 0
+    while True:
+        try:
+            fullname = transfer.attempt()
+            if (update or validators) and transfer.modified:
+                transfer.save_validators()
+            if store is not None:
+                store.add(key, fullname, transfer.disposition)
+            return fullname
+        except _ResumePartial:
+            continue
+        except DownloadError as err:
+            if not err.retry:
+                raise
+            error = err
+        except (socket.error, http_client.HTTPException) as err:
+            error = DownloadError(url, err, retry=True)
+        if attempt >= retries:
+            raise error
+        time.sleep(backoff * 2 ** attempt)
+        attempt += 1
+
+
 class Downloader(object):
-    def __init__(self, max_conn=5, max_total=20):
+    """
+    Downloader(max_conn=5, max_total=20, chunk_size=65536, retries=3, backoff=1., pool=None, store=None)
+
+    Download files in the background on at most ``max_total`` threads with
+    at most ``max_conn`` connections to the same host. The files are
+    downloaded with `fetch` in the order in which they have been requested.
+
+    Parameters
+    ----------
+    max_conn : int
+        The maximum number of simultaneous downloads from one host.
+    max_total : int
+        The maximum number of simultaneous downloads.
+    chunk_size, retries, backoff, pool, store
+        See `fetch`.
+
+    Attributes
+    ----------
+    errors : list
+        ``(url, exception)`` pairs of the downloads which failed.
+    """
+    def __init__(self, max_conn=5, max_total=20, chunk_size=65536, retries=3,
+                 backoff=1., pool=None, store=None):
         self.max_conn = max_conn
         self.max_total = max_total
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.backoff = backoff
+        self.pool = pool if pool is not None else _default_pool
+        self.store = store
         self.conns = 0
+        self.workers = 0
+        self.errors = []
 
         self.connections = defaultdict(int)  # int() -> 0
-        self.q = defaultdict(deque)
-
-        self.buf = 9096
+        # the queued downloads of each host, in the order of the hosts
+        # which are served next
+        self.q = OrderedDict()
 
         self.done_lock = threading.Semaphore(0)
         self.mutex = threading.Lock()
 
-    def _start_download(self, url, path, callback, errback):
-        try:
-            server = self._get_server(url)
-
-            with self.mutex:
-                self.connections[server] += 1
-                self.conns += 1
-
-            with closing(urllib2.urlopen(url)) as sock:
-                fullname = path(sock, url)
-
-                with open(fullname, 'wb') as fd:
-                    while True:
-                        rec = sock.read(self.buf)
-                        if not rec:
-                            with self.mutex:
-                                self._close(callback, [{'path': fullname}], server)
-                            break
-                        else:
-                            fd.write(rec)
-        except Exception, e:
-            # TODO: Fix the silent failing
-            if errback is not None:
-                with self.mutex:
-                    self._close(errback, [e], server)
-
-    def _attempt_download(self, url, path, callback, errback):
-        """ Attempt download. If max. connection limit reached, queue for download later.
-        """
-
-        num_connections = self.connections[self._get_server(url)]
-
-        # If max downloads has not been exceeded, begin downloading
-        if num_connections < self.max_conn and self.conns < self.max_total:
-            th = threading.Thread(
-                target=partial(self._start_download, url,
-                               path, callback, errback)
-            )
-            th.daemon = True
-            th.start()
-            return True
-        return False
-
     def _get_server(self, url):
         """Returns the server name for a given URL.
 
@@ -92,8 +532,9 @@ class Downloader(object):
         pass
 
     def _default_error_callback(self, e):
-        """Default callback to execute on a failed download"""
-        raise e
+        """Default callback to execute on a failed download, the error is
+        kept in `errors`"""
+        pass
 
     def wait(self):
         self.done_lock.acquire()
@@ -104,7 +545,8 @@ class Downloader(object):
     def init(self):
         pass
 
-    def download(self, url, path=None, callback=None, errback=None):
+    def download(self, url, path=None, callback=None, errback=None,
+                 checksum=None, size=None, key=None):
         """Downloads a file at a specified URL.
 
         Parameters
@@ -119,14 +561,17 @@ class Downloader(object):
             Function to call when download is successfully completed
         errback : function
             Function to call when download fails
+        checksum : tuple, optional
+            See `fetch`.
+        size : int, optional
+            See `fetch`.
+        key : str, optional
+            The key of the file in the `store`, see `fetch`.
 
         Returns
         -------
         out : None
         """
-        # Load balancing?
-        # @todo: explain
-
         server = self._get_server(url)
 
         # Create function to compute the filepath to download to if not set
@@ -134,7 +579,7 @@ class Downloader(object):
 
         if path is None:
             path = partial(default_name, default_dir)
-        elif isinstance(path, basestring):
+        elif isinstance(path, six.string_types):
             path = partial(default_name, path)
 
         # Use default callbacks if none were specified
@@ -143,27 +588,55 @@ class Downloader(object):
         if errback is None:
             errback = self._default_error_callback
 
-        # Attempt to download file from URL
-        if not self._attempt_download(url, path, callback, errback):
-            # If there are too many concurrent downloads, queue for later
-            self.q[server].append((url, path, callback, errback))
-
-    def _close(self, callback, args, server):
-        """ Called after download is done. Activated queued downloads, call callback.
-        """
-        callback(*args)
-
-        self.connections[server] -= 1
-        self.conns -= 1
+        with self.mutex:
+            self.q.setdefault(server, []).append(
+                (url, path, callback, errback, checksum, size, key))
+            if self.workers < self.max_total and self._next_server() is not None:
+                self.workers += 1
+                th = threading.Thread(target=self._work)
+                th.daemon = True
+                th.start()
+
+    def _next_server(self):
+        """The first host with queued downloads which has a free connection,
+        the mutex must be held."""
+        if self.conns >= self.max_total:
+            return None
+        for server in self.q:
+            if self.connections[server] < self.max_conn:
+                return server
+        return None
+
+    def _work(self):
+        """Download queued files until no host has a free connection."""
+        while True:
+            with self.mutex:
+                server = self._next_server()
+                if server is None:
+                    self.workers -= 1
+                    return
+                jobs = self.q.pop(server)
+                job = jobs.pop(0)
+                if jobs:
+                    # the host is served again after the other hosts
+                    self.q[server] = jobs
+                self.connections[server] += 1
+                self.conns += 1
+            try:
+                self._start_download(*job)
+            finally:
+                with self.mutex:
+                    self.connections[server] -= 1
+                    self.conns -= 1
 
-        if self.q[server]:
-            self._attempt_download(*self.q[server].pop())
-        else:
-            for k, v in self.q.iteritems():  # pylint: disable=W0612
-                while v:
-                    if self._attempt_download(*v[0]):
-                        v.popleft()
-                        if self.conns == self.max_total:
-                            return
-                    else:
-                        break
+    def _start_download(self, url, path, callback, errback, checksum=None,
+                        size=None, key=None):
+        try:
+            fullname = fetch(url, path, pool=self.pool,
+                             chunk_size=self.chunk_size, retries=self.retries,
+                             backoff=self.backoff, checksum=checksum,
+                             size=size, store=self.store, key=key)
+            callback({'path': fullname})
+        except Exception as e:
+            self.errors.append((url, e))
+            errback(e)
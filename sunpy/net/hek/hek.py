@@ -12,14 +12,15 @@ from __future__ import absolute_import
 
 import json
 
-from itertools import chain
+from functools import partial
+from collections import deque
+from multiprocessing.pool import ThreadPool
 from urllib2 import urlopen
 from urllib import urlencode
 from datetime import datetime
 from sunpy.net import attr
 from sunpy.net.hek import attrs
 from sunpy.net.vso import attrs as v_attrs
-from sunpy.util import unique
 from sunpy.util.xml import xml_to_dict
 
 __all__ = ['HEKClient']
@@ -51,49 +52,100 @@ class HEKClient(object):
     # Default to full disk.
     attrs.walker.apply(attrs.SpatialRegion(), {}, default)
 
-    def __init__(self, url=DEFAULT_URL):
+    def __init__(self, url=DEFAULT_URL, cache=None):
         self.url = url
-
-    def _download(self, data):
-        """ Download all data, even if paginated. """
-        page = 1
-        results = []
-
+        self.cache = cache
+
+    def _fetch_page(self, data, page):
+        """ Download one page of results. """
+        data = dict(data, page=page)
+        fd = urlopen(self.url, urlencode(data))
+        try:
+            return json.load(fd)
+        finally:
+            fd.close()
+
+    def _iter_pages(self, data, pool, workers):
+        """ Yield the results of every page in order. Once the first page
+        tells that there are more, up to workers pages are requested ahead
+        on the pool. The HEK does not tell how many pages there are, so the
+        pages requested after the last one are discarded. """
+        result = self._fetch_page(data, 1)
+        yield result['result']
+        page = 2
+        while pool is None and result['overmax']:
+            result = self._fetch_page(data, page)
+            yield result['result']
+            page += 1
+        if not result['overmax']:
+            return
+        pending = deque()
         while True:
-            data['page'] = page
-            fd = urlopen(self.url, urlencode(data))
-            try:
-                result = json.load(fd)
-            finally:
-                fd.close()
-            results.extend(result['result'])
-
+            while len(pending) < workers:
+                pending.append(
+                    pool.apply_async(self._fetch_page, (data, page)))
+                page += 1
+            result = pending.popleft().get()
+            yield result['result']
             if not result['overmax']:
-                return map(Response, results)
-            page += 1
+                return
+
+    def iter_query(self, *query, **kwargs):
+        """ Like `query`, but yield the unique HEK Response objects as the
+        pages of results arrive instead of returning them all at once.
+
+        Parameters
+        ----------
+        workers : int
+            Number of pages which are downloaded concurrently, defaults to 4.
+        """
+        workers = kwargs.pop('workers', 4)
+        if kwargs:
+            raise TypeError(
+                'unexpected keyword arguments: {0}'.format(', '.join(kwargs)))
+        return self._iter_responses(self._make_data(attr.and_(*query)),
+                                    workers)
+
+    def _iter_responses(self, ndata, workers):
+        """ Yield the unique results of all branches of a query. """
+        pool = ThreadPool(workers) if workers > 1 else None
+        seen = set()
+        try:
+            for data in ndata:
+                for results in self._iter_pages(data, pool, workers):
+                    for result in results:
+                        key = _freeze(result)
+                        if key not in seen:
+                            seen.add(key)
+                            yield Response(result)
+        finally:
+            if pool is not None:
+                pool.terminate()
 
     def query(self, *query):
         """ Retrieves information about HEK records matching the criteria
         given in the query expression. If multiple arguments are passed,
         they are connected with AND. The result of a query is a list of
-        unique HEK Response objects that fulfill the criteria."""
+        unique HEK Response objects that fulfill the criteria. The responses
+        are kept in the `sunpy.net.querycache.QueryCache` of the client, if
+        it has one."""
         query = attr.and_(*query)
+        if self.cache is not None:
+            return self.cache.fetch('hek', (self.url, query),
+                                    partial(self._query, query))
+        return self._query(query)
 
-        data = attrs.walker.create(query, {})
+    def _query(self, query):
+        return list(self.iter_query(query))
+
+    def _make_data(self, query):
+        """ The request parameters of every branch of the query. """
         ndata = []
-        for elem in data:
+        for elem in attrs.walker.create(query, {}):
             new = self.default.copy()
             new.update(elem)
             ndata.append(new)
-
-        if len(ndata) == 1:
-            return self._download(ndata[0])
-        else:
-            return self._merge(self._download(data) for data in ndata)
-
-    def _merge(self, responses):
-        """ Merge responses, removing duplicates. """
-        return list(unique(chain.from_iterable(responses), _freeze))
+        return ndata
 
 
 class Response(dict):
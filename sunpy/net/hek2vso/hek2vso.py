@@ -14,6 +14,8 @@ and returns the results from the VSO query to the user.
 from __future__ import absolute_import
 
 import sys
+from multiprocessing.pool import ThreadPool
+
 from astropy import units
 
 from sunpy.net import hek
@@ -111,7 +113,8 @@ class H2VClient(object):
     Though the single step functions exists outside this class where
     translation is also possible, this class provides a framework where
     all the necessary functionality is easily accessed, along with a few
-    additional and helpful methods.
+    additional and helpful methods. A `sunpy.net.querycache.QueryCache`
+    given as ``cache`` is used for both the HEK and the VSO queries.
 
     Examples
     --------
@@ -120,10 +123,10 @@ class H2VClient(object):
     >>> h2v = hek2vso.H2VClient()
     """
 
-    def __init__(self):
-        self.hek_client = hek.HEKClient()
+    def __init__(self, cache=None):
+        self.hek_client = hek.HEKClient(cache=cache)
         self.hek_results = ''
-        self.vso_client = vso.VSOClient()
+        self.vso_client = vso.VSOClient(cache=cache)
         self.vso_results = []
         self.num_of_records = 0
 
@@ -157,7 +160,8 @@ class H2VClient(object):
         return self.translate_and_query(self.hek_results,
                                         limit=limit, progress=progress)
 
-    def translate_and_query(self, hek_results, limit=None, progress=False):
+    def translate_and_query(self, hek_results, limit=None, progress=False,
+                            workers=4, timeout=None):
         """
         Translates HEK results, makes a VSO query, then returns the results.
 
@@ -173,6 +177,11 @@ class H2VClient(object):
             An approximate limit to the desired number of VSO results.
         progress : Boolean
             A flag to turn off the progress bar, defaults to "off"
+        workers : int
+            Number of VSO queries which are made concurrently, defaults to 4.
+            The results are still returned in the order of the HEK results.
+        timeout : float or None
+            Timeout in seconds for each request to the VSO.
 
         Examples
         --------
@@ -192,15 +201,32 @@ class H2VClient(object):
             sys.stdout.flush()
             pbar = TTYProgressBar(result_size)
 
-        for query in vso_query:
-            temp = self.vso_client.query(*query)
-            self.vso_results.append(temp)
-            self.num_of_records += len(temp)
-            if limit is not None:
-                if self.num_of_records >= limit:
-                    break
-            if progress:
-                pbar.poke()
+        def run(query):
+            # every thread gets its own copy of the suds client
+            client = vso.VSOClient(api=self.vso_client.api.clone(),
+                                   cache=self.vso_client.cache)
+            return client.query(*query, workers=1, timeout=timeout)
+
+        pool = None
+        if workers is not None and workers > 1 and result_size > 1:
+            pool = ThreadPool(min(workers, result_size))
+            results = pool.imap(run, vso_query)
+        else:
+            results = (self.vso_client.query(*query, timeout=timeout)
+                       for query in vso_query)
+
+        try:
+            for temp in results:
+                self.vso_results.append(temp)
+                self.num_of_records += len(temp)
+                if limit is not None:
+                    if self.num_of_records >= limit:
+                        break
+                if progress:
+                    pbar.poke()
+        finally:
+            if pool is not None:
+                pool.terminate()
 
         if progress:
             pbar.finish()
@@ -6,6 +6,7 @@ from sunpy.net.helio import parser
 from sunpy.time import parse_time
 from suds.client import Client as C
 import suds
+from functools import partial
 from astropy.io.votable.table import parse_single_table
 import io
 
@@ -131,7 +132,7 @@ class HECClient(object):
     A client class used to interface with and query HELIO webservices.
     """
 
-    def __init__(self, link=None):
+    def __init__(self, link=None, cache=None):
         """
         The constructor; establishes the webservice link for the client
 
@@ -142,6 +143,9 @@ class HECClient(object):
         link : str
             Contains URL to valid WSDL endpoint
 
+        cache : `sunpy.net.querycache.QueryCache`
+            Keeps the responses of the queries, if given.
+
         Examples
         --------
         >>> from sunpy.net.helio import hec
@@ -151,6 +155,7 @@ class HECClient(object):
             # The default wsdl file
             link = parser.wsdl_retriever()
 
+        self.cache = cache
         self.votable_interceptor = VotableInterceptor()
         self.hec_client = C(link, plugins=[self.votable_interceptor], transport=WellBehavedHttpTransport())
 
@@ -194,12 +199,22 @@ class HECClient(object):
             table = self.make_table_list()
         start_time = parse_time(start_time)
         end_time = parse_time(end_time)
+        args = start_time, end_time, table, max_records
+        if self.cache is not None:
+            # the raw VOTable is cached, it is parsed again for every query
+            payload = self.cache.fetch('hec', args,
+                                       partial(self._time_query, *args))
+        else:
+            payload = self._time_query(*args)
+        results = votable_handler(payload)
+        return results
+
+    def _time_query(self, start_time, end_time, table, max_records):
         self.hec_client.service.TimeQuery(STARTTIME=start_time.isoformat(),
                                           ENDTIME=end_time.isoformat(),
                                           FROM=table,
                                           MAXRECORDS=max_records)
-        results = votable_handler(self.votable_interceptor.last_payload)
-        return results
+        return self.votable_interceptor.last_payload
 
     def get_table_names(self):
         """
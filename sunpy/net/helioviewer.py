@@ -125,6 +125,11 @@ class HelioviewerClient(object):
         >>> aia = sunpy.map.Map(filepath)   # doctest: +SKIP
         >>> aia.peek()   # doctest: +SKIP
 
+        Helioviewer JPEG 2000 images can be read at a lower resolution, which
+        is much faster than decoding the full image.
+
+        >>> aia_quarter = sunpy.map.Map(filepath, rlevel=2)   # doctest: +SKIP
+
         >>> data_sources = hv.get_data_sources()
         >>> hv.download_jp2('2012/07/03 14:30:00', sourceId=data_sources['SOHO']['LASCO']['C2']['white-light']['sourceId'])   # doctest: +SKIP
         """
@@ -5,6 +5,9 @@ import os
 import time
 import urlparse
 import warnings
+import threading
+from functools import partial
+from multiprocessing.pool import ThreadPool
 
 import requests
 import numpy as np
@@ -20,7 +23,7 @@ from sunpy.net.vso.vso import Results
 from sunpy.net.attr import and_
 from sunpy.net.jsoc.attrs import walker
 
-__all__ = ['JSOCClient', 'JSOCResponse']
+__all__ = ['JSOCClient', 'JSOCResponse', 'ExportStats']
 
 JSOC_INFO_URL = 'http://jsoc.stanford.edu/cgi-bin/ajax/jsoc_info'
 JSOC_EXPORT_URL = 'http://jsoc.stanford.edu/cgi-bin/ajax/jsoc_fetch'
@@ -56,6 +59,58 @@ class JSOCResponse(object):
             self.table = astropy.table.vstack([self.table, table])
 
 
+class ExportStats(object):
+    """
+    The progress of `JSOCClient.get`.
+
+    Attributes
+    ----------
+    requests : int
+        The number of export requests.
+    staged, failed : int
+        The number of requests which are ready to download or have failed.
+    files, downloaded : int
+        The number of files which are queued for download and downloaded.
+    nbytes : int
+        The number of downloaded bytes.
+    """
+    def __init__(self, requests=0):
+        self.requests = requests
+        self.staged = self.failed = 0
+        self.files = self.downloaded = self.nbytes = 0
+        self.start = time.time()
+        self._lock = threading.Lock()
+
+    def _add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def _downloaded(self, callback, result):
+        try:
+            nbytes = os.path.getsize(result['path'])
+        except (OSError, KeyError, TypeError):
+            nbytes = 0
+        self._add(downloaded=1, nbytes=nbytes)
+        callback(result)
+
+    @property
+    def elapsed(self):
+        """Seconds since the requests were submitted."""
+        return time.time() - self.start
+
+    @property
+    def throughput(self):
+        """Downloaded bytes per second."""
+        elapsed = self.elapsed
+        return self.nbytes / elapsed if elapsed > 0 else 0.
+
+    def __repr__(self):
+        return ("<ExportStats {0.staged}/{0.requests} requests staged, "
+                "{0.failed} failed, {0.downloaded}/{0.files} files, "
+                "{1:.1f} MB/s>".format(self, self.throughput / 1e6))
+
+
 class JSOCClient(object):
     """
     This is a Client to the JSOC Data Export service.
@@ -168,8 +223,14 @@ class JSOCClient(object):
     of the download.
 
     >>> res.wait(progress=True)   # doctest: +SKIP
+
+    The responses of queries are kept in ``cache``, a
+    `sunpy.net.querycache.QueryCache`, if one is given.
     """
 
+    def __init__(self, cache=None):
+        self.cache = cache
+
     def query(self, *query, **kwargs):
         """
         Build a JSOC query and submit it to JSOC for processing.
@@ -198,8 +259,14 @@ class JSOCClient(object):
             A collection of records that the query returns.
         """
 
-        return_results = JSOCResponse()
         query = and_(*query)
+        if self.cache is not None:
+            return self.cache.fetch('jsoc', (query, kwargs),
+                                    partial(self._query, query, kwargs))
+        return self._query(query, kwargs)
+
+    def _query(self, query, kwargs):
+        return_results = JSOCResponse()
         for block in walker.create(query):
             iargs = kwargs.copy()
             iargs.update(block)
@@ -277,33 +344,43 @@ class JSOCClient(object):
         allstatus = []
         for request_id in requestIDs:
             u = self._request_status(request_id)
-            status = int(u.json()['status'])
-
-            if status == 0:  # Data ready to download
-                print("Request {0} was exported at {1} and is ready to "\
-                      "download.".format(u.json()['requestid'],
-                                           u.json()['exptime']))
-            elif status == 1:
-                print_message = "Request {0} was submitted {1} seconds ago, " \
-                                "it is not ready to download."
-                print(print_message.format(u.json()['requestid'],
-                                           u.json()['wait']))
-            else:
-                print_message = "Request returned status: {0} with error: {1}"
-                json_status = u.json()['status']
-                json_error = u.json()['error']
-                print(print_message.format(json_status, json_error))
-
-            allstatus.append(status)
+            info = u.json()
+            self._print_status(info)
+            allstatus.append(int(info['status']))
 
         return allstatus
 
+    @staticmethod
+    def _print_status(info):
+        """
+        Print a message about the status of a request.
+        """
+        status = int(info['status'])
+
+        if status == 0:  # Data ready to download
+            print("Request {0} was exported at {1} and is ready to "\
+                  "download.".format(info['requestid'],
+                                       info['exptime']))
+        elif status == 1:
+            print_message = "Request {0} was submitted {1} seconds ago, " \
+                            "it is not ready to download."
+            print(print_message.format(info['requestid'],
+                                       info['wait']))
+        else:
+            print_message = "Request returned status: {0} with error: {1}"
+            print(print_message.format(info['status'], info['error']))
+
     def get(self, jsoc_response, path=None, overwrite=False, progress=True,
-            max_conn=5, downloader=None,sleep=10):
+            max_conn=5, downloader=None, sleep=10, max_sleep=120, workers=4,
+            retries=3, timeout=None):
         """
         Make the request for the data in jsoc_response and wait for it to be
         staged and then download the data.
 
+        All export requests are submitted at once and polled concurrently.
+        The files of every request are downloaded as soon as it is staged,
+        while the other requests are still being polled.
+
         Parameters
         ----------
         jsoc_response : JSOCResponse object
@@ -325,38 +402,172 @@ class JSOCClient(object):
             A Custom downloader to use
 
         sleep : int
-            The number of seconds to wait between calls to JSOC to check the status
-            of the request.
+            The number of seconds to wait before the first call to JSOC to
+            check the status of a request. The wait is doubled after every
+            call, up to max_sleep seconds.
+
+        max_sleep : int
+            The longest wait between two calls for the same request.
+
+        workers : int
+            The number of requests which are polled concurrently.
+
+        retries : int
+            The number of times a failed status call for a request, an error
+            response or a connection error, is retried with the same backoff
+            before the request fails.
+
+        timeout : float
+            The number of seconds after which a request which is not staged
+            fails, by default requests are polled until they are staged.
 
         Returns
         -------
         results : a :class:`sunpy.net.vso.Results` instance
-            A Results object
+            A Results object. Its ``stats`` attribute is an `ExportStats`
+            with the progress of the staging and the download.
         """
 
         # Make staging request to JSOC
         requestIDs = self.request_data(jsoc_response)
         # Add them to the response for good measure
         jsoc_response.requestIDs = requestIDs
-        time.sleep(sleep/2.)
 
-        r = None   # Needed when all requests ends in the else branch
-        while requestIDs:
-            for i, request_id in enumerate(requestIDs):
-                u = self._request_status(request_id)
+        if path is None:
+            path = config.get('downloads', 'download_dir')
+        path = os.path.expanduser(path)
 
-                if progress:
-                    self.check_request(request_id)
+        if downloader is None:
+            downloader = Downloader(max_conn=max_conn, max_total=max_conn)
 
-                if u.status_code == 200 and u.json()['status'] == '0':
-                    rID = requestIDs.pop(i)
-                    r = self.get_request(rID, path=path, overwrite=overwrite,
-                                         progress=progress,downloader=downloader)
+        results = Results(lambda _: downloader.stop())
+        results.stats = ExportStats(len(requestIDs))
+        if not requestIDs:
+            # Make Results think it has finished.
+            results.require([])
+            results.poke()
+            return results
+
+        # Every request holds the results open until its files are queued
+        staged = [results.require([]) for _ in requestIDs]
+        pool = ThreadPool(min(workers, len(requestIDs)))
+        for request_id, done in zip(requestIDs, staged):
+            pool.apply_async(self._stage_and_download,
+                             (request_id, done, path, overwrite, progress,
+                              downloader, results, sleep, max_sleep, retries,
+                              timeout))
+        pool.close()
 
-                else:
-                    time.sleep(sleep)
+        return results
 
-        return r
+    def _stage_and_download(self, request_id, done, path, overwrite,
+                            progress, downloader, results, sleep, max_sleep,
+                            retries, timeout):
+        """
+        Poll a request with an exponential backoff until it is staged and
+        queue its files for download.
+        """
+        try:
+            info = self._wait_for_request(request_id, sleep, max_sleep,
+                                          retries, timeout, progress)
+            results.stats._add(staged=1)
+            self._queue_files(info, path, overwrite, progress, downloader,
+                              results)
+        except Exception as e:
+            results.stats._add(failed=1)
+            # releases the hold of the request like done
+            results.add_error(e)
+        else:
+            done(None)
+
+    def _wait_for_request(self, request_id, sleep, max_sleep, retries=3,
+                          timeout=None, progress=False):
+        """
+        Return the status of a request once it is ready to download.
+
+        Error responses and connection errors are retried with the same
+        backoff, an IOError is raised after ``retries`` of them in a row or
+        once the request has not been staged after ``timeout`` seconds.
+        """
+        start = time.time()
+        failures = 0
+        delay = sleep / 2.
+        while True:
+            time.sleep(delay)
+            try:
+                u = self._request_status(request_id)
+            except requests.exceptions.RequestException as e:
+                error = e
+            else:
+                error = None
+                if u.status_code != 200:
+                    error = "HTTP status {0}".format(u.status_code)
+
+            if error is None:
+                failures = 0
+                info = u.json()
+                if progress:
+                    self._print_status(info)
+                status = int(info['status'])
+                if status == 0:
+                    return info
+                elif status not in (1, 2, 6):
+                    error_message = "Request {0} returned status {1} with " \
+                                    "error {2}"
+                    raise IOError(error_message.format(
+                        request_id, status, info.get('error')))
+            else:
+                failures += 1
+                if failures > retries:
+                    error_message = "The status of request {0} could not be " \
+                                    "checked {1} times in a row: {2}"
+                    raise IOError(error_message.format(request_id, failures,
+                                                       error))
+
+            if timeout is not None and time.time() - start > timeout:
+                error_message = "Request {0} was not staged after {1} seconds"
+                raise IOError(error_message.format(request_id, timeout))
+            delay = min(delay * 2, max_sleep)
+
+    def _queue_files(self, info, path, overwrite, progress, downloader,
+                     results):
+        """
+        Queue the files of a staged request on the downloader and return the
+        number of queued files.
+        """
+        stats = getattr(results, 'stats', None)
+        url_dir = BASE_DL_URL + info['dir'] + '/'
+        urls = []
+        for ar in info['data']:
+            is_file = os.path.isfile(os.path.join(path, ar['filename']))
+            if overwrite or not is_file:
+                urls.append(urlparse.urljoin(url_dir, ar['filename']))
+
+            else:
+                print_message = "Skipping download of file {} as it " \
+                                "has already been downloaded"
+                print(print_message.format(ar['filename']))
+                # Add the file on disk to the output
+                results.map_.update({ar['filename']:{'path':os.path.join(path, ar['filename'])}})
+
+        if progress:
+            print_message = "{0} URLs found for download. Totalling {1}MB"
+            print(print_message.format(len(urls), info['size']))
+
+        for url in urls:
+            callback = results.require([url])
+            if stats is not None:
+                callback = partial(stats._downloaded, callback)
+            try:
+                downloader.download(url, callback=callback,
+                                    errback=results.add_error, path=path)
+            except Exception:
+                # release the file, the error is reported for the request
+                results.poke()
+                raise
+        if stats is not None:
+            stats._add(files=len(urls))
+        return len(urls)
 
     def get_request(self, requestIDs, path=None, overwrite=False, progress=True,
                     max_conn=5, downloader=None, results=None):
@@ -411,38 +622,20 @@ class JSOCClient(object):
         if results is None:
             results = Results(lambda _: downloader.stop())
 
-        urls = []
+        nurls = 0
         for request_id in requestIDs:
             u = self._request_status(request_id)
+            info = u.json() if u.status_code == 200 else None
 
-            if u.status_code == 200 and u.json()['status'] == '0':
-                for ar in u.json()['data']:
-                    is_file = os.path.isfile(os.path.join(path, ar['filename']))
-                    if overwrite or not is_file:
-                        url_dir = BASE_DL_URL + u.json()['dir'] + '/'
-                        urls.append(urlparse.urljoin(url_dir, ar['filename']))
-
-                    else:
-                        print_message = "Skipping download of file {} as it " \
-                                        "has already been downloaded"
-                        print(print_message.format(ar['filename']))
-                        # Add the file on disk to the output
-                        results.map_.update({ar['filename']:{'path':os.path.join(path, ar['filename'])}})
-
-                if progress:
-                    print_message = "{0} URLs found for download. Totalling {1}MB"
-                    print(print_message.format(len(urls), u.json()['size']))
+            if info is not None and info['status'] == '0':
+                nurls += self._queue_files(info, path, overwrite,
+                                           progress, downloader, results)
 
             else:
                 if progress:
                     self.check_request(request_id)
 
-        if urls:
-            for url in urls:
-                downloader.download(url, callback=results.require([url]),
-                                    errback=lambda x: print(x), path=path)
-
-        else:
+        if not nurls:
             # Make Results think it has finished.
             results.require([])
             results.poke()
@@ -12,6 +12,7 @@ import astropy.table
 import astropy.time
 import astropy.units as u
 import pytest
+import requests
 
 from sunpy.time import parse_time
 from sunpy.net.jsoc import JSOCClient, JSOCResponse
@@ -228,3 +229,139 @@ def test_results_filenames():
 def test_invalid_query():
     with pytest.raises(ValueError):
         resp = client.query(attrs.Time('2012/1/1T01:00:00', '2012/1/1T01:00:45'))
+
+
+class FakeStatus(object):
+    def __init__(self, info, status_code=200):
+        self.status_code = status_code
+        self.info = info
+
+    def json(self):
+        return self.info
+
+
+class FakeDownloader(object):
+    def __init__(self):
+        self.urls = []
+
+    def download(self, url, callback=None, errback=None, path=None):
+        self.urls.append(url)
+        callback({'path': os.path.join(path, url.rsplit('/', 1)[-1])})
+
+    def stop(self):
+        pass
+
+
+class StagingJSOCClient(JSOCClient):
+    """ Stages the request 'a' after two polls and fails the request 'b'
+    without network access. """
+    def __init__(self):
+        super(StagingJSOCClient, self).__init__()
+        self.polls = {'a': 0, 'b': 0}
+
+    def request_data(self, jsoc_response):
+        return ['a', 'b']
+
+    def _request_status(self, request_id):
+        self.polls[request_id] += 1
+        if request_id == 'b':
+            return FakeStatus({'status': '4', 'error': 'bad request'})
+        if self.polls['a'] < 3:
+            return FakeStatus({'status': '1', 'wait': 10})
+        return FakeStatus({'status': '0', 'dir': '/SUM1/a', 'size': 1,
+                           'data': [{'filename': 'f1.fits'},
+                                    {'filename': 'f2.fits'}]})
+
+
+def test_get_pipelined():
+    client = StagingJSOCClient()
+    downloader = FakeDownloader()
+    res = client.get(JSOCResponse(), path=tempfile.mkdtemp(),
+                     progress=False, downloader=downloader, sleep=0.01)
+    files = res.wait()
+    assert sorted(downloader.urls) == [
+        'http://jsoc.stanford.edu/SUM1/a/f1.fits',
+        'http://jsoc.stanford.edu/SUM1/a/f2.fits']
+    assert sorted(files) == sorted(downloader.urls)
+    assert len(res.errors) == 1
+    assert client.polls == {'a': 3, 'b': 1}
+    stats = res.stats
+    assert (stats.requests, stats.staged, stats.failed) == (2, 1, 1)
+    assert (stats.files, stats.downloaded) == (2, 2)
+
+
+class FailingDownloader(FakeDownloader):
+    def download(self, url, callback=None, errback=None, path=None):
+        raise IOError(url)
+
+
+def test_get_download_raises():
+    client = StagingJSOCClient()
+    res = client.get(JSOCResponse(), path=tempfile.mkdtemp(),
+                     progress=False, downloader=FailingDownloader(),
+                     sleep=0.01)
+    # the files which could not be queued do not block the results
+    assert res.wait() == {}
+    assert len(res.errors) == 2
+    assert res.stats.failed == 2
+
+
+class FlakyJSOCClient(JSOCClient):
+    """ Answers the status calls for one request with the given responses,
+    exceptions are raised. """
+    def __init__(self, responses):
+        super(FlakyJSOCClient, self).__init__()
+        self.responses = responses
+        self.polls = 0
+
+    def request_data(self, jsoc_response):
+        return ['a']
+
+    def _request_status(self, request_id):
+        response = self.responses[min(self.polls, len(self.responses) - 1)]
+        self.polls += 1
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+STAGED = FakeStatus({'status': '0', 'requestid': 'a', 'exptime': 'now',
+                     'dir': '/SUM1/a', 'size': 1,
+                     'data': [{'filename': 'f1.fits'}]})
+
+
+def test_get_retries_status_errors(capsys):
+    client = FlakyJSOCClient([FakeStatus({}, status_code=503),
+                              requests.exceptions.ConnectionError('reset'),
+                              FakeStatus({'status': '1', 'requestid': 'a',
+                                          'wait': 10}),
+                              STAGED])
+    downloader = FakeDownloader()
+    res = client.get(JSOCResponse(), path=tempfile.mkdtemp(), progress=True,
+                     downloader=downloader, sleep=0.01, retries=2)
+    assert list(res.wait()) == ['http://jsoc.stanford.edu/SUM1/a/f1.fits']
+    assert not res.errors
+    assert client.polls == 4
+    out, err = capsys.readouterr()
+    assert "Request a was submitted 10 seconds ago" in out
+    assert "Request a was exported at now" in out
+
+
+def test_get_too_many_status_errors():
+    client = FlakyJSOCClient([FakeStatus({}, status_code=500)])
+    res = client.get(JSOCResponse(), path=tempfile.mkdtemp(), progress=False,
+                     downloader=FakeDownloader(), sleep=0.01, max_sleep=0.01,
+                     retries=2)
+    assert res.wait() == {}
+    assert len(res.errors) == 1
+    assert client.polls == 3
+
+
+def test_get_timeout():
+    client = FlakyJSOCClient([FakeStatus({'status': '1', 'wait': 10})])
+    res = client.get(JSOCResponse(), path=tempfile.mkdtemp(), progress=False,
+                     downloader=FakeDownloader(), sleep=0.01, max_sleep=0.01,
+                     timeout=0.05)
+    assert res.wait() == {}
+    assert len(res.errors) == 1
+    assert res.stats.failed == 1
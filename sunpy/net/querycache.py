@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+A persistent cache of the responses of the query clients.
+
+A `QueryCache` is stored in a SQLite file and can be shared by the VSO, HEK,
+JSOC and HEC clients, by threads and by processes. Pass it as the ``cache``
+argument of a client to serve repeated queries from the disk::
+
+    >>> from sunpy.net import vso, hek
+    >>> from sunpy.net.querycache import QueryCache
+    >>> cache = QueryCache(ttl=3600)   # doctest: +SKIP
+    >>> vc = vso.VSOClient(cache=cache)   # doctest: +SKIP
+    >>> hc = hek.HEKClient(cache=cache)   # doctest: +SKIP
+
+The responses are keyed on the name of the client and on the normalised
+query, so that e.g. ``a & b`` and ``b & a`` share one entry. An ``offline``
+cache never queries the services: it returns the cached responses, even
+expired ones, and raises `QueryCacheMiss` for everything else.
+"""
+from __future__ import absolute_import
+
+import os
+import json
+import time
+import zlib
+import pickle
+import sqlite3
+import hashlib
+import threading
+
+from io import BytesIO
+from datetime import datetime, date
+
+import numpy as np
+from astropy import units as u
+
+import sunpy
+from sunpy.net.attr import Attr, AttrAnd, AttrOr
+from sunpy.util.caching import CacheStats
+
+try:
+    from suds import sudsobject
+except ImportError:  # pragma: no cover
+    sudsobject = None
+
+__all__ = ['QueryCache', 'QueryCacheMiss']
+
+_PICKLE_PROTOCOL = 2
+
+
+class QueryCacheMiss(KeyError):
+    """This exception is raised by an offline `QueryCache` for a query whose
+    response has not been cached."""
+
+
+class _KeyEncoder(json.JSONEncoder):
+    """Encode query attributes like `sunpy.database.serialize.QueryEncoder`,
+    but for the attributes of every client and independent of the order of
+    the operands of ``&`` and ``|``."""
+    def default(self, o):
+        if isinstance(o, (AttrAnd, AttrOr)):
+            values = sorted(self.encode(attr) for attr in o.attrs)
+            return {o.__class__.__name__: values}
+        elif isinstance(o, Attr):
+            name = '{0}.{1}'.format(o.__class__.__module__,
+                                    o.__class__.__name__)
+            return {name: vars(o)}
+        elif isinstance(o, u.Quantity):
+            return [np.asarray(o.value).tolist(), str(o.unit)]
+        elif isinstance(o, u.UnitBase):
+            return str(o)
+        elif isinstance(o, (datetime, date)):
+            return o.isoformat()
+        elif isinstance(o, (set, frozenset)):
+            return sorted(self.encode(value) for value in o)
+        elif isinstance(o, np.generic):
+            return o.item()
+        elif isinstance(o, type):
+            return '{0}.{1}'.format(o.__module__, o.__name__)
+        # Raises TypeError, the repr of other objects may differ between
+        # processes and would give keys which never match.
+        return json.JSONEncoder.default(self, o)
+
+
+class _Pickler(pickle.Pickler):
+    """Pickle suds objects, whose classes are created at run time, by name
+    and content."""
+    def persistent_id(self, obj):
+        if sudsobject is not None and isinstance(obj, sudsobject.Object):
+            return ('suds', obj.__class__.__name__,
+                    list(sudsobject.items(obj)))
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        _, name, items = pid
+        obj = sudsobject.Factory.object(name)
+        for key, value in items:
+            setattr(obj, key, value)
+        return obj
+
+
+def _dumps(value):
+    buf = BytesIO()
+    _Pickler(buf, _PICKLE_PROTOCOL).dump(value)
+    return zlib.compress(buf.getvalue())
+
+
+def _loads(data):
+    return _Unpickler(BytesIO(zlib.decompress(data))).load()
+
+
+class QueryCache(object):
+    """
+    A persistent cache of query responses.
+
+    Parameters
+    ----------
+    path : str
+        The SQLite file of the cache. Defaults to ``querycache.sqlite`` in
+        the SunPy working directory.
+    ttl : float or None
+        Number of seconds after which a cached response is queried again.
+        None keeps the responses until they are evicted.
+    maxbytes : int or None
+        Upper limit of the size of the compressed responses in the cache.
+        When it is exceeded, the least recently used responses are removed.
+    offline : bool
+        Only serve cached responses and never query the services.
+
+    Attributes
+    ----------
+    stats : `sunpy.util.caching.CacheStats`
+        The hits, misses, evictions and expirations of this instance and the
+        current number of responses and bytes in the cache.
+    """
+    def __init__(self, path=None, ttl=86400, maxbytes=100 * 1024 ** 2,
+                 offline=False):
+        if path is None:
+            path = os.path.join(
+                sunpy.config.get('general', 'working_dir'), 'querycache.sqlite')
+        dirname = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        self.path = path
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.offline = offline
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=60,
+                                     check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, client TEXT, created REAL, '
+                'accessed REAL, size INTEGER, data BLOB)')
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS ix_responses_accessed '
+                'ON responses (accessed)')
+
+    @staticmethod
+    def key(client, *args, **kwargs):
+        """The cache key of a query made by ``client`` with the given
+        arguments. Raise `TypeError` if an argument has a type which cannot
+        be encoded in a key."""
+        dump = json.dumps([client, args, kwargs], cls=_KeyEncoder,
+                          sort_keys=True)
+        return hashlib.sha1(dump.encode('utf-8')).hexdigest()
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def get(self, key, stale=False):
+        """Return the cached response of ``key``, raise `KeyError` if there
+        is none. Expired responses are only returned if ``stale`` is true."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT created, data FROM responses WHERE key = ?',
+                (key, )).fetchone()
+            if row is None or (not stale and self._expired(row[0], now)):
+                self.misses += 1
+                raise KeyError(key)
+            with self._conn:
+                self._conn.execute(
+                    'UPDATE responses SET accessed = ? WHERE key = ?',
+                    (now, key))
+            self.hits += 1
+        return _loads(row[1])
+
+    def set(self, key, value, client=None):
+        """Store the response ``value`` under ``key`` and evict responses
+        until the cache fits into ``maxbytes``."""
+        data = _dumps(value)
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO responses '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, client, now, now, len(data), sqlite3.Binary(data)))
+            self._evict()
+
+    def _evict(self):
+        if self.maxbytes is None or self.currbytes <= self.maxbytes:
+            return
+        # Expired responses are kept for offline use until space is needed
+        self.expire()
+        total = self.currbytes
+        if total <= self.maxbytes:
+            return
+        rows = self._conn.execute(
+            'SELECT key, size FROM responses ORDER BY accessed').fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.maxbytes:
+                break
+            evicted.append((key, ))
+            total -= size
+        with self._conn:
+            self._conn.executemany(
+                'DELETE FROM responses WHERE key = ?', evicted)
+        self.evictions += len(evicted)
+
+    def expire(self):
+        """Remove the expired responses."""
+        if self.ttl is None:
+            return
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute(
+                    'DELETE FROM responses WHERE created < ?',
+                    (time.time() - self.ttl, ))
+            self.expirations += max(cursor.rowcount, 0)
+
+    def fetch(self, client, args, query, cacheable=None):
+        """Return the cached response of the query of ``client`` with the
+        arguments ``args``. If there is none, return the result of calling
+        ``query`` without arguments, or raise `QueryCacheMiss` if the cache is
+        offline. The result is cached unless ``cacheable`` is given and
+        returns False for it, e.g. because the query partly failed. Queries
+        whose arguments cannot be encoded in a key are not cached."""
+        try:
+            key = self.key(client, *args)
+        except TypeError:
+            if self.offline:
+                raise QueryCacheMiss(
+                    'this {0} query cannot be cached'.format(client))
+            return query()
+        try:
+            return self.get(key, stale=self.offline)
+        except KeyError:
+            if self.offline:
+                raise QueryCacheMiss(
+                    'no cached {0} response for this query'.format(client))
+        value = query()
+        if cacheable is None or cacheable(value):
+            self.set(key, value, client)
+        return value
+
+    def clear(self):
+        """Remove all responses."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute('DELETE FROM responses')
+
+    @property
+    def currbytes(self):
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    @property
+    def stats(self):
+        with self._lock:
+            count = self._conn.execute(
+                'SELECT COUNT(*) FROM responses').fetchone()[0]
+            return CacheStats(self.hits, self.misses, self.evictions,
+                              self.expirations, count, self.currbytes)
+
+    def __len__(self):
+        return self.stats.currsize
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._conn.execute(
+                'SELECT 1 FROM responses WHERE key = ?',
+                (key, )).fetchone() is not None
+
+    def close(self):
+        self._conn.close()
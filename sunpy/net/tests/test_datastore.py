@@ -0,0 +1,108 @@
+from __future__ import absolute_import
+
+import os
+import time
+
+import pytest
+
+from sunpy.net.datastore import DataStore
+
+
+@pytest.fixture
+def store(tmpdir):
+    return DataStore(str(tmpdir.join('store')))
+
+
+def make_file(tmpdir, name, content):
+    filename = str(tmpdir.join(name))
+    with open(filename, 'wb') as fd:
+        fd.write(content)
+    return filename
+
+
+def test_add_retrieve(store, tmpdir):
+    filename = make_file(tmpdir, 'a.fits', b'abc' * 100)
+    store.add('http://example.com/a.fits', filename)
+    assert 'http://example.com/a.fits' in store
+    target = str(tmpdir.join('copy', 'a.fits'))
+    assert store.retrieve('http://example.com/a.fits', target) == target
+    with open(target, 'rb') as fd:
+        assert fd.read() == b'abc' * 100
+    assert store.retrieve('http://example.com/b.fits', target) is None
+
+
+def test_retrieve_removed(store, tmpdir, monkeypatch):
+    """A file which is removed by another process while it is retrieved is
+    a miss."""
+    store.add('a', make_file(tmpdir, 'a.fits', b'abc'))
+    get = store.get
+
+    def get_and_evict(key):
+        blob = get(key)
+        os.remove(blob)
+        return blob
+    monkeypatch.setattr(store, 'get', get_and_evict)
+    assert store.retrieve('a', str(tmpdir.join('copy.fits'))) is None
+    assert not os.path.exists(str(tmpdir.join('copy.fits')))
+
+    store.add('b', make_file(tmpdir, 'b.fits', b'def'))
+
+    def get_and_remove(key):
+        blob = get(key)
+        with store._conn:
+            store._conn.execute('DELETE FROM files WHERE key = ?', (key, ))
+        return blob
+    monkeypatch.setattr(store, 'get', get_and_remove)
+    assert store.retrieve('b', lambda response, url: 'b.fits') is None
+
+
+def test_deduplicate(store, tmpdir):
+    store.add('vso:SDAC:1', make_file(tmpdir, 'a.fits', b'abc'))
+    store.add('http://example.com/a.fits', make_file(tmpdir, 'b.fits', b'abc'))
+    assert len(store) == 2
+    assert store.currbytes == 3
+    store.remove('vso:SDAC:1')
+    assert 'http://example.com/a.fits' in store
+    with pytest.raises(KeyError):
+        store.remove('vso:SDAC:1')
+
+
+def test_truncated(store, tmpdir):
+    blob = store.add('a', make_file(tmpdir, 'a.fits', b'abc' * 100))
+    os.remove(blob)
+    with open(blob, 'wb') as fd:
+        fd.write(b'abc')
+    assert store.get('a') is None
+    assert not os.path.exists(blob)
+    assert len(store) == 0
+
+
+def test_verify(tmpdir):
+    store = DataStore(str(tmpdir.join('store')), verify=True)
+    blob = store.add('a', make_file(tmpdir, 'a.fits', b'abc'))
+    os.remove(blob)
+    with open(blob, 'wb') as fd:
+        fd.write(b'xyz')
+    assert store.get('a') is None
+
+
+def test_maxbytes(tmpdir):
+    store = DataStore(str(tmpdir.join('store')), maxbytes=250)
+    for name in 'abc':
+        store.add(name, make_file(tmpdir, name, name.encode('ascii') * 100))
+        time.sleep(0.01)
+    assert 'a' not in store
+    assert 'b' in store and 'c' in store
+    assert store.currbytes == 200
+
+
+def test_copies_are_independent(store, tmpdir):
+    filename = make_file(tmpdir, 'a.fits', b'abc')
+    store.add('a', filename)
+    target = str(tmpdir.join('b.fits'))
+    store.retrieve('a', target)
+    for name in (filename, target):
+        with open(name, 'r+b') as fd:
+            fd.write(b'x')
+    with open(store.get('a'), 'rb') as fd:
+        assert fd.read() == b'abc'
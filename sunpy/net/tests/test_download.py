@@ -7,7 +7,9 @@ from __future__ import absolute_import
 
 import pytest
 
+import hashlib
 import os
+import re
 import tempfile
 import threading
 
@@ -15,7 +17,11 @@ from functools import partial
 
 import sunpy
 
-from sunpy.net.download import Downloader, default_name
+from sunpy.extern.six.moves import BaseHTTPServer, socketserver
+from sunpy.net.download import Downloader, default_name, fetch,\
+    ConnectionPool, DownloadError
+from sunpy.net.datastore import DataStore
+from sunpy.util.net import check_download_file
 
 
 class CalledProxy(object):
@@ -159,3 +165,234 @@ def test_download_dir():
     assert not timeout.fired
     assert not errback.fired
     assert os.path.exists(os.path.join(tmpdir, 'jquery.min.js'))
+
+
+CONTENT = os.urandom(100000)
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def do_GET(self):
+        server = self.server
+        content = server.content
+        server.requests.append((self.path, self.headers.get('Range')))
+        if self.path == '/missing':
+            self.send_error(404)
+            return
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/file.dat')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        etag = '"{0}"'.format(hashlib.md5(content).hexdigest())
+        if server.validators and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        start = 0
+        match = re.match(r'bytes=(\d+)-', self.headers.get('Range') or '')
+        if match is not None:
+            start = int(match.group(1))
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes {0}-{1}/{2}'.format(
+                start, len(content) - 1, len(content)))
+        else:
+            self.send_response(200)
+        if server.validators:
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified',
+                             'Sat, 01 Mar 2014 12:00:00 GMT')
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(len(content) - start))
+        self.end_headers()
+        if server.fail:
+            # send half of the data and drop the connection
+            server.fail -= 1
+            self.wfile.write(content[start:start + (len(content) - start) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(content[start:])
+
+
+class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def server(request):
+    httpd = Server(('127.0.0.1', 0), Handler)
+    httpd.fail = 0
+    httpd.content = CONTENT
+    httpd.validators = False
+    httpd.connections = 0
+    httpd.requests = []
+    httpd.url = 'http://127.0.0.1:{0}/'.format(httpd.server_address[1])
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    def fin():
+        httpd.shutdown()
+        httpd.server_close()
+    request.addfinalizer(fin)
+    return httpd
+
+
+def test_fetch(server, tmpdir):
+    pool = ConnectionPool()
+    filename = str(tmpdir.join('file.dat'))
+    assert fetch(server.url + 'file.dat', filename, pool=pool) == filename
+    fetch(server.url + 'redirect', str(tmpdir.join('other.dat')), pool=pool)
+    with open(filename, 'rb') as fd:
+        assert fd.read() == CONTENT
+    assert not os.path.exists(filename + '.part')
+    # all the requests used one keep-alive connection
+    assert server.connections == 1
+    assert len(server.requests) == 3
+
+
+def test_fetch_resume(server, tmpdir):
+    server.fail = 2
+    filename = str(tmpdir.join('file.dat'))
+    fetch(server.url + 'file.dat', filename, pool=ConnectionPool(), backoff=0)
+    with open(filename, 'rb') as fd:
+        assert fd.read() == CONTENT
+    ranges = [byte_range for path, byte_range in server.requests]
+    assert ranges == [None, 'bytes=50000-', 'bytes=75000-']
+
+
+def test_fetch_resume_part_file(server, tmpdir):
+    filename = str(tmpdir.join('file.dat'))
+    with open(filename + '.part', 'wb') as fd:
+        fd.write(CONTENT[:1000])
+    fetch(server.url + 'file.dat', filename, pool=ConnectionPool())
+    with open(filename, 'rb') as fd:
+        assert fd.read() == CONTENT
+    assert server.requests[-1][1] == 'bytes=1000-'
+
+
+def test_fetch_checksum(server, tmpdir):
+    filename = str(tmpdir.join('file.dat'))
+    md5 = hashlib.md5(CONTENT).hexdigest()
+    fetch(server.url + 'file.dat', filename, pool=ConnectionPool(),
+          checksum=('md5', md5), size=len(CONTENT))
+    with pytest.raises(DownloadError):
+        fetch(server.url + 'file.dat', filename, pool=ConnectionPool(),
+              checksum=('md5', '0' * 32), retries=1, backoff=0)
+    assert len(server.requests) == 3
+
+
+def test_fetch_error(server, tmpdir):
+    with pytest.raises(DownloadError) as excinfo:
+        fetch(server.url + 'missing', str(tmpdir.join('missing')),
+              pool=ConnectionPool(), backoff=0)
+    assert not excinfo.value.retry
+    # errors which cannot be fixed by retrying are not retried
+    assert len(server.requests) == 1
+
+
+def test_downloader_local(server, tmpdir):
+    dw = Downloader(max_conn=2, max_total=2, pool=ConnectionPool())
+    paths = []
+    lock = threading.Lock()
+    n = 10
+
+    def callback(result):
+        with lock:
+            paths.append(result['path'])
+            if len(paths) + len(dw.errors) == n:
+                dw.stop()
+
+    def errback(e):
+        with lock:
+            if len(paths) + len(dw.errors) == n:
+                dw.stop()
+
+    for i in range(n - 1):
+        dw.download(server.url + 'file{0}.dat'.format(i),
+                    lambda sock, url: str(tmpdir.join(url.rsplit('/', 1)[-1])),
+                    callback, errback)
+    dw.download(server.url + 'missing', str(tmpdir), callback, errback)
+    dw.wait()
+    assert len(paths) == n - 1
+    assert [url for url, e in dw.errors] == [server.url + 'missing']
+    for path in paths:
+        with open(path, 'rb') as fd:
+            assert fd.read() == CONTENT
+    # the downloads reuse the connections
+    assert server.connections <= 3
+
+
+def test_fetch_store(server, tmpdir):
+    store = DataStore(str(tmpdir.join('store')))
+    first = str(tmpdir.mkdir('a').join('file.dat'))
+    second = str(tmpdir.join('b', 'file.dat'))
+    fetch(server.url + 'file.dat', first, pool=ConnectionPool(), store=store)
+    path = partial(default_name, str(tmpdir.join('c')))
+    fetch(server.url + 'file.dat', second, pool=ConnectionPool(), store=store)
+    third = fetch(server.url + 'file.dat', path, pool=ConnectionPool(),
+                  store=store)
+    assert third == str(tmpdir.join('c', 'file.dat'))
+    for filename in (first, second, third):
+        with open(filename, 'rb') as fd:
+            assert fd.read() == CONTENT
+    # only the first call downloaded the file
+    assert len(server.requests) == 1
+
+
+def test_fetch_update(server, tmpdir):
+    server.validators = True
+    url = server.url + 'file.dat'
+    filename = str(tmpdir.join('file.dat'))
+    fetch(url, filename, pool=ConnectionPool(), update=True)
+    assert os.path.getmtime(filename) == 1393675200
+    # not modified
+    fetch(url, filename, pool=ConnectionPool(), update=True)
+    assert len(server.requests) == 2
+    # only the added bytes are requested
+    server.content = CONTENT + b'appended'
+    fetch(url, filename, pool=ConnectionPool(), update=True, append=True)
+    assert server.requests[-1][1] == 'bytes={0}-'.format(len(CONTENT))
+    with open(filename, 'rb') as fd:
+        assert fd.read() == CONTENT + b'appended'
+    assert not os.path.exists(filename + '.part')
+    with pytest.raises(ValueError):
+        fetch(url, partial(default_name, str(tmpdir)), update=True)
+
+
+def test_fetch_proxy(server, tmpdir, monkeypatch):
+    for name in ('no_proxy', 'NO_PROXY', 'https_proxy', 'HTTPS_PROXY'):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv('http_proxy', server.url)
+    filename = str(tmpdir.join('file.dat'))
+    fetch('http://sunpy.invalid/file.dat', filename, pool=ConnectionPool())
+    with open(filename, 'rb') as fd:
+        assert fd.read() == CONTENT
+    # the proxy is sent the absolute URI
+    assert server.requests == [('http://sunpy.invalid/file.dat', None)]
+    assert ConnectionPool.proxy('https', 'sunpy.invalid') is None
+    monkeypatch.setenv('no_proxy', 'sunpy.invalid')
+    assert ConnectionPool.proxy('http', 'sunpy.invalid:80') is None
+
+
+def test_check_download_file_validators(server, tmpdir):
+    server.validators = True
+    filename = str(tmpdir.join('file.dat'))
+    check_download_file('file.dat', server.url, str(tmpdir))
+    # the first download saves the validators for later updates
+    assert os.path.exists(filename + '.etag')
+    assert os.path.getmtime(filename) == 1393675200
+    check_download_file('file.dat', server.url, str(tmpdir), update=True)
+    assert len(server.requests) == 2
+    with open(filename, 'rb') as fd:
+        assert fd.read() == CONTENT
@@ -74,3 +74,35 @@ def test_err_dummyattr_create():
 def test_err_dummyattr_apply():
     with pytest.raises(TypeError):
         hek.attrs.walker.apply(attr.DummyAttr(), {})
+
+
+class PagedHEKClient(hek.HEKClient):
+    """ Serves pages of fake results without network access. """
+    def __init__(self, npages):
+        super(PagedHEKClient, self).__init__()
+        self.npages = npages
+        self.requested = []
+
+    def _fetch_page(self, data, page):
+        self.requested.append(page)
+        if page > self.npages:
+            raise AssertionError('page {0} does not exist'.format(page))
+        # the first record of every page repeats the last one of the
+        # previous page
+        results = [{'event_id': n} for n in range(10 * page - 1, 10 * page + 10)]
+        return {'result': results, 'overmax': page < self.npages}
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_iter_query_pages(workers):
+    client = PagedHEKClient(7)
+    responses = list(client.iter_query(
+        hek.attrs.EventType('FL'), workers=workers))
+    assert [r['event_id'] for r in responses] == list(range(9, 80))
+    assert all(isinstance(r, hek.hek.Response) for r in responses)
+
+
+def test_iter_query_single_page():
+    client = PagedHEKClient(1)
+    assert len(list(client.iter_query(hek.attrs.EventType('FL')))) == 11
+    assert client.requested == [1]
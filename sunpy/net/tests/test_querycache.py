@@ -0,0 +1,128 @@
+from __future__ import absolute_import
+
+import os
+import time
+
+import pytest
+from astropy import units as u
+
+from sunpy.net import attr
+from sunpy.net.vso import attrs as va
+from sunpy.net.vso.vso import QueryResponse
+from sunpy.net.querycache import QueryCache, QueryCacheMiss
+
+
+@pytest.fixture
+def cache(tmpdir):
+    return QueryCache(str(tmpdir.join('cache.sqlite')))
+
+
+def test_key_is_order_invariant():
+    a = va.Instrument('aia')
+    b = va.Wave(171 * u.AA, 171 * u.AA)
+    c = va.Time('2012/1/1', '2012/1/2')
+    assert (QueryCache.key('vso', attr.and_(a, b, c)) ==
+            QueryCache.key('vso', attr.and_(c, b, a)))
+    assert (QueryCache.key('vso', a | va.Instrument('eit')) ==
+            QueryCache.key('vso', va.Instrument('eit') | a))
+    assert QueryCache.key('vso', a) != QueryCache.key('hek', a)
+    assert QueryCache.key('vso', a) != QueryCache.key('vso', b)
+
+
+def test_fetch(cache):
+    calls = []
+
+    def query():
+        calls.append(1)
+        return {'result': len(calls)}
+    assert cache.fetch('hek', ('a', ), query) == {'result': 1}
+    assert cache.fetch('hek', ('a', ), query) == {'result': 1}
+    assert cache.fetch('hek', ('b', ), query) == {'result': 2}
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.currsize) == (1, 2, 2)
+
+
+def test_uncacheable_arguments(tmpdir):
+    cache = QueryCache(str(tmpdir.join('cache.sqlite')))
+    with pytest.raises(TypeError):
+        QueryCache.key('hek', object())
+    calls = []
+
+    def query():
+        calls.append(1)
+        return len(calls)
+    # queries whose key would depend on the identity of an object are made
+    # every time and not cached
+    assert cache.fetch('hek', (object(), ), query) == 1
+    assert cache.fetch('hek', (object(), ), query) == 2
+    assert len(cache) == 0
+    cache.offline = True
+    with pytest.raises(QueryCacheMiss):
+        cache.fetch('hek', (object(), ), query)
+
+
+def test_persistent(tmpdir):
+    path = str(tmpdir.join('cache.sqlite'))
+    QueryCache(path).fetch('jsoc', (1, ), lambda: [1, 2, 3])
+    assert QueryCache(path).fetch('jsoc', (1, ), lambda: None) == [1, 2, 3]
+
+
+def test_cacheable(cache):
+    cache.fetch('vso', (1, ), lambda: 'failed', cacheable=lambda v: False)
+    assert len(cache) == 0
+
+
+def test_ttl_and_offline(tmpdir):
+    path = str(tmpdir.join('cache.sqlite'))
+    QueryCache(path, ttl=None).fetch('hek', (1, ), lambda: 'old')
+    offline = QueryCache(path, ttl=-1, offline=True)
+    # offline caches return expired responses
+    assert offline.fetch('hek', (1, ), lambda: 'new') == 'old'
+    with pytest.raises(QueryCacheMiss):
+        offline.fetch('hek', (2, ), lambda: 'new')
+    assert QueryCache(path, ttl=-1).fetch('hek', (1, ), lambda: 'new') == 'new'
+
+
+def test_maxbytes(cache):
+    data = os.urandom(1000)
+    for n in range(3):
+        cache.fetch('hec', (n, ), lambda: data)
+        time.sleep(0.01)
+    # room for three responses
+    cache.maxbytes = cache.currbytes + cache.currbytes // 6
+    cache.get(cache.key('hec', 0))
+    time.sleep(0.01)
+    cache.fetch('hec', (3, ), lambda: data)
+    assert cache.key('hec', 0) in cache
+    assert cache.key('hec', 1) not in cache
+    assert cache.stats.evictions == 1
+    assert cache.currbytes <= cache.maxbytes
+
+
+def test_suds_objects(cache):
+    sudsobject = pytest.importorskip('suds.sudsobject')
+    record = sudsobject.Factory.object(
+        'QueryResponseBlock',
+        {'fileid': 'a', 'time': sudsobject.Factory.object(
+            'Time', {'start': '20120101000000'})})
+    response = QueryResponse([record])
+    cached = cache.fetch('vso', (1, ), lambda: response)
+    cached = cache.fetch('vso', (1, ), lambda: None)
+    assert isinstance(cached, QueryResponse)
+    assert cached[0].fileid == 'a'
+    assert cached[0].time.start == '20120101000000'
+    assert cached.errors == []
+
+
+def test_set_keeps_expired(tmpdir):
+    path = str(tmpdir.join('cache.sqlite'))
+    QueryCache(path, ttl=None).fetch('hek', (1, ), lambda: 'old')
+    # storing a response online keeps the expired ones for offline use
+    QueryCache(path, ttl=-1).fetch('hek', (2, ), lambda: 'new')
+    offline = QueryCache(path, ttl=-1, offline=True)
+    assert offline.fetch('hek', (1, ), lambda: None) == 'old'
+    # until space is needed
+    cache = QueryCache(path, ttl=-1, maxbytes=0)
+    cache.fetch('hek', (3, ), lambda: 'newer')
+    assert len(cache) == 0
+    assert cache.stats.expirations == 3
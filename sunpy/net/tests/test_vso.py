@@ -14,6 +14,7 @@ from sunpy.net import vso
 from sunpy.net.vso import attrs as va
 from sunpy.net.vso.vso import QueryResponse
 from sunpy.net import attr
+from sunpy.net.querycache import QueryCache
 
 def pytest_funcarg__eit(request):
     return va.Instrument('eit')
@@ -208,3 +209,84 @@ def test_str():
 def test_repr():
     qr = QueryResponse([])
     assert "Start Time End Time  Source Instrument   Type" in repr(qr)
+
+
+class FakeService(object):
+    def __init__(self, api):
+        self.api = api
+
+    def Query(self, request):
+        if request == 'bad':
+            raise ValueError(request)
+        return (request, self.api.options)
+
+
+class FakeApi(object):
+    def __init__(self, options=None):
+        self.options = options or {}
+        self.service = FakeService(self)
+
+    def clone(self):
+        return FakeApi(dict(self.options))
+
+    def set_options(self, **kwargs):
+        self.options.update(kwargs)
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_send_queries(workers):
+    api = FakeApi()
+    client = vso.VSOClient(api=api)
+    requests = ['a', 'bad', 'c', 'd']
+    result = client._send_queries(requests, workers=workers, timeout=5)
+    assert [response and response[0] for response, _ in result] == [
+        'a', None, 'c', 'd']
+    assert all(response[1] == {'timeout': 5}
+               for response, _ in result if response is not None)
+    assert isinstance(result[1][1], ValueError)
+    # the shared client is never reconfigured
+    assert api.options == {}
+
+
+class OldDownloader(object):
+    """A downloader with the signature from before the data store."""
+    def __init__(self):
+        self.calls = []
+
+    def download(self, url, path, callback, errback):
+        self.calls.append(url)
+
+
+class StoreDownloader(OldDownloader):
+    store = object()
+
+    def download(self, url, path, callback, errback, key=None):
+        self.calls.append((url, key))
+
+
+def test_download_key():
+    client = vso.VSOClient(api=FakeApi())
+    record = QueryResponse([])
+    record.provider, record.fileid = 'SDAC', 'f1'
+    dw = OldDownloader()
+    client.download('URL-FILE', 'http://a/f1', dw, None, None, '{file}',
+                    record)
+    assert dw.calls == ['http://a/f1']
+    dw = StoreDownloader()
+    client.download('URL-FILE', 'http://a/f1', dw, None, None, '{file}',
+                    record)
+    assert dw.calls == [('http://a/f1', 'vso:SDAC:f1')]
+
+
+def test_query_cache_key(tmpdir):
+    cache = QueryCache(str(tmpdir.join('cache.sqlite')))
+    for url in ('http://a/VSOi_rpc_literal.wsdl',
+                'http://b/VSOi_rpc_literal.wsdl'):
+        api = FakeApi()
+        api.wsdl = type('Wsdl', (object, ), {'url': url})
+        client = vso.VSOClient(api=api, cache=cache)
+        client._query = lambda *args: QueryResponse([])
+        client.query(va.Instrument('aia'))
+        client.query(va.Instrument('aia'))
+    # the responses of different services are cached separately
+    assert len(cache) == 2
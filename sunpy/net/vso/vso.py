@@ -21,6 +21,7 @@ import threading
 from datetime import datetime, timedelta
 from functools import partial
 from collections import defaultdict
+from multiprocessing.pool import ThreadPool
 from suds import client, TypeNotFound
 
 from astropy.table import Table
@@ -265,11 +266,13 @@ class UnknownStatus(Exception):
     pass
 
 class VSOClient(object):
-    """ Main VSO Client. """
+    """ Main VSO Client. The responses of queries are kept in ``cache``,
+    a `sunpy.net.querycache.QueryCache`, if one is given. """
     method_order = [
         'URL-TAR_GZ', 'URL-ZIP', 'URL-TAR', 'URL-FILE', 'URL-packaged'
     ]
-    def __init__(self, url=None, port=None, api=None):
+    def __init__(self, url=None, port=None, api=None, cache=None):
+        self.cache = cache
         if api is None:
             if url is None:
                 url = DEFAULT_URL
@@ -278,6 +281,12 @@ class VSOClient(object):
 
             api = client.Client(url, transport = WellBehavedHttpTransport())
             api.set_options(port=port)
+        else:
+            url = getattr(getattr(api, 'wsdl', None), 'url', url)
+            port = getattr(getattr(api, 'options', None), 'port', port)
+        # The service queried, part of the keys of cached responses
+        self.url = url
+        self.port = port
         self.api = api
 
     def make(self, atype, **kwargs):
@@ -302,12 +311,18 @@ class VSOClient(object):
                 item[tip] = v
         return obj
 
-    def query(self, *query):
+    def query(self, *query, **kwargs):
         """ Query data from the VSO with the new API. Takes a variable number
         of attributes as parameter, which are chained together using AND.
 
         The new query language allows complex queries to be easily formed.
 
+        A query which combines attributes with OR is sent as one request per
+        combination, these requests are made concurrently on ``workers``
+        threads (4 by default). Each request can be limited to ``timeout``
+        seconds. Requests which fail are reported in the ``errors`` of the
+        returned response.
+
         Examples
         --------
         Query all data from eit or aia between 2010-01-01T00:00 and
@@ -334,23 +349,67 @@ class VSOClient(object):
         out : :py:class:`QueryResult` (enhanced list) of matched items. Return
         value of same type as the one of :py:meth:`VSOClient.query`.
         """
+        workers = kwargs.pop('workers', 4)
+        timeout = kwargs.pop('timeout', None)
+        if kwargs:
+            raise TypeError(
+                'unexpected keyword arguments: {0}'.format(', '.join(kwargs)))
         query = and_(*query)
-
-        responses = []
+        if self.cache is not None:
+            return self.cache.fetch(
+                'vso', (self.url, self.port, query),
+                partial(self._query, query, workers, timeout),
+                cacheable=lambda response: not response.errors)
+        return self._query(query, workers, timeout)
+
+    def _query(self, query, workers, timeout):
+        requests = []
         for block in walker.create(query, self.api):
             try:
-                responses.append(
-                    self.api.service.Query(
-                        self.make('QueryRequest', block=block)
-                    )
-                )
+                requests.append(self.make('QueryRequest', block=block))
             except TypeNotFound:
                 pass
+
+        responses = []
+        errors = []
+        for response, error in self._send_queries(requests, workers, timeout):
+            if error is not None:
+                errors.append(error)
+            elif response is not None:
+                responses.append(response)
+
+        response = QueryResponse.create(self.merge(responses))
+        for error in errors:
+            response.add_error(error)
+        return response
+
+    def _send_queries(self, requests, workers=4, timeout=None):
+        """ Send QueryRequests, concurrently if workers is more than one,
+        and return a (response, exception) pair for each of them in the same
+        order. """
+        concurrent = workers is not None and workers > 1 and len(requests) > 1
+
+        def send(request):
+            api = self.api
+            if concurrent or timeout is not None:
+                # a suds client must not be shared between threads
+                api = api.clone()
+                if timeout is not None:
+                    api.set_options(timeout=timeout)
+            try:
+                return api.service.Query(request), None
+            except TypeNotFound:
+                return None, None
             except Exception as ex:
-                response = QueryResponse.create(self.merge(responses))
-                response.add_error(ex)
+                return None, ex
 
-        return QueryResponse.create(self.merge(responses))
+        if not concurrent:
+            return [send(request) for request in requests]
+        pool = ThreadPool(min(workers, len(requests)))
+        try:
+            return pool.map(send, requests)
+        finally:
+            pool.terminate()
 
     def merge(self, queryresponses):
         """ Merge responses into one. """
@@ -767,9 +826,13 @@ class VSOClient(object):
     def download(self, method, url, dw, callback, errback, *args):
         """ Override to costumize download action. """
         if method.startswith('URL'):
-            return dw.download(url, partial(self.mk_filename, *args),
-                        callback, errback
-            )
+            path = partial(self.mk_filename, *args)
+            if getattr(dw, 'store', None) is None:
+                return dw.download(url, path, callback, errback)
+            # the record identifies the file in the data store
+            record = args[-1]
+            key = 'vso:{0}:{1}'.format(record.provider, record.fileid)
+            return dw.download(url, path, callback, errback, key=key)
         raise NoData
 
     @staticmethod
@@ -3,6 +3,7 @@
 # Licensed under a 3-clause BSD style license - see licences/ASTROPY.rst
 
 from __future__ import absolute_import, division, print_function
+import mmap
 import warnings
 
 import pytest
@@ -14,7 +15,8 @@ from astropy.utils.decorators import wraps
 
 from sunpy.tests import hash
 
-__all__ = ['skip_windows', 'skip_glymur', 'skip_ana', 'skip_wcsaxes', 'warnings_as_errors']
+__all__ = ['skip_windows', 'skip_glymur', 'skip_ana', 'skip_wcsaxes', 'warnings_as_errors',
+           'is_memmapped']
 
 # SunPy's JPEG2000 capabilities rely on the glymur library.  First we check to
 # make sure that glymur imports correctly before proceeding.
@@ -66,6 +68,20 @@ def warnings_as_errors(request):
     request.addfinalizer(lambda *args: warnings.resetwarnings())
 
 
+def is_memmapped(array):
+    """
+    Return True if an array is backed by a memory map.
+
+    astropy may return a view of the memory map rather than a `numpy.memmap`,
+    so the bases of the array are checked as well.
+    """
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+
 def assert_quantity_allclose(actual, desired, rtol=1.e-7, atol=0, err_msg='', verbose=True):
     """
     Raise an assertion if two objects are not equal up to desired tolerance.
@@ -3,10 +3,11 @@ from __future__ import absolute_import, division, print_function
 from datetime import datetime
 
 from sunpy import time
-from sunpy.time import parse_time
+from sunpy.time import parse_time, parse_time_array
 
 import numpy as np
 import pandas
+import pytest
 from sunpy.extern.six.moves import range
 
 LANDING = datetime(1966, 2, 3)
@@ -68,6 +69,33 @@ def test_parse_time_numpy_datetime():
     assert isinstance(dts, np.ndarray)
     assert all([isinstance(dt, datetime) for dt in dts])
 
+def test_parse_time_array():
+    inputs = ['2007-05-04T21:08:12', '2007-05-04T21:08:13.5',
+              '2007/05/04 21:08', '2010-10-10T24:00:00']
+    dts = parse_time_array(inputs)
+    assert dts.dtype == np.dtype('datetime64[us]')
+    assert list(dts.astype(datetime)) == [parse_time(t) for t in inputs]
+
+    dts = parse_time_array(np.array(inputs), index=True)
+    assert isinstance(dts, pandas.DatetimeIndex)
+
+    with pytest.raises(ValueError):
+        parse_time_array(['2007-05-04', 'not a time'])
+
+def test_parse_time_array_formats():
+    assert (parse_time_array(['04/05/2007'], time_format='%d/%m/%Y') ==
+            np.datetime64('2007-05-04')).all()
+    assert (parse_time_array([765548612.0]) ==
+            np.datetime64(datetime(2003, 4, 5, 12, 23, 32))).all()
+    inputs = np.arange('2005-02-01T00', '2005-02-01T10', dtype='datetime64')
+    assert (parse_time_array(inputs) == inputs).all()
+    # codes which are not in REGEX are parsed by strptime
+    assert (parse_time_array(['04.05.2010 09:08 PM'],
+                             time_format='%d.%m.%Y %I:%M %p') ==
+            np.datetime64('2010-05-04T21:08')).all()
+    with pytest.raises(ValueError):
+        parse_time_array(['04.05.2010 09:08'], time_format='%d.%m.%Y %I:%M %p')
+
 def test_ISO():
     assert parse_time('1966-02-03') == LANDING
     assert (
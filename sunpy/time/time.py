@@ -7,7 +7,7 @@ import numpy as np
 import pandas
 from sunpy.extern import six
 
-__all__ = ['find_time', 'extract_time', 'parse_time', 'is_time', 'day_of_year', 'break_time', 'get_day', 'is_time_in_given_format']
+__all__ = ['find_time', 'extract_time', 'parse_time', 'parse_time_array', 'is_time', 'day_of_year', 'break_time', 'get_day', 'is_time_in_given_format']
 
 # Mapping of time format codes to regular expressions.
 REGEX = {
@@ -49,6 +49,35 @@ TIME_FORMAT_LIST = [
 ]
 
 
+# Compiled regular expressions for the time formats, see _compile_format
+_FORMAT_REGEXES = {}
+
+# Whether a time format only uses the codes in REGEX, see _has_regex
+_FORMAT_HAS_REGEX = {}
+
+
+def _compile_format(format):
+    """Return the compiled regular expression for a time format."""
+    try:
+        return _FORMAT_REGEXES[format]
+    except KeyError:
+        re_format = format
+        for key, value in six.iteritems(REGEX):
+            re_format = re_format.replace(key, value)
+        regex = _FORMAT_REGEXES[format] = re.compile(re_format)
+        return regex
+
+
+def _has_regex(format):
+    """Return True if all the codes of a time format are in REGEX."""
+    try:
+        return _FORMAT_HAS_REGEX[format]
+    except KeyError:
+        codes = set(re.findall('%.', format)) - set(['%%'])
+        has_regex = _FORMAT_HAS_REGEX[format] = codes <= set(REGEX)
+        return has_regex
+
+
 def _group_or_none(match, group, fun):
     try:
         ret = match.group(group)
@@ -66,9 +95,7 @@ def _regex_parse_time(inp, format):
     # Parser for finding out the minute value so we can adjust the string
     # from 24:00:00 to 00:00:00 the next day because strptime does not
     # understand the former.
-    for key, value in six.iteritems(REGEX):
-        format = format.replace(key, value)
-    match = re.match(format, inp)
+    match = _compile_format(format).match(inp)
     if match is None:
         return None, None
     try:
@@ -88,10 +115,7 @@ def _regex_parse_time(inp, format):
 def find_time(string, format):
     """ Return iterator of occurrences of date formatted with format
     in string. Currently supported format codes: """
-    re_format = format
-    for key, value in six.iteritems(REGEX):
-        re_format = re_format.replace(key, value)
-    matches = re.finditer(re_format, string)
+    matches = _compile_format(format).finditer(string)
     for match in matches:
         try:
             matchstr = string[slice(*match.span())]
@@ -184,9 +208,8 @@ def parse_time(time_string, time_format=''):
     elif isinstance(time_string, pandas.tseries.index.DatetimeIndex):
     	return time_string._mpl_repr()
     elif isinstance(time_string, np.ndarray) and 'datetime64' in str(time_string.dtype):
-        ii = [ss.astype(datetime) for ss in time_string]
-        # Validate (in an agnostic way) that we are getting a datetime rather than a date
-        return np.array([datetime(*(dt.timetuple()[:6])) for dt in ii])
+        # Converting to seconds first gives datetimes rather than dates
+        return time_string.astype('datetime64[s]').astype(datetime)
     elif time_string is 'now':
         return datetime.utcnow()
     else:
@@ -196,19 +219,110 @@ def parse_time(time_string, time_format=''):
             time_string = time_string.rstrip("0").rstrip(".")
         for time_format in TIME_FORMAT_LIST:
             try:
-                try:
-                    ts, time_delta = _regex_parse_time(time_string,
-                                                       time_format)
-                except TypeError:
-                    break
-                if ts is None:
-                    continue
-                return datetime.strptime(ts, time_format) + time_delta
-            except ValueError:
-                pass
+                dt = _parse_with_format(time_string, time_format)
+            except TypeError:
+                break
+            if dt is not None:
+                return dt
         raise ValueError("{tstr!s} is not a valid time string!".format(tstr=time_string))
 
 
+def _parse_with_format(time_string, time_format):
+    """Parse a time string with one format, returning None if it does not
+    match. Formats with codes which are not in REGEX are parsed by strptime
+    alone, without the handling of 24:00:00."""
+    try:
+        if not _has_regex(time_format):
+            return datetime.strptime(time_string, time_format)
+        ts, time_delta = _regex_parse_time(time_string, time_format)
+        if ts is None:
+            return None
+        return datetime.strptime(ts, time_format) + time_delta
+    except ValueError:
+        return None
+
+
+def parse_time_array(times, time_format='', index=False):
+    """
+    Parse a sequence of times in one go.
+
+    This is much faster than calling `parse_time` for each time. Strings are
+    parsed with the format which matched the previous string before trying
+    the others, so a sequence of times in the same format only searches
+    `TIME_FORMAT_LIST` once.
+
+    Parameters
+    ----------
+    times : sequence
+        The times to parse, which can be anything `parse_time` understands.
+        Numbers are taken as utime, seconds since 1 Jan 1979.
+    time_format : str
+        A `~datetime.datetime.strptime` format which all the strings are in,
+        or 'utime'. By default the format is found from `TIME_FORMAT_LIST`.
+        Formats which only use the codes in `REGEX` also accept times of
+        24:00:00, other formats are parsed by `~datetime.datetime.strptime`
+        alone.
+    index : bool
+        If True return a `pandas.DatetimeIndex`.
+
+    Returns
+    -------
+    out : `numpy.ndarray` of ``datetime64[us]`` or `pandas.DatetimeIndex`
+
+    Examples
+    --------
+    >>> import sunpy.time
+    >>> sunpy.time.parse_time_array(['2012/08/01', '2012/08/02 12:00'])
+    array(['2012-08-01T00:00:00.000000', '2012-08-02T12:00:00.000000'],
+          dtype='datetime64[us]')
+    """
+    if isinstance(times, pandas.DatetimeIndex):
+        times = times.values
+    times = np.asarray(times)
+
+    if times.dtype.kind == 'M':
+        out = times.astype('datetime64[us]')
+    elif time_format == 'utime' or times.dtype.kind in 'iuf':
+        microseconds = np.round(times.astype(np.float64) * 1e6).astype(np.int64)
+        out = np.datetime64('1979-01-01', 'us') + microseconds.astype('timedelta64[us]')
+    elif times.dtype.kind in 'SU':
+        out = _parse_string_array(times.ravel(), time_format).reshape(times.shape)
+    else:
+        out = np.array([parse_time(t, time_format) for t in times.ravel()],
+                       dtype='datetime64[us]').reshape(times.shape)
+
+    if index:
+        return pandas.DatetimeIndex(out.ravel())
+    return out
+
+
+def _parse_string_array(strings, time_format=''):
+    """Parse a 1D array of time strings, see `parse_time_array`."""
+    formats = [time_format] if time_format else TIME_FORMAT_LIST
+    out = np.empty(len(strings), dtype='datetime64[us]')
+    last_format = None
+    for i, time_string in enumerate(strings):
+        time_string = str(time_string.decode('ascii')
+                          if isinstance(time_string, bytes) else time_string)
+        # Only a fraction of a second may be stripped, not e.g. the year of
+        # 04.05.2010
+        if '.' in time_string and (not time_format or '%f' in time_format):
+            time_string = time_string.rstrip("0").rstrip(".")
+        dt = None
+        if last_format is not None:
+            dt = _parse_with_format(time_string, last_format)
+        if dt is None:
+            for fmt in formats:
+                dt = _parse_with_format(time_string, fmt)
+                if dt is not None:
+                    last_format = fmt
+                    break
+            else:
+                raise ValueError("{tstr!s} is not a valid time string!".format(tstr=time_string))
+        out[i] = dt
+    return out
+
+
 def is_time(time_string, time_format=''):
     """
     Returns true if the input is a valid date/time representation
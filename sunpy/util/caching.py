@@ -0,0 +1,489 @@
+# Author: Simon Liedtke <liedtke.simon@googlemail.com>
+#
+# This module was developed with funding provided by
+# the Google Summer of Code (2013).
+"""
+Bounded, thread-safe caches.
+
+The caches are mappings which hold at most ``maxsize`` items and, if
+``maxbytes`` is given, at most ``maxbytes`` bytes as measured by a ``sizeof``
+function, so that a few large objects such as arrays count as much as many
+small ones. Items can expire ``ttl`` seconds after they have been set. Each
+cache counts its hits, misses, evictions and expirations, see
+:attr:`BaseCache.stats`.
+"""
+from __future__ import absolute_import
+
+import sys
+import threading
+import time
+from abc import ABCMeta, abstractmethod, abstractproperty
+from collections import OrderedDict, namedtuple
+
+__all__ = ['CacheStats', 'BaseCache', 'LRUCache', 'LFUCache']
+
+_marker = object()
+
+CacheStats = namedtuple(
+    'CacheStats',
+    ['hits', 'misses', 'evictions', 'expirations', 'currsize', 'currbytes'])
+
+
+def _sizeof(value):
+    """The number of bytes of a value: the ``nbytes`` of arrays and of the
+    ``data`` of maps, the size of the object itself otherwise."""
+    nbytes = getattr(value, 'nbytes', None)
+    if nbytes is None:
+        nbytes = getattr(getattr(value, 'data', None), 'nbytes', None)
+    if nbytes is None:
+        nbytes = sys.getsizeof(value)
+    return nbytes
+
+
+class BaseCache(object):
+    """
+    BaseCache is a class that saves and operates on an OrderedDict. It has a
+    certain capacity, stored in the attributes `maxsize` (the number of
+    items) and `maxbytes` (the total size of the values). Whether this
+    capacity is reached, can be checked by using the boolean property
+    `is_full`. To implement a custom cache, inherit from this class and
+    override the methods ``__getitem__`` and ``__setitem__``.
+    Call the method `sunpy.util.caching.BaseCache.callback` as soon
+    as an item from the cache is removed.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        The maximum number of items, by default there is no limit.
+    maxbytes : int, optional
+        The maximum total size of the values in bytes, by default there is no
+        limit.
+    ttl : float, optional
+        The number of seconds after which an item expires. By default items
+        do not expire.
+    sizeof : function, optional
+        A function which returns the size of a value in bytes. The default
+        uses the ``nbytes`` of arrays (and of the data of maps) and
+        :func:`sys.getsizeof` for other values.
+    timer : function, optional
+        The clock which is used for ``ttl``, :func:`time.time` by default.
+
+    All the methods are thread-safe.
+    """
+    __metaclass__ = ABCMeta
+
+    def __init__(self, maxsize=float('inf'), maxbytes=float('inf'), ttl=None,
+                 sizeof=_sizeof, timer=time.time):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._timer = timer
+        self._dict = OrderedDict()
+        self._lock = threading.RLock()
+        self._sizes = {}
+        self._currbytes = 0
+        # keys in the order in which they expire, which is the order in which
+        # they have been set because the ttl is the same for all items
+        self._expires = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """Return the corresponding value to `key` if `key` is in the cache
+        and has not expired, `default` otherwise. This method has no
+        side-effects: it does not change the order or the usage counts of the
+        items nor the statistics, and it leaves an expired item in the cache
+        for the next write to remove.
+
+        """
+        with self._lock:
+            expires = self._expires.get(key)
+            if expires is not None and expires <= self._timer():
+                return default
+            return self._dict.get(key, default)
+
+    @abstractmethod
+    def __getitem__(self, key):
+        """abstract method: this method must be overwritten by inheriting
+        subclasses. It defines what happens if an item from the cache is
+        attempted to be accessed.
+
+        """
+        return  # pragma: no cover
+
+    @abstractmethod
+    def __setitem__(self, key, value):
+        """abstract method: this method must be overwritten by inheriting
+        subclasses. It defines what happens if a new value should be assigned
+        to the given key. If the given key does already exist in the cache or
+        not must be checked by the person who implements this method.
+        """
+
+    @abstractproperty
+    def to_be_removed(self):
+        """The item that will be removed on the next
+        :meth:`sunpy.util.caching.BaseCache.remove` call.
+
+        """
+
+    @abstractmethod
+    def remove(self):
+        """Call this method to manually remove one item from the cache. Which
+        item is removed, depends on the implementation of the cache. After the
+        item has been removed, the callback method is called.
+
+        """
+
+    def callback(self, key, value):
+        """This method should be called (by convention) if an item is removed
+        from the cache because it is full. The passed key and value are the
+        ones that are removed. By default this method does nothing, but it
+        can be customized in a custom cache that inherits from this base class.
+        It is not called for items which expire.
+
+        """
+
+    @property
+    def is_full(self):
+        """True if the number of items in the cache equals :attr:`maxsize` or
+        the size of the values exceeds :attr:`maxbytes`, False otherwise.
+
+        """
+        return (len(self._dict) >= self.maxsize or
+                self._currbytes > self.maxbytes)
+
+    @property
+    def currbytes(self):
+        """The total size of the values in the cache in bytes."""
+        return self._currbytes
+
+    @property
+    def stats(self):
+        """A `CacheStats` tuple of the number of hits, misses, evictions and
+        expirations so far and the current number of items and bytes."""
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions,
+                              self.expirations, len(self._dict),
+                              self._currbytes)
+
+    def _check_size(self, key, value):
+        """Return the size of a value, raise ValueError if it can never fit
+        into the cache. The subclasses call this in ``__setitem__`` before
+        they change the cache."""
+        nbytes = self._sizeof(value)
+        if nbytes > self.maxbytes:
+            raise ValueError(
+                'the value of {0!r} is larger than the cache'.format(key))
+        return nbytes
+
+    def _insert(self, key, value, nbytes):
+        """Store a new item of ``nbytes`` bytes, removing items with
+        :meth:`remove` until it fits into the cache. The subclasses use this
+        in ``__setitem__``."""
+        self.expire()
+        while self._dict and (len(self._dict) >= self.maxsize or
+                              self._currbytes + nbytes > self.maxbytes):
+            self.remove()
+        self._dict[key] = value
+        self._sizes[key] = nbytes
+        self._currbytes += nbytes
+        if self.ttl is not None:
+            self._expires[key] = self._timer() + self.ttl
+
+    def _evict(self, key):
+        """Remove an item because the cache is full and call
+        :meth:`callback`."""
+        value = self._dict[key]
+        del self[key]
+        self.evictions += 1
+        self.callback(key, value)
+
+    def _expired(self, key):
+        """Remove the item of the key if it has expired, return True if it
+        has been removed."""
+        expires = self._expires.get(key)
+        if expires is None or expires > self._timer():
+            return False
+        del self[key]
+        self.expirations += 1
+        return True
+
+    def expire(self):
+        """Remove all the items which have expired."""
+        with self._lock:
+            now = self._timer()
+            while self._expires:
+                key, expires = next(iter(self._expires.items()))
+                if expires > now:
+                    break
+                del self[key]
+                self.expirations += 1
+
+    def __delitem__(self, key):
+        with self._lock:
+            self._dict.__delitem__(key)
+            self._currbytes -= self._sizes.pop(key, 0)
+            self._expires.pop(key, None)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._dict and not self._expired(key)
+
+    def __len__(self):
+        return len(self._dict)
+
+    def __iter__(self):
+        for key in list(self._dict):
+            yield key
+
+    def __reversed__(self):  # pragma: no cover
+        for key in list(reversed(self._dict)):
+            yield key
+
+    def clear(self):
+        """Remove all the items, :meth:`callback` is not called."""
+        with self._lock:
+            self._dict.clear()
+            self._sizes.clear()
+            self._expires.clear()
+            self._currbytes = 0
+
+    def keys(self):  # pragma: no cover
+        return self._dict.keys()
+
+    def values(self):  # pragma: no cover
+        return self._dict.values()
+
+    def items(self):  # pragma: no cover
+        return self._dict.items()
+
+    def iterkeys(self):  # pragma: no cover
+        return iter(self)
+
+    def itervalues(self):  # pragma: no cover
+        for key, value in self.iteritems():
+            yield value
+
+    def iteritems(self):  # pragma: no cover
+        for key, value in list(self._dict.items()):
+            yield key, value
+
+    def update(self, *args, **kwds):  # pragma: no cover
+        for key, value in OrderedDict(*args, **kwds).items():
+            self[key] = value
+
+    def pop(self, key, default=_marker):  # pragma: no cover
+        with self._lock:
+            if key in self:
+                value = self._dict[key]
+                del self[key]
+                return value
+            if default is _marker:
+                raise KeyError(key)
+            return default
+
+    def setdefault(self, key, default=None):  # pragma: no cover
+        with self._lock:
+            if key not in self:
+                self[key] = default
+            return self._dict[key]
+
+    def popitem(self, last=True):  # pragma: no cover
+        with self._lock:
+            if not self._dict:
+                raise KeyError('the cache is empty')
+            key = next(reversed(self._dict)) if last else next(iter(self._dict))
+            return key, self.pop(key)
+
+    def __reduce__(self):  # pragma: no cover
+        return self._dict.__reduce__()
+
+    def copy(self):  # pragma: no cover
+        return self._dict.copy()
+
+    def __eq__(self, other):  # pragma: no cover
+        return self._dict.__eq__(other)
+
+    def __ne__(self, other):  # pragma: no cover
+        return self._dict.__ne__(other)
+
+    def viewkeys(self):  # pragma: no cover
+        return self._dict.viewkeys()
+
+    def viewvalues(self):  # pragma: no cover
+        return self._dict.viewvalues()
+
+    def viewitems(self):  # pragma: no cover
+        return self._dict.viewitems()
+
+    @classmethod
+    def fromkeys(cls, iterable, value=None):  # pragma: no cover
+        return OrderedDict.fromkeys(iterable, value)
+
+    def __repr__(self):  # pragma: no cover
+        return '{0}({1!r})'.format(self.__class__.__name__, dict(self._dict))
+
+
+class LRUCache(BaseCache):
+    """
+    LRUCache
+
+    A cache which removes the least recently used item when it is full.
+    """
+    @property
+    def to_be_removed(self):
+        """Return the least recently used key and its corresponding value as a
+        tuple.
+
+        """
+        with self._lock:
+            return next(iter(self._dict.items()))
+
+    def remove(self):
+        """Remove the least recently used item."""
+        with self._lock:
+            self._evict(next(iter(self._dict)))
+
+    def __getitem__(self, key):
+        """Returns the value which is associated to the given key and put it
+        with its associated value to the end of this cache.
+
+        Raises
+        ------
+        KeyError
+            If the key cannot be found in the cache.
+
+        """
+        with self._lock:
+            if key in self:
+                value = self._dict.pop(key)
+                self._dict[key] = value
+                self.hits += 1
+                return value
+            self.misses += 1
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        """If the key does already exist in the cache, move it to the end of
+        this cache. Otherwise, set a new value and put it to the end of this
+        cache. If the cache is full, remove the least recently used items
+        before inserting the new key-value pair.
+
+        """
+        with self._lock:
+            nbytes = self._check_size(key, value)
+            if key in self._dict:
+                del self[key]
+            self._insert(key, value, nbytes)
+
+
+class LFUCache(BaseCache):
+    """
+    LFUCache
+
+    A cache which removes the least frequently used item when it is full, of
+    the items which have been used equally often the one which reached that
+    count first. Finding this item takes constant time.
+    """
+    def __init__(self, *args, **kwargs):
+        self._counts = {}
+        # the keys grouped by their usage count, each group is ordered by
+        # the time the keys reached that count
+        self._buckets = {}
+        self._min_count = None
+        BaseCache.__init__(self, *args, **kwargs)
+
+    @property
+    def usage_counter(self):
+        """A dictionary with the usage count of every key."""
+        with self._lock:
+            return dict(self._counts)
+
+    def _increment(self, key, count):
+        """Move a key from the bucket of ``count`` to the next one."""
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+        self._counts[key] = count + 1
+
+    @property
+    def to_be_removed(self):
+        """Returns the key with the lowest times of access and its
+        corresponding value as a tuple.
+
+        """
+        with self._lock:
+            if not self._dict:
+                return None, None
+            lfu_key = next(iter(self._buckets[self._min_count]))
+            return lfu_key, self._dict[lfu_key]
+
+    def remove(self):
+        """Remove the least frequently used item."""
+        with self._lock:
+            lfu_key, val = self.to_be_removed
+            self._evict(lfu_key)
+
+    def __delitem__(self, key):
+        with self._lock:
+            BaseCache.__delitem__(self, key)
+            count = self._counts.pop(key)
+            bucket = self._buckets[count]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[count]
+                if self._min_count == count:
+                    self._min_count = min(self._buckets) if self._buckets else None
+
+    def clear(self):
+        with self._lock:
+            BaseCache.clear(self)
+            self._counts.clear()
+            self._buckets.clear()
+            self._min_count = None
+
+    def __getitem__(self, key):
+        """Returns the value which is associated to the given key and
+        increments the frequency counter of this key.
+
+        Raises
+        ------
+        KeyError
+            If the key cannot be found in the cache.
+
+        """
+        with self._lock:
+            if key not in self:
+                self.misses += 1
+                raise KeyError(key)
+            count = self._counts[key]
+            self._increment(key, count)
+            self.hits += 1
+            return self._dict[key]
+
+    def __setitem__(self, key, value):
+        """Increment the frequency counter of the given key if it is already
+        present in the cache, otherwise set it to 1. If the cache is full,
+        remove the least frequently used items before inserting the new
+        key-value pair.
+
+        """
+        with self._lock:
+            nbytes = self._check_size(key, value)
+            if key in self._dict:
+                count = self._counts[key]
+                del self[key]
+            else:
+                count = 0
+            self._insert(key, value, nbytes)
+            self._counts[key] = count + 1
+            self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+            if self._min_count is None or count + 1 < self._min_count:
+                self._min_count = count + 1
@@ -38,6 +38,14 @@ class BasicRegistrationFactory(object):
     * A valid validation function must be a classmethod of the registered widget
       and it must return True or False.
 
+    * A registered widget can declare the values it matches in a
+      ``_factory_dispatch`` class attribute, a dictionary mapping a key to a
+      tuple of values. The widget is then only validated if one of the keys
+      has one of the values, which is found with a hash lookup rather than by
+      calling the validation function. Widgets without ``_factory_dispatch``
+      are always validated. By default the keys are looked up in the keyword
+      arguments to the factory.
+
     """
 
     def __init__(self, default_widget_type=None, additional_validation_functions=[]):
@@ -48,6 +56,10 @@ class BasicRegistrationFactory(object):
 
         self.validation_functions = ['_factory_validation_function'] + additional_validation_functions
 
+        # The registered widgets the dispatch index was built for, the index
+        # and the widgets which are not in the index.
+        self._dispatch_index = (None, {}, [])
+
     def __call__(self, *args, **kwargs):
         """ Method for running the factory.
 
@@ -64,9 +76,9 @@ class BasicRegistrationFactory(object):
 
         candidate_widget_types = list()
 
-        for key in self.registry:
+        for key in self._candidate_widgets(self._dispatch_header(*args, **kwargs)):
 
-            # Call the registered validation function for each registered class
+            # Call the registered validation function for each candidate class
             if self.registry[key](*args, **kwargs):
                 candidate_widget_types.append(key)
 
@@ -85,6 +97,52 @@ class BasicRegistrationFactory(object):
 
         return WidgetType(*args, **kwargs)
 
+    def _dispatch_header(self, *args, **kwargs):
+        """ Return the mapping in which the keys of the dispatch index are
+        looked up for a set of arguments to the factory. """
+        return kwargs
+
+    def _build_dispatch_index(self):
+        """ Index the registered widgets by the values in their
+        ``_factory_dispatch`` attribute. """
+        index = dict()
+        unindexed = list()
+        for WidgetType in self.registry:
+            # Only use a dispatch declared on the class itself, a subclass with
+            # its own validation function may match different values.
+            dispatch = vars(WidgetType).get('_factory_dispatch')
+            if not dispatch:
+                unindexed.append(WidgetType)
+                continue
+            for key, values in dispatch.items():
+                for value in values:
+                    index.setdefault(key, dict()).setdefault(value, list()).append(WidgetType)
+
+        self._dispatch_index = (tuple(self.registry), index, unindexed)
+
+    def _candidate_widgets(self, header):
+        """
+        Return the registered widgets whose validation functions have to be
+        called for a header.
+
+        These are the widgets found in the dispatch index for the values in
+        the header, and all the widgets which do not declare a dispatch.
+        """
+        if self._dispatch_index[0] != tuple(self.registry):
+            self._build_dispatch_index()
+        _, index, unindexed = self._dispatch_index
+
+        candidates = list(unindexed)
+        for key, widgets_by_value in index.items():
+            try:
+                widgets = widgets_by_value.get(header.get(key), ())
+            except TypeError:
+                # Unhashable values can not be in the index
+                continue
+            candidates += [widget for widget in widgets if widget not in candidates]
+
+        return candidates
+
     def register(self, WidgetType, validation_function=None, is_default=False):
         """ Register a widget with the factory.
 
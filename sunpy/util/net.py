@@ -7,6 +7,8 @@ import re
 import sys
 import shutil
 
+from functools import partial
+
 # For Content-Disposition parsing
 from sunpy.extern.six.moves.urllib.parse import urlparse, urljoin
 from sunpy.extern.six.moves.urllib.request import urlopen
@@ -100,16 +102,29 @@ def get_system_filename_slugify(sock, url, default=u"file"):
     return slugify(get_system_filename(sock, url, default))
 
 
-def download_file(url, directory, default=u'file', overwrite=False):
+def download_file(url, directory, default=u'file', overwrite=False,
+                  store=None, validators=False):
     """ Download file from url into directory. Try to get filename from
     Content-Disposition header, otherwise get from path of url. Fall
     back to default if both fail. Only overwrite existing files when
-    overwrite is True. """
-    opn = urlopen(url)
-    try:
-        path = download_fileobj(opn, directory, url, default, overwrite)
-    finally:
-        opn.close()
+    overwrite is True. The file is downloaded with
+    `sunpy.net.download.fetch`, which reuses connections and retries
+    failed transfers, and taken from the `sunpy.net.datastore.DataStore`
+    store if it is given and has the file. If validators is True, the ETag
+    and modification time of the file are saved for later updates. """
+    # imported here because sunpy.net imports this module
+    from sunpy.net.download import fetch
+    return fetch(url, partial(_download_path, directory, default, overwrite),
+                 store=store, validators=validators)
+
+
+def _download_path(directory, default, overwrite, sock, url):
+    """ The path a file downloaded into directory is saved to, see
+    download_fileobj. """
+    filename = get_system_filename(sock, url, default)
+    path = os.path.join(directory, filename.decode('utf-8'))
+    if not overwrite and os.path.exists(path):
+        path = replacement_filename(path)
     return path
 
 
@@ -118,17 +133,14 @@ def download_fileobj(opn, directory, url='', default=u"file", overwrite=False):
     Content-Disposition header, otherwise get from path of url if given.
     Fall back to default if both fail. Only overwrite existing files when
     overwrite is True. """
-    filename = get_system_filename(opn, url, default)
-    path = os.path.join(directory, filename.decode('utf-8'))
-    if not overwrite and os.path.exists(path):
-        path = replacement_filename(path)
+    path = _download_path(directory, default, overwrite, opn, url)
     with open(path, 'wb') as fd:
         shutil.copyfileobj(opn, fd)
     return path
 
 
 def check_download_file(filename, remotepath, download_dir, remotename=None,
-                        replace=False):
+                        replace=False, update=False, append=False):
     """
     Downloads a file from remotepath to localpath if it isn't there.
 
@@ -155,21 +167,36 @@ def check_download_file(filename, remotepath, download_dir, remotename=None,
         If True, file will be downloaded whether or not file already exists
         locally.
 
+    update : (optional) bool
+        If True, an existing file is downloaded again if the remote file has
+        changed since, which is checked with a conditional request.
+
+    append : (optional) bool
+        If True, an updated file is assumed to have grown at its end and only
+        the added bytes are downloaded.
+
     Examples
     --------
     >>> from sunpy.util.net import check_download_file
     >>> remotepath = "http://www.download_repository.com/downloads/"
     >>> check_download_file("filename.txt", remotepath, download_dir='.')   # doctest: +SKIP
     """
-    # Check if file already exists locally.  If not, try downloading it.
-    if replace or not os.path.isfile(os.path.join(download_dir, filename)):
-        # set local and remote file names be the same unless specified
-        # by user.
-        if not isinstance(remotename, six.string_types):
-            remotename = filename
+    # set local and remote file names be the same unless specified
+    # by user.
+    if not isinstance(remotename, six.string_types):
+        remotename = filename
 
+    # Check if file already exists locally.  If not, try downloading it.
+    localpath = os.path.join(download_dir, filename)
+    if replace or not os.path.isfile(localpath):
         download_file(urljoin(remotepath, remotename),
-                      download_dir, default=filename, overwrite=replace)
+                      download_dir, default=filename, overwrite=replace,
+                      validators=True)
+    elif update:
+        # imported here because sunpy.net imports this module
+        from sunpy.net.download import fetch
+        fetch(urljoin(remotepath, remotename), localpath, update=True,
+              append=append)
 
 
 def url_exists(url, timeout=2):
@@ -1,13 +1,20 @@
 from __future__ import absolute_import, division, print_function
 
 import os
+import time
 import datetime
 import re
+import warnings
+from functools import partial
+from multiprocessing.pool import ThreadPool
 
 from bs4 import BeautifulSoup
 from sunpy.extern import six
 from sunpy.extern.six.moves import range, zip
-from sunpy.extern.six.moves.urllib.request import urlopen
+from sunpy.extern.six.moves.urllib.error import HTTPError
+from sunpy.extern.six.moves.urllib.parse import urlsplit
+from sunpy.extern.six.moves.urllib.request import urlopen, url2pathname
+from sunpy.util.caching import LRUCache
 
 __all__ = ['Scraper']
 
@@ -19,6 +26,50 @@ TIME_CONVERSIONS = {'%Y': '\d{4}', '%y': '\d{2}',
                     '%M': '\d{2}',
                     '%S': '\d{2}'}
 
+# directory listings shared by all scrapers, keyed on the directory url
+LISTING_CACHE = LRUCache(maxsize=1024, ttl=600)
+
+
+def _to_regex(pattern):
+    """Replace the datetime formats of a pattern by regular expressions"""
+    for k, v in six.iteritems(TIME_CONVERSIONS):
+        pattern = pattern.replace(k, v)
+    return pattern
+
+
+def _url_to_list(txt):
+    # substitutes '.' and '_' for '/' to then create a list of all the
+    # blocks in times - assuming they are all separated with either '.',
+    # '_' or '/'
+    return re.sub(r'\.|_', '/', txt).split('/')
+
+
+def _list_directory(directory):
+    """The names of the entries of a directory url. Local directories are
+    given as file:// urls. Returns an empty list if the directory does not
+    exist."""
+    if directory.startswith('file:'):
+        path = url2pathname(urlsplit(directory).path)
+        try:
+            return os.listdir(path)
+        except OSError:
+            if os.path.exists(path):
+                raise
+            return []
+    try:
+        opn = urlopen(directory)
+    except HTTPError as e:
+        if e.code == 404:
+            return []
+        raise
+    try:
+        soup = BeautifulSoup(opn)
+        return [link.get("href") for link in soup.find_all("a")
+                if link.get("href") is not None]
+    finally:
+        opn.close()
+
+
 class Scraper(object):
     """
     A Scraper to scrap web data archives based on dates.
@@ -54,10 +105,17 @@ class Scraper(object):
     -----
     The now attribute does not return an existent file, but just how the
     pattern looks with the actual time.
+
+    Local archives and mirrors can be scraped with a ``file://`` url as
+    pattern. The listings of remote directories are cached in
+    ``LISTING_CACHE`` for ten minutes, see `~sunpy.util.scraper.Scraper.filelist`.
     """
     def __init__(self, pattern, **kwargs):
         self.pattern = pattern.format(**kwargs)
         self.now = datetime.datetime.now().strftime(self.pattern)
+        self._regex = re.compile(_to_regex(self.pattern))
+        self._date_layout = None
+        self.errors = []
 
     def matches(self, filepath, date):
         return date.strftime(self.pattern) == filepath
@@ -99,59 +157,84 @@ class Scraper(object):
 
     def _URL_followsPattern(self, url):
         """Check whether the url provided follows the pattern"""
-        pattern = self.pattern
-        for k,v in six.iteritems(TIME_CONVERSIONS):
-            pattern = pattern.replace(k, v)
-        matches = re.match(pattern, url)
+        matches = self._regex.match(url)
         if matches:
             return matches.end() == matches.endpos == len(self.now)
         return False
 
-    def _extractDateURL(self, url):
-        """Extracts the date from a particular url following the pattern"""
-        # url_to_list substitutes '.' and '_' for '/' to then create
-        # a list of all the blocks in times - assuming they are all
-        # separated with either '.', '_' or '/'
-        url_to_list = lambda txt: re.sub(r'\.|_', '/', txt).split('/')
-        pattern_list = url_to_list(self.pattern)
-        url_list = url_to_list(url)
+    def _dateLayout(self):
+        """Find which blocks of the pattern hold the date, and the regular
+        expression and format of every part of the date, once per scraper"""
+        if self._date_layout is not None:
+            return self._date_layout
+        pattern_list = _url_to_list(self.pattern)
 
         time_order = ['%Y', '%y', '%b', '%B', '%m', '%d', '%j',
                       '%H', '%I', '%M', '%S']
-        final_date = []
+        indices = []
         final_pattern = []
         # Find in directory and filename
-        for pattern_elem, url_elem in zip(pattern_list, url_list):
+        for i, pattern_elem in enumerate(pattern_list):
             time_formats = [x for x in time_order if x in pattern_elem]
             if len(time_formats) > 0:
-                final_date.append(url_elem)
+                indices.append(i)
                 final_pattern.append(pattern_elem)
                 for time_bit in time_formats:
                     time_order.remove(time_bit)
         # Find and remove repeated elements eg: %Y in ['%Y', '%Y%m%d']
         #   Make all as single strings
-        date_together = ''.join(final_date)
         pattern_together = ''.join(final_pattern)
-        re_together = pattern_together
-        for k, v in six.iteritems(TIME_CONVERSIONS):
-            re_together = re_together.replace(k, v)
+        re_together = _to_regex(pattern_together)
+
+        parts = []
+        for p,r in zip(pattern_together.split('%')[1:], re_together.split('\\')[1:]):
+            parts.append((re.compile('\\{}'.format(r)), '%{}'.format(p)))
+        self._date_layout = indices, parts
+        return self._date_layout
+
+    def _extractDateURL(self, url):
+        """Extracts the date from a particular url following the pattern"""
+        indices, parts = self._dateLayout()
+        url_list = _url_to_list(url)
+        date_together = ''.join(url_list[i] for i in indices
+                                if i < len(url_list))
 
         #   Create new empty lists
         final_date = list()
         final_pattern = list()
-        for p,r in zip(pattern_together.split('%')[1:], re_together.split('\\')[1:]):
-            regexp = '\\{}'.format(r)
-            pattern = '%{}'.format(p)
-            date_part = re.match(regexp, date_together)
+        for regexp, pattern in parts:
+            date_part = regexp.search(date_together)
             date_together = date_together[:date_part.start()] + \
                             date_together[date_part.end():]
             if pattern not in final_pattern:
-                final_pattern.append('%{}'.format(p))
+                final_pattern.append(pattern)
                 final_date.append(date_part.group())
         return datetime.datetime.strptime(' '.join(final_date),
                                           ' '.join(final_pattern))
 
-    def filelist(self, timerange):
+    def _listDirectory(self, directory, cache=True, ttl=None):
+        """The listing of a directory, or the exception raised when listing
+        it. Listings of remote directories are cached with the time they were
+        made, a cached listing is only used if it is not older than ttl."""
+        # local directories are cheap to list and may change at any time
+        cache = cache and not directory.startswith('file:')
+        if cache:
+            try:
+                listed, listing = LISTING_CACHE[directory]
+            except KeyError:
+                pass
+            else:
+                if ttl is None or time.time() - listed < ttl:
+                    return listing
+        try:
+            listing = _list_directory(directory)
+        except Exception as e:
+            return e
+        if cache:
+            LISTING_CACHE[directory] = (time.time(), listing)
+        return listing
+
+    def filelist(self, timerange, workers=8, cache=True, ttl=None):
         """
         Returns the list of existent files in the archive for the
         given time range.
@@ -163,12 +246,31 @@ class Scraper(object):
             Time interval where to find the directories for a given
             pattern.
 
+        workers : int
+            Number of directories which are listed concurrently.
+
+        cache : bool
+            Use and store the listings of remote directories in
+            ``LISTING_CACHE``. ``file://`` directories are never cached.
+
+        ttl : float or None
+            The maximum age in seconds of a cached listing which is used, a
+            directory whose listing is older is listed again. By default the
+            listings are used until they expire from the cache after ten
+            minutes.
+
         Returns
         -------
 
         filesurls : list of strings
             List of all the files found between the time range given.
 
+        Notes
+        -----
+        Directories which do not exist are skipped. A warning is issued for
+        the directories which cannot be listed for another reason, their
+        urls and the exceptions are kept in ``errors``.
+
         Examples
         --------
         >>> from sunpy.time import TimeRange
@@ -177,25 +279,35 @@ class Scraper(object):
         ['http://solarmonitor.org/data/2015/01/01/fits/swap/swap_00174_fd_20150101_025423.fts.gz']
         """
         directories = self.range(timerange)
-        filesurls = []
-        for directory in directories:
+        list_directory = partial(self._listDirectory, cache=cache, ttl=ttl)
+        if workers > 1 and len(directories) > 1:
+            pool = ThreadPool(min(workers, len(directories)))
             try:
-                opn = urlopen(directory)
-                try:
-                    soup = BeautifulSoup(opn)
-                    for link in soup.find_all("a"):
-                        href = link.get("href")
-                        if href.endswith(self.pattern.split('.')[-1]):
-                            fullpath = directory + href
-                            if self._URL_followsPattern(fullpath):
-                                datehref = self._extractDateURL(fullpath)
-                                if (datehref >= timerange.start and
-                                    datehref <= timerange.end):
-                                    filesurls.append(fullpath)
-                finally:
-                    opn.close()
-            except:
-                pass
+                listings = pool.map(list_directory, directories)
+            finally:
+                pool.terminate()
+        else:
+            listings = [list_directory(d) for d in directories]
+
+        self.errors = []
+        extension = self.pattern.split('.')[-1]
+        filesurls = []
+        for directory, listing in zip(directories, listings):
+            if isinstance(listing, Exception):
+                self.errors.append((directory, listing))
+                continue
+            for href in listing:
+                if href.endswith(extension):
+                    fullpath = directory + href
+                    if self._URL_followsPattern(fullpath):
+                        datehref = self._extractDateURL(fullpath)
+                        if (datehref >= timerange.start and
+                            datehref <= timerange.end):
+                            filesurls.append(fullpath)
+        if self.errors:
+            warnings.warn("Could not list {0} of {1} directories, e.g. {2}: "
+                          "{3}".format(len(self.errors), len(directories),
+                                       *self.errors[0]))
         return filesurls
 
     def _smallerPattern(self, directoryPattern):
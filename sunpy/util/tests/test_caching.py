@@ -0,0 +1,164 @@
+from __future__ import absolute_import
+
+import threading
+
+import numpy as np
+import pytest
+
+from sunpy.util.caching import LRUCache, LFUCache, CacheStats
+
+
+class FakeTimer(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.parametrize('cls', [LRUCache, LFUCache])
+def test_maxbytes(cls):
+    cache = cls(maxbytes=900)
+    cache[1] = np.zeros(50)
+    cache[2] = np.zeros(50)
+    assert cache.currbytes == 800
+    # only one of the arrays fits next to the new one
+    cache[3] = np.zeros(25)
+    assert list(cache) == [2, 3]
+    assert cache.currbytes == 600
+    del cache[2]
+    assert cache.currbytes == 200
+
+
+@pytest.mark.parametrize('cls', [LRUCache, LFUCache])
+def test_value_larger_than_cache(cls):
+    cache = cls(maxbytes=100)
+    cache[1] = np.zeros(10)
+    with pytest.raises(ValueError):
+        cache[2] = np.zeros(20)
+    assert list(cache) == [1]
+    # an existing value is kept if the new one does not fit
+    with pytest.raises(ValueError):
+        cache[1] = np.zeros(20)
+    assert cache[1].shape == (10, )
+    assert cache.currbytes == 80
+
+
+@pytest.mark.parametrize('cls', [LRUCache, LFUCache])
+def test_clear(cls):
+    cache = cls(maxsize=2, maxbytes=1000, ttl=10)
+    cache['a'] = 1
+    cache['b'] = 2
+    cache['a']
+    cache['a']
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.currbytes == 0
+    # the cache works as a new one after it has been cleared
+    cache['x'] = 3
+    cache['y'] = 4
+    cache['z'] = 5
+    assert list(cache) == ['y', 'z']
+
+
+@pytest.mark.parametrize('cls', [LRUCache, LFUCache])
+def test_get(cls):
+    timer = FakeTimer()
+    cache = cls(maxsize=2, ttl=10, timer=timer)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.get('a') == 1
+    assert cache.get('c', 42) == 42
+    # get neither counts as a use of the item nor changes the statistics
+    cache['c'] = 3
+    assert list(cache) == ['b', 'c']
+    assert cache.stats.hits == cache.stats.misses == 0
+    timer.now = 10
+    assert cache.get('b') is None
+    assert cache.stats.expirations == 0
+
+
+def test_sizeof():
+    cache = LRUCache(maxbytes=10, sizeof=len)
+    cache['a'] = 'abcd'
+    cache['b'] = 'efgh'
+    cache['c'] = 'ijkl'
+    assert list(cache) == ['b', 'c']
+
+
+@pytest.mark.parametrize('cls', [LRUCache, LFUCache])
+def test_ttl(cls):
+    timer = FakeTimer()
+    cache = cls(ttl=10, timer=timer)
+    cache[1] = 'a'
+    timer.now = 5
+    cache[2] = 'b'
+    assert cache[1] == 'a'
+    timer.now = 12
+    assert 1 not in cache
+    with pytest.raises(KeyError):
+        cache[1]
+    assert cache[2] == 'b'
+    timer.now = 20
+    cache.expire()
+    assert len(cache) == 0
+    assert cache.stats.expirations == 2
+
+
+def test_lfu_cache_ties():
+    cache = LFUCache(3)
+    cache[1] = 'a'
+    cache[2] = 'b'
+    cache[3] = 'c'
+    cache[3]
+    cache[1]
+    # 1 and 3 have been used twice, 3 reached that count first
+    cache[2]
+    assert cache.to_be_removed == (3, 'c')
+    assert cache.usage_counter == {1: 2, 2: 2, 3: 2}
+    del cache[3]
+    assert cache.to_be_removed == (1, 'a')
+
+
+@pytest.mark.parametrize('cls', [LRUCache, LFUCache])
+def test_stats(cls):
+    evicted = []
+
+    class Cache(cls):
+        def callback(self, key, value):
+            evicted.append((key, value))
+
+    cache = Cache(2)
+    cache[1] = 'a'
+    cache[2] = 'b'
+    cache[1]
+    with pytest.raises(KeyError):
+        cache[3]
+    cache[3] = 'c'
+    assert evicted == [(2, 'b')]
+    stats = cache.stats
+    assert isinstance(stats, CacheStats)
+    assert (stats.hits, stats.misses, stats.evictions, stats.currsize) == (
+        1, 1, 1, 2)
+
+
+@pytest.mark.parametrize('cls', [LRUCache, LFUCache])
+def test_threads(cls):
+    cache = cls(50)
+
+    def work(offset):
+        for i in range(1000):
+            cache[offset + i % 100] = i
+            try:
+                cache[offset + (i * 7) % 100]
+            except KeyError:
+                pass
+
+    threads = [threading.Thread(target=work, args=(n * 1000,))
+               for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache) == 50
+    assert cache.stats.hits + cache.stats.misses == 4000
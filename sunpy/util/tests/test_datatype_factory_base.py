@@ -35,6 +35,20 @@ class FancyWidget(BaseWidget):
         return kwargs.get('style') == 'fancy' and 'feature' in kwargs
 
 
+class DispatchedWidget(BaseWidget):
+    _factory_dispatch = {'style': ('dispatched', 'dispatched-alternative')}
+
+    @classmethod
+    def _factory_validation_function(cls, *args, **kwargs):
+        return kwargs.get('style') in ('dispatched', 'dispatched-alternative')
+
+
+class DispatchedSubclassWidget(DispatchedWidget):
+    @classmethod
+    def _factory_validation_function(cls, *args, **kwargs):
+        return kwargs.get('style') == 'dispatched-subclass'
+
+
 class ExternallyValidatedWidget(BaseWidget):
     pass
 
@@ -126,3 +140,25 @@ class TestBasicRegistrationFactory(object):
 
         with pytest.raises(ValidationFunctionError):
             ExtraValidationFactory.register(MissingClassMethodDifferentValidationWidget)
+
+    def test_dispatch_factory(self):
+        DispatchFactory = BasicRegistrationFactory()
+
+        DispatchFactory.register(DefaultWidget, is_default=True)
+        DispatchFactory.register(StandardWidget)
+        DispatchFactory.register(DispatchedWidget)
+
+        assert type(DispatchFactory(style='dispatched')) is DispatchedWidget
+        assert type(DispatchFactory(style='dispatched-alternative')) is DispatchedWidget
+        assert type(DispatchFactory(style='standard')) is StandardWidget
+        assert type(DispatchFactory(style=['unhashable'])) is DefaultWidget
+
+        # Dispatched widgets are only validated for their values
+        assert DispatchFactory._candidate_widgets({'style': 'standard'}) == [StandardWidget]
+        assert set(DispatchFactory._candidate_widgets({'style': 'dispatched'})) == set([StandardWidget, DispatchedWidget])
+
+        # The index is rebuilt when widgets are registered, and the dispatch
+        # of a parent class is not inherited
+        DispatchFactory.register(DispatchedSubclassWidget)
+        assert type(DispatchFactory(style='dispatched-subclass')) is DispatchedSubclassWidget
+        assert type(DispatchFactory(style='dispatched')) is DispatchedWidget
@@ -6,7 +6,9 @@ import os
 
 import sunpy.data.test
 from sunpy.time import TimeRange
+from sunpy.util import scraper
 from sunpy.util.scraper import Scraper
+from sunpy.util.caching import LRUCache
 
 PATTERN_EXAMPLES = [
     ('%b%y', datetime.timedelta(days=31)),
@@ -98,18 +100,50 @@ def testURL_pattern():
     assert not s._URL_followsPattern('fd_20130410_231211.fts.gz')
     assert not s._URL_followsPattern('fd_20130410_ar_231211.fts.gz')
 
-# Local files don't work
-# def testFilesRange_sameDirectory_local():
-#     s = Scraper('/'.join(['file:/',sunpy.data.test.rootdir,
-#                           'EIT','efz%Y%m%d.%H%M%S_s.fits']))
-#     print(s.pattern)
-#     print(s.now)
-#     startdate = datetime.datetime(2004, 3, 1, 4, 0)
-#     enddate = datetime.datetime(2004, 3, 1, 6, 30)
-#     assert len(s.filelist(TimeRange(startdate, enddate))) == 3
-#     startdate = datetime.datetime(2010, 1, 10, 20, 30)
-#     enddate = datetime.datetime(2010, 1, 20, 20, 30)
-#     assert len(s.filelist(TimeRange(startdate, enddate))) == 0
+def testFilesRange_sameDirectory_local():
+    s = Scraper('/'.join(['file:/',sunpy.data.test.rootdir,
+                          'EIT','efz%Y%m%d.%H%M%S_s.fits']))
+    startdate = datetime.datetime(2004, 3, 1, 4, 0)
+    enddate = datetime.datetime(2004, 3, 1, 6, 30)
+    assert len(s.filelist(TimeRange(startdate, enddate))) == 3
+    startdate = datetime.datetime(2010, 1, 10, 20, 30)
+    enddate = datetime.datetime(2010, 1, 20, 20, 30)
+    assert len(s.filelist(TimeRange(startdate, enddate))) == 0
+
+def testFilesRange_localTree(tmpdir):
+    for day in ['01', '02', '04']:
+        directory = tmpdir.ensure_dir('2014', '05', day)
+        for hour in ['00', '12']:
+            directory.join('fd_201405{0}_{1}0000.fts'.format(day, hour)).write('')
+        directory.join('notes.txt').write('')
+    s = Scraper('file://' + str(tmpdir) + '/%Y/%m/%d/fd_%Y%m%d_%H%M%S.fts')
+    timerange = TimeRange('2014-05-01T06:00:00', '2014-05-04T06:00:00')
+    files = s.filelist(timerange, workers=3)
+    assert [os.path.basename(f) for f in files] == [
+        'fd_20140501_120000.fts', 'fd_20140502_000000.fts',
+        'fd_20140502_120000.fts', 'fd_20140504_000000.fts']
+    assert s.errors == []
+    assert s.filelist(timerange, workers=1) == files
+    # local listings are not cached
+    tmpdir.join('2014', '05', '01', 'fd_20140501_180000.fts').write('')
+    assert len(s.filelist(timerange)) == 5
+
+def test_listing_cache(monkeypatch):
+    listed = []
+
+    def list_directory(directory):
+        listed.append(directory)
+        return ['fd_20140501_120000.fts']
+    monkeypatch.setattr(scraper, '_list_directory', list_directory)
+    monkeypatch.setattr(scraper, 'LISTING_CACHE', LRUCache(ttl=600))
+    s = Scraper('http://sunpy.invalid/%Y/%m/%d/fd_%Y%m%d_%H%M%S.fts')
+    timerange = TimeRange('2014-05-01T06:00:00', '2014-05-01T18:00:00')
+    assert len(s.filelist(timerange)) == 1
+    s.filelist(timerange)
+    assert len(listed) == 1
+    s.filelist(timerange, cache=False)
+    s.filelist(timerange, ttl=0)
+    assert len(listed) == 3
 
 @pytest.mark.online
 def testFilesRange_sameDirectory_remote():
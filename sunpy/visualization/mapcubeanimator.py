@@ -63,7 +63,7 @@ class MapCubeAnimator(imageanimator.BaseFuncAnimator):
                                         slider_ranges, **kwargs)
 
         if annotate:
-            self._annotate_plot(0)
+            self._annotate_plot(mapcube[0])
 
     def updatefig(self, val, im, slider):
         """
@@ -88,47 +88,50 @@ class MapCubeAnimator(imageanimator.BaseFuncAnimator):
             self.remove_obj.pop(0).remove()
 
         i = int(val)
-        im.set_array(self.data[i].data)
-        im.set_cmap(self.mapcube[i].plot_settings['cmap'])
+        # The maps of a MapStack are created on access, so only get the map of
+        # this frame once.
+        amap = self.mapcube[i]
+        im.set_array(amap.data)
+        im.set_cmap(amap.plot_settings['cmap'])
 
-        norm = deepcopy(self.mapcube[i].plot_settings['norm'])
+        norm = deepcopy(amap.plot_settings['norm'])
         # The following explicit call is for bugged versions of Astropy's ImageNormalize
-        norm.autoscale_None(self.data[i].data)
+        norm.autoscale_None(amap.data)
         im.set_norm(norm)
 
         if wcsaxes_compat.is_wcsaxes(im.axes):
-            im.axes.reset_wcs(self.mapcube[i].wcs)
+            im.axes.reset_wcs(amap.wcs)
             wcsaxes_compat.default_wcs_grid(im.axes)
 
         # Having this line in means the plot will resize for non-homogenous
         # maps. However it also means that if you zoom in on the plot bad
         # things happen.
-        # im.set_extent(self.mapcube[i].xrange + self.mapcube[i].yrange)
+        # im.set_extent(amap.xrange + amap.yrange)
         if self.annotate:
-            self._annotate_plot(i)
+            self._annotate_plot(amap)
 
-        self.remove_obj += list(self.user_plot_function(self.fig, self.axes, self.mapcube[i]))
+        self.remove_obj += list(self.user_plot_function(self.fig, self.axes, amap))
 
-    def _annotate_plot(self, ind):
+    def _annotate_plot(self, amap):
         """
         Annotate the image.
 
         This may overwrite some stuff in `GenericMap.plot()`
         """
         # Normal plot
-        self.axes.set_title("{s.name}".format(s=self.data[ind]))
+        self.axes.set_title("{s.name}".format(s=amap))
 
         # x-axis label
-        if self.data[ind].coordinate_system.x == 'HG':
-            xlabel = 'Longitude [{lon}]'.format(lon=self.data[ind].units.x)
+        if amap.coordinate_system.x == 'HG':
+            xlabel = 'Longitude [{lon}]'.format(lon=amap.units.x)
         else:
-            xlabel = 'X-position [{xpos}]'.format(xpos=self.data[ind].units.x)
+            xlabel = 'X-position [{xpos}]'.format(xpos=amap.units.x)
 
         # y-axis label
-        if self.data[ind].coordinate_system.y == 'HG':
-            ylabel = 'Latitude [{lat}]'.format(lat=self.data[ind].units.y)
+        if amap.coordinate_system.y == 'HG':
+            ylabel = 'Latitude [{lat}]'.format(lat=amap.units.y)
         else:
-            ylabel = 'Y-position [{ypos}]'.format(ypos=self.data[ind].units.y)
+            ylabel = 'Y-position [{ypos}]'.format(ypos=amap.units.y)
 
         self.axes.set_xlabel(xlabel)
         self.axes.set_ylabel(ylabel)
@@ -143,7 +146,7 @@ class MapCubeAnimator(imageanimator.BaseFuncAnimator):
             return self.fig.add_subplot(111)
 
     def plot_start_image(self, ax):
-        im = self.mapcube[0].plot(annotate=self.annotate, axes=ax,
-                                       **self.imshow_kwargs)
-        self.remove_obj += list(self.user_plot_function(self.fig, self.axes, self.mapcube[0]))
+        amap = self.mapcube[0]
+        im = amap.plot(annotate=self.annotate, axes=ax, **self.imshow_kwargs)
+        self.remove_obj += list(self.user_plot_function(self.fig, self.axes, amap))
         return im